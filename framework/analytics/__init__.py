@@ -136,6 +136,23 @@ def update_counters(rex, db=None):
     return wrapper
 
 
+def get_total_counters(pages, db=None):
+    """Return the total count of each page, read in one query; pages that
+    have not been counted are missing.
+
+    :param list pages: Page keys in analytics collection
+    """
+    db = db or database
+    collection = db['pagecounters']
+    return {
+        result['_id']: result.get('total', 0)
+        for result in collection.find(
+            {'_id': {'$in': [clean_page(page) for page in pages]}},
+            {'total': 1},
+        )
+    }
+
+
 def get_basic_counters(page, db=None):
     db = db or database
     collection = db['pagecounters']
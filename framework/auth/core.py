@@ -203,6 +203,15 @@ class User(GuidStoredObject, AddonModelMixin):
         'social',
     }
 
+    # User fields that decide whether the user is active
+    STATUS_FIELDS = {
+        'is_registered',
+        'password',
+        'merged_by',
+        'date_disabled',
+        'date_confirmed',
+    }
+
     # TODO: Add SEARCH_UPDATE_NODE_FIELDS, for fields that should trigger a
     #   search update for all nodes to which the user is a contributor.
 
@@ -386,6 +395,9 @@ class User(GuidStoredObject, AddonModelMixin):
     # user language and locale data (e.g. 'en_US')
     locale = fields.StringField(default='en_US')
 
+    # Primary key of the user's dashboard folder
+    dashboard_id = fields.StringField()
+
     _meta = {'optimistic': True}
 
     def __repr__(self):
@@ -959,6 +971,8 @@ class User(GuidStoredObject, AddonModelMixin):
         ret = super(User, self).save(*args, **kwargs)
         if self.SEARCH_UPDATE_FIELDS.intersection(ret) and self.is_confirmed:
             self.update_search()
+        if self.STATUS_FIELDS.intersection(ret):
+            signals.user_status_changed.send(self)
         if settings.PIWIK_HOST and not self.piwik_token:
             piwik_tasks.update_user(self._id)
         return ret
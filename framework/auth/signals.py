@@ -6,6 +6,8 @@ signals = blinker.Namespace()
 user_registered = signals.signal('user-registered')
 user_confirmed = signals.signal('user-confirmed')
 user_email_removed = signals.signal('user-email-removed')
+# Sent when a change to a user may have activated or deactivated them
+user_status_changed = signals.signal('user-status-changed')
 
 contributor_removed = signals.signal('contributor-removed')
 node_deleted = signals.signal('node-deleted')
\ No newline at end of file
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import os
+import functools
 
 from flask import (Flask, request, jsonify, render_template,  # noqa
     render_template_string, Blueprint, send_file, abort, make_response,
     redirect as flask_redirect, url_for, send_from_directory, current_app
 )
+from flask import _app_ctx_stack, _request_ctx_stack
 import furl
 
 from website import settings
@@ -74,3 +76,28 @@ def redirect(location, code=302):
         url.args['view_only'] = view_only
         location = url.url
     return flask_redirect(location, code=code)
+
+
+def share_request_context(func):
+    """Wrap ``func`` to run in worker threads with the current request and
+    application contexts. Unlike `flask.copy_current_request_context`, the
+    contexts are shared rather than pushed again, so calls may overlap, and
+    returning from a call does not run the request teardown handlers; those
+    run once, when the request ends. Outside a request, ``func`` is returned
+    unchanged.
+    """
+    reqctx = _request_ctx_stack.top
+    if reqctx is None:
+        return func
+    app_ctx = _app_ctx_stack.top
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        _app_ctx_stack.push(app_ctx)
+        _request_ctx_stack.push(reqctx)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _request_ctx_stack.pop()
+            _app_ctx_stack.pop()
+    return wrapped
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Batch loading of records by primary key.
+
+Serializers that will dereference many records (e.g. the contributors of
+every node on a listing page) `prime` their keys first. The next `load_many`
+or `flush` for that model fetches every pending key with a single `$in` query
+and adds the records to the ODM cache, so the `load` calls and foreign field
+lookups that follow do not go back to the database.
+
+Pending keys and the number of round-trips avoided are tracked per request.
+"""
+import logging
+import threading
+import collections
+
+from flask import g
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoaderState(object):
+
+    def __init__(self):
+        # schema -> keys waiting to be fetched
+        self.pending = collections.defaultdict(set)
+        self.queries = 0
+        self.loads_avoided = 0
+
+
+# State for code running outside of a request, e.g. scripts and tasks
+_local = threading.local()
+
+
+def get_state():
+    try:
+        return g._batch_loader
+    except RuntimeError:
+        pass
+    except AttributeError:
+        g._batch_loader = LoaderState()
+        return g._batch_loader
+    if not hasattr(_local, 'state'):
+        _local.state = LoaderState()
+    return _local.state
+
+
+def _is_cached(schema, key):
+    return schema._load_from_cache(key) is not None
+
+
+def prime(schema, keys):
+    """Queue records to be fetched by the next batch for their model."""
+    pending = get_state().pending[schema]
+    pending.update(
+        key for key in keys
+        if key is not None and not _is_cached(schema, key)
+    )
+
+
+def flush(schema):
+    """Fetch every pending record of ``schema`` with one query.
+
+    :return dict: Loaded records by primary key
+    """
+    state = get_state()
+    keys = [
+        key for key in state.pending.pop(schema, ())
+        if not _is_cached(schema, key)
+    ]
+    if not keys:
+        return {}
+
+    from website.util import metrics
+
+    primary_name = schema._primary_name
+    collection = schema._storage[0].store
+    loaded = {}
+    for data in collection.find({primary_name: {'$in': keys}}):
+        key = data[primary_name]
+        loaded[key] = schema.load(key=key, data=data)
+
+    state.queries += 1
+    avoided = max(len(loaded) - 1, 0)
+    state.loads_avoided += avoided
+    metrics.increment('mongo.batch_load.queries')
+    metrics.increment('mongo.batch_load.avoided', avoided)
+    return loaded
+
+
+def load_many(schema, keys):
+    """Load records by primary key, preserving order. Keys already in the ODM
+    cache are not fetched again; missing records are returned as None.
+    """
+    keys = list(keys)
+    prime(schema, keys)
+    loaded = flush(schema)
+    return [
+        loaded[key] if key in loaded else schema.load(key)
+        for key in keys
+    ]
+
+
+def foreign_keys(records, field_name):
+    """Primary keys referenced by ``field_name`` on each record, read from
+    storage data so the referenced records are not loaded.
+    """
+    keys = []
+    for record in records:
+        value = record.to_storage().get(field_name)
+        if isinstance(value, list):
+            keys.extend(value)
+        elif value is not None:
+            keys.append(value)
+    return keys
+
+
+def loader_before_request():
+    g._batch_loader = LoaderState()
+
+
+def loader_teardown_request(error=None):
+    state = getattr(g, '_batch_loader', None)
+    if state is not None and state.queries:
+        logger.debug(
+            'Batch loaded records in {0} queries, avoiding {1} round-trips'.format(
+                state.queries,
+                state.loads_avoided,
+            )
+        )
+
+
+handlers = {
+    'before_request': loader_before_request,
+    'teardown_request': loader_teardown_request,
+}
@@ -1,20 +1,26 @@
 # -*- coding: utf-8 -*-
 import os
+import re
+import glob
+import time
 import logging
+import threading
 import copy
 import json
 import functools
+import collections
 import httplib as http
+from HTMLParser import HTMLParser
+from multiprocessing.pool import ThreadPool
 
-import lxml.html
 import werkzeug.wrappers
 from werkzeug.exceptions import NotFound
 from mako.template import Template
 from mako.lookup import TemplateLookup
-from flask import request, make_response
+from flask import g, request, make_response
 
 from framework import sentry
-from framework.flask import app, redirect
+from framework.flask import app, redirect, share_request_context
 from framework.sessions import session
 from framework.exceptions import HTTPError
 
@@ -28,7 +34,7 @@ _tpl_lookup = TemplateLookup(
         TEMPLATE_DIR,
         os.path.join(settings.BASE_PATH, 'addons/'),
     ],
-    module_directory='/tmp/mako_modules'
+    module_directory=settings.MAKO_MODULE_PATH,
 )
 REDIRECT_CODES = [
     http.MOVED_PERMANENTLY,
@@ -187,22 +193,96 @@ def render_jinja_string(tpl, data):
     pass
 
 mako_cache = {}
-def render_mako_string(tpldir, tplname, data):
+def _mako_template_uri(path):
+    """URI of the page template at ``path``. Includes and inherits in page
+    templates are resolved from the root of the template lookup, so the URI
+    has no directory part; it names the file so that compiled modules of
+    different templates do not collide.
+    """
+    relpath = os.path.relpath(os.path.abspath(path), settings.APP_PATH)
+    return relpath.replace(os.sep, '.').lstrip('.')
+
+
+def load_mako_template(tpldir, tplname):
+    """Load a Mako template, compiling it to ``settings.MAKO_MODULE_PATH`` if
+    no up-to-date compiled module exists there.
 
-    tpl = mako_cache.get(tplname)
+    :raises: IOError if the template file does not exist
+    """
+    path = os.path.join(tpldir, tplname)
+    tpl = mako_cache.get(path)
     if tpl is None:
+        if not os.path.isfile(path):
+            raise IOError('Template {} not found.'.format(path))
         tpl = Template(
-            open(os.path.join(tpldir, tplname)).read(),
+            filename=path,
+            uri=_mako_template_uri(path),
             lookup=_tpl_lookup,
+            module_directory=settings.MAKO_MODULE_PATH,
             input_encoding='utf-8',
             output_encoding='utf-8',
         )
-    # Don't cache in debug mode
-    if not app.debug:
-        mako_cache[tplname] = tpl
+        # Don't cache in debug mode
+        if not app.debug:
+            mako_cache[path] = tpl
+    return tpl
+
+
+def render_mako_string(tpldir, tplname, data):
+    tpl = load_mako_template(tpldir, tplname)
     return tpl.render(**data)
 
 
+def find_mako_templates():
+    """Yield (template directory, template name) for every page template in
+    the core and addon template directories.
+    """
+    tpldirs = [TEMPLATE_DIR] + sorted(
+        glob.glob(os.path.join(settings.ADDON_PATH, '*', 'templates'))
+    )
+    for tpldir in tpldirs:
+        for root, _, filenames in os.walk(tpldir):
+            for filename in sorted(filenames):
+                if filename.endswith('.mako'):
+                    path = os.path.join(root, filename)
+                    yield tpldir, os.path.relpath(path, tpldir)
+
+
+def precompile_mako_templates(templates=None):
+    """Compile templates to ``settings.MAKO_MODULE_PATH`` so that workers load
+    compiled modules instead of compiling on first use.
+
+    :param templates: Iterable of (template directory, template name); defaults
+        to all templates found by :func:`find_mako_templates`
+    :return: List of (template path, seconds to compile, error or None)
+    """
+    report = []
+    for tpldir, tplname in (templates or find_mako_templates()):
+        path = os.path.join(tpldir, tplname)
+        mako_cache.pop(path, None)
+        start = time.time()
+        error = None
+        try:
+            load_mako_template(tpldir, tplname)
+        except Exception as exc:
+            error = exc
+        report.append((path, time.time() - start, error))
+    return report
+
+
+def warm_mako_templates(tplnames=None):
+    """Load templates into the in-process cache before serving traffic.
+
+    :param tplnames: Template names relative to the core template directory;
+        defaults to ``settings.MAKO_WARM_TEMPLATES``
+    """
+    for tplname in (tplnames if tplnames is not None else settings.MAKO_WARM_TEMPLATES):
+        try:
+            load_mako_template(TEMPLATE_DIR, tplname)
+        except Exception as error:
+            logger.error('Could not warm template {}: {!r}'.format(tplname, error))
+
+
 renderer_extension_map = {
     '.stache': render_mustache_string,
     '.jinja': render_jinja_string,
@@ -263,6 +343,72 @@ def call_url(url, view_kwargs=None):
 
     return rv
 
+### Embedded templates ###
+
+# Matches an element carrying embed metadata, e.g.
+#   <div class="foo" mod-meta='{"tpl": "name.mako", "replace": true}'></div>
+# Embed elements are always empty; their content is the rendered embed.
+EMBED_PATTERN = re.compile(
+    r"""<(?P<tag>[a-zA-Z][\w-]*)(?P<before>[^>]*?)\smod-meta=(?P<quote>['"])"""
+    r"""(?P<meta>.*?)(?P=quote)(?P<after>[^>]*)>\s*</(?P=tag)>""",
+    re.DOTALL,
+)
+
+EmbedSlot = collections.namedtuple('EmbedSlot', ['meta', 'open_tag', 'close_tag'])
+
+_html_parser = HTMLParser()
+
+
+def split_embeds(rendered):
+    """Split rendered HTML into static segments and embed slots in a single
+    scan.
+
+    :param str rendered: Output of a template renderer
+    :return: List of strings and :class:`EmbedSlot` objects, in page order
+    """
+    segments = []
+    position = 0
+    for match in EMBED_PATTERN.finditer(rendered):
+        segments.append(rendered[position:match.start()])
+        meta = match.group('meta')
+        if '&' in meta:
+            meta = _html_parser.unescape(meta)
+        segments.append(EmbedSlot(
+            meta=meta,
+            open_tag=rendered[match.start():match.end('after') + 1],
+            close_tag='</{0}>'.format(match.group('tag')),
+        ))
+        position = match.end()
+    segments.append(rendered[position:])
+    return segments
+
+
+# Embeds may be rendered concurrently; see `WebRenderer._render_slots`
+_embed_timings_lock = threading.Lock()
+
+
+def record_embed_timing(name, elapsed):
+    """Record how long an embed took to render on the current request."""
+    logger.debug('Rendered embed {0} in {1:.4f}s'.format(name, elapsed))
+    try:
+        with _embed_timings_lock:
+            timings = getattr(g, '_embed_timings', None)
+            if timings is None:
+                timings = g._embed_timings = []
+    except RuntimeError:
+        return
+    timings.append((name, elapsed))
+
+
+def get_embed_timings():
+    """Return (name, seconds) pairs for embeds rendered on the current request.
+    """
+    try:
+        return getattr(g, '_embed_timings', [])
+    except RuntimeError:
+        return []
+
+
 ### Renderers ###
 
 class Renderer(object):
@@ -428,13 +574,22 @@ class WebRenderer(Renderer):
     def render_element(self, element, data):
         """Render an embedded template.
 
-        :param element: The template embed (HtmlElement).
+        :param element: The template embed (HtmlElement or :class:`EmbedSlot`).
              Ex: <div mod-meta='{"tpl": "name.html", "replace": true}'></div>
         :param data: Dictionary to be passed to the template as context
         :return: 2-tuple: (<result>, <flag: replace div>)
         """
-        attributes_string = element.get("mod-meta")
+        if isinstance(element, EmbedSlot):
+            return self.render_embed(element.meta, data)
+        return self.render_embed(element.get('mod-meta'), data)
 
+    def render_embed(self, attributes_string, data):
+        """Render an embedded template from its ``mod-meta`` string.
+
+        :param attributes_string: JSON embed metadata
+        :param data: Dictionary to be passed to the template as context
+        :return: 2-tuple: (<result>, <flag: replace div>)
+        """
         # Return debug <div> if JSON cannot be parsed
         try:
             element_meta = json.loads(attributes_string)
@@ -453,37 +608,63 @@ class WebRenderer(Renderer):
         render_data = copy.copy(data)
         render_data.update(kwargs)
 
-        if uri:
-            # Catch errors and return appropriate debug divs
-            # todo: add debug parameter
+        start = time.time()
+        try:
+            if uri:
+                # Catch errors and return appropriate debug divs
+                # todo: add debug parameter
+                try:
+                    uri_data = call_url(uri, view_kwargs=view_kwargs)
+                    render_data.update(uri_data)
+                except NotFound:
+                    return '<div>URI {} not found</div>'.format(uri), is_replace
+                except Exception as error:
+                    logger.exception(error)
+                    if error_msg:
+                        return '<div>{}</div>'.format(error_msg), is_replace
+                    return '<div>Error retrieving URI {}: {}</div>'.format(
+                        uri,
+                        repr(error)
+                    ), is_replace
+
             try:
-                uri_data = call_url(uri, view_kwargs=view_kwargs)
-                render_data.update(uri_data)
-            except NotFound:
-                return '<div>URI {} not found</div>'.format(uri), is_replace
+                template_rendered = self._render(
+                    render_data,
+                    element_meta['tpl'],
+                )
             except Exception as error:
                 logger.exception(error)
-                if error_msg:
-                    return '<div>{}</div>'.format(error_msg), is_replace
-                return '<div>Error retrieving URI {}: {}</div>'.format(
-                    uri,
+                return '<div>Error rendering template {}: {}'.format(
+                    element_meta['tpl'],
                     repr(error)
                 ), is_replace
-
-        try:
-            template_rendered = self._render(
-                render_data,
-                element_meta['tpl'],
+        finally:
+            record_embed_timing(
+                element_meta.get('tpl') or uri,
+                time.time() - start,
             )
-        except Exception as error:
-            logger.exception(error)
-            return '<div>Error rendering template {}: {}'.format(
-                element_meta['tpl'],
-                repr(error)
-            ), is_replace
 
         return template_rendered, is_replace
 
+    def _render_slots(self, slots, data):
+        """Render embed slots, concurrently if enabled in settings.
+
+        :return: List of (<result>, <flag: replace div>) in slot order
+        """
+        workers = min(settings.EMBED_RENDER_WORKERS, len(slots))
+        if workers < 2:
+            return [self.render_element(slot, data) for slot in slots]
+
+        @share_request_context
+        def render_slot(slot):
+            return self.render_element(slot, data)
+
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(render_slot, slots)
+        finally:
+            pool.close()
+
     def _render(self, data, template_name=None):
         """Render output of view function to HTML.
 
@@ -510,49 +691,25 @@ class WebRenderer(Renderer):
         except IOError:
             return '<div>Template {} not found.</div>'.format(template_name)
 
-        html = lxml.html.fragment_fromstring(rendered, create_parent='remove')
-
-        for element in html.findall('.//*[@mod-meta]'):
-
-            # Render nested template
-            template_rendered, is_replace = self.render_element(element, data)
+        segments = split_embeds(rendered)
+        slots = [segment for segment in segments if isinstance(segment, EmbedSlot)]
+        if not slots:
+            return rendered
 
-            original = lxml.html.tostring(element)
+        # Assemble the page in one pass over the segments
+        results = iter(self._render_slots(slots, data))
+        parts = []
+        for segment in segments:
+            if not isinstance(segment, EmbedSlot):
+                parts.append(segment)
+                continue
+            template_rendered, is_replace = next(results)
             if is_replace:
-                replacement = template_rendered
+                parts.append(template_rendered)
             else:
-                replacement = original
-                replacement = replacement.replace('><', '>' + template_rendered + '<')
-
-            rendered = rendered.replace(original, replacement)
-
-        ## Parse HTML using html5lib; lxml is too strict and e.g. throws
-        ## errors if missing parent container; htmlparser mangles whitespace
-        ## and breaks replacement
-        #parsed = BeautifulSoup(rendered, 'html5lib')
-        #subtemplates = parsed.find_all(
-        #    lambda tag: tag.has_attr('mod-meta')
-        #)
-        #
-        #for element in subtemplates:
-        #
-        #    # Extract HTML of original element
-        #    element_html = str(element)
-        #
-        #    # Render nested template
-        #    template_rendered, is_replace = self.render_element(element, data)
-        #
-        #    # Build replacement
-        #    if is_replace:
-        #        replacement = template_rendered
-        #    else:
-        #        element.string = template_rendered
-        #        replacement = str(element)
-        #
-        #    # Replace
-        #    rendered = rendered.replace(element_html, replacement)
-
-        return rendered
+                parts.extend((segment.open_tag, template_rendered, segment.close_tag))
+
+        return ''.join(parts)
 
     def render(self, data, redirect_url, *args, **kwargs):
         """Render output of view function to HTML, following redirects
@@ -17,7 +17,7 @@ from website.models import User, Node, PrivateLink
 from website.addons.dropbox.model import DropboxUserSettings
 from website.addons.osfstorage.model import OsfStorageFileNode
 
-from scripts.analytics import profile, tabulate_emails, tabulate_logs
+from scripts.analytics import profile, tabulate_emails, tabulate_logs, log_rollups
 
 
 def get_active_users(extra=None):
@@ -74,20 +74,6 @@ def count_user_nodes(users=None):
     ]
 
 
-def count_user_logs(user, query=None):
-    if query:
-        return len(user.nodelog__created.find(query))
-    return len(user.nodelog__created)
-
-
-def count_users_logs(users=None, query=None):
-    users = users or get_active_users()
-    return [
-        count_user_logs(user, query)
-        for user in users
-    ]
-
-
 def count_at_least(counts, at_least):
     return len([
         count for count in counts
@@ -119,16 +105,20 @@ log_thresholds = [1, 11]
 
 
 def get_log_counts(users):
+    """Count users by number of logs over each window. Windows start at the
+    beginning of a UTC day, since counts come from daily rollups.
+    """
+    user_ids = set(users.get_keys())
+    log_rollups.update_rollups()
+    now = datetime.datetime.utcnow()
     rows = []
     for counter in log_counters:
-        counts = count_users_logs(
-            users,
-            (
-                Q('date', 'gte', datetime.datetime.utcnow() - counter.delta)
-                if counter.delta
-                else None
-            ),
-        )
+        since = log_rollups.to_day(now - counter.delta) if counter.delta else None
+        counts = [
+            count
+            for user_id, count in log_rollups.get_user_counts(since).items()
+            if user_id in user_ids
+        ]
         for threshold in log_thresholds:
             thresholded = count_at_least(counts, threshold)
             rows.append([
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Daily rollups of log counts by action and by user, shared by the log
+analytics scripts.
+
+Logs are processed in batches of one day of log creation time, which is read
+from their ObjectId primary keys, so each batch is a range scan of the `_id`
+index. A batch's rollups are replaced whenever it is processed, so batches can
+safely be processed again; each run processes the batch of the checkpoint,
+every later batch, and the batch in progress, then moves the checkpoint to the
+last complete batch.
+"""
+
+import datetime
+
+from bson import ObjectId
+
+from framework.mongo import database
+
+
+ACTION_ROLLUPS = 'logrollups'
+USER_ROLLUPS = 'userlogrollups'
+CHECKPOINTS = 'analyticscheckpoints'
+CHECKPOINT_ID = 'logrollups'
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def to_day(date):
+    return datetime.datetime(date.year, date.month, date.day)
+
+
+def batch_range(batch):
+    """Bounds of the primary keys of logs created on the day ``batch``."""
+    return (
+        str(ObjectId.from_datetime(batch)),
+        str(ObjectId.from_datetime(batch + ONE_DAY)),
+    )
+
+
+def first_batch():
+    first = database['nodelog'].find_one({}, {'_id': True}, sort=[('_id', 1)])
+    if first is None:
+        return None
+    return to_day(ObjectId(first['_id']).generation_time.replace(tzinfo=None))
+
+
+def aggregate(batch, key):
+    """Count the logs created on the day ``batch`` by day of `date` and by
+    ``key`` in a single aggregation.
+    """
+    start, end = batch_range(batch)
+    result = database['nodelog'].aggregate([
+        {'$match': {
+            '_id': {'$gte': start, '$lt': end},
+            # Only dates can be bucketed by day
+            'date': {'$type': 9},
+        }},
+        {'$group': {
+            '_id': {
+                key: '$' + key,
+                'year': {'$year': '$date'},
+                'month': {'$month': '$date'},
+                'day': {'$dayOfMonth': '$date'},
+            },
+            'count': {'$sum': 1},
+        }},
+    ])
+    for row in result['result']:
+        group = row['_id']
+        yield {
+            'batch': batch,
+            key: group[key],
+            'day': datetime.datetime(group['year'], group['month'], group['day']),
+            'count': row['count'],
+        }
+
+
+def process_batch(batch):
+    for collection, key in ((ACTION_ROLLUPS, 'action'), (USER_ROLLUPS, 'user')):
+        rows = list(aggregate(batch, key))
+        database[collection].remove({'batch': batch})
+        if rows:
+            database[collection].insert(rows)
+
+
+def get_checkpoint():
+    record = database[CHECKPOINTS].find_one({'_id': CHECKPOINT_ID})
+    return record['batch'] if record else None
+
+
+def update_rollups(now=None):
+    """Bring the rollups up to date; return the number of batches processed."""
+    today = to_day(now or datetime.datetime.utcnow())
+    batch = get_checkpoint() or first_batch()
+    if batch is None:
+        return 0
+    count = 0
+    while batch <= today:
+        process_batch(batch)
+        count += 1
+        batch += ONE_DAY
+    # Logs created today may still be added
+    database[CHECKPOINTS].update(
+        {'_id': CHECKPOINT_ID},
+        {'$set': {'batch': today - ONE_DAY}},
+        upsert=True,
+    )
+    return count
+
+
+def sum_counts(collection, key, query=None):
+    """Sum rollups by ``key``, optionally restricted by ``query``."""
+    result = database[collection].aggregate([
+        {'$match': query or {}},
+        {'$group': {'_id': '$' + key, 'count': {'$sum': '$count'}}},
+    ])
+    return {row['_id']: row['count'] for row in result['result']}
+
+
+def get_action_counts(since=None, until=None):
+    """Count logs by action, over days from ``since`` up to but excluding
+    ``until``.
+    """
+    day = {}
+    if since:
+        day['$gte'] = since
+    if until:
+        day['$lt'] = until
+    return sum_counts(ACTION_ROLLUPS, 'action', {'day': day} if day else None)
+
+
+def get_user_counts(since=None):
+    """Count logs by user, over days from ``since``."""
+    query = {'day': {'$gte': since}} if since else None
+    return sum_counts(USER_ROLLUPS, 'user', query)
+
+
+def get_action_days(action):
+    """Return ``(day, count)`` pairs for an action."""
+    result = database[ACTION_ROLLUPS].aggregate([
+        {'$match': {'action': action}},
+        {'$group': {'_id': '$day', 'count': {'$sum': '$count'}}},
+        {'$sort': {'_id': 1}},
+    ])
+    return [(row['_id'], row['count']) for row in result['result']]
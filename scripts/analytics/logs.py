@@ -3,42 +3,31 @@
 import os
 import matplotlib.pyplot as plt
 
-from framework.mongo import database
 from website import settings
 
 from .utils import plot_dates, mkdirp
+from . import log_rollups
 
 
-log_collection = database['nodelog']
-
 FIG_PATH = os.path.join(settings.ANALYTICS_PATH, 'figs', 'logs')
 mkdirp(FIG_PATH)
 
 
 def analyze_log_action(action):
-    logs = log_collection.find({'action': action})
-    dates = [
-        log['date']
-        for log in logs
-        if log['date']
-    ]
-    fig = plot_dates(dates)
-    plt.title('logged actions for {} ({} total)'.format(action, len(dates)))
+    days = log_rollups.get_action_days(action)
+    dates = [day for day, count in days]
+    counts = [count for day, count in days]
+    fig = plot_dates(dates, weights=counts)
+    plt.title('logged actions for {} ({} total)'.format(action, sum(counts)))
     plt.savefig(os.path.join(FIG_PATH, '{}.png'.format(action)))
     plt.close()
 
 
 def main():
-    actions = log_collection.find(
-        {},
-        {'action': True}
-    ).distinct(
-        'action'
-    )
-    for action in actions:
+    log_rollups.update_rollups()
+    for action in log_rollups.get_action_counts():
         analyze_log_action(action)
 
 
 if __name__ == '__main__':
     main()
-
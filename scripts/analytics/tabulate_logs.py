@@ -3,22 +3,17 @@
 to the specified project.
 """
 
-import bson
 import datetime
 from cStringIO import StringIO
 
-import pymongo
 from dateutil.relativedelta import relativedelta
 
-from framework.mongo import database
-
 from website import models
 from website.app import app, init_app
 
-from scripts.analytics import utils
+from scripts.analytics import utils, log_rollups
 
 
-RESULTS_COLLECTION = 'logmetrics'
 TIME_OFFSET = relativedelta(days=1)
 NUM_ROWS = 20
 
@@ -28,41 +23,17 @@ NODE_ID = '95nv8'
 USER_ID = 'icpnw'
 
 
-mapper = bson.Code('''function() {
-    emit(this.action, 1);
-}''')
-
-
-reducer = bson.Code('''function(key, values) {
-    var count = 0;
-    for (var i=0; i<values.length; i++) {
-        count += values[i];
-    }
-    return count;
-}''')
-
-
-def run_map_reduce(**kwargs):
-    return database['nodelog'].map_reduce(
-        mapper,
-        reducer,
-        RESULTS_COLLECTION,
-        **kwargs
-    )
-
-
 def main():
     node = models.Node.load(NODE_ID)
     user = models.User.load(USER_ID)
-    cutoff = datetime.datetime.utcnow() - TIME_OFFSET
-    result = run_map_reduce(query={'date': {'$gt': cutoff}})
+    log_rollups.update_rollups()
+    # Counts for the last complete day
+    until = log_rollups.to_day(datetime.datetime.utcnow())
+    counts = log_rollups.get_action_counts(since=until - TIME_OFFSET, until=until)
     sio = StringIO()
     utils.make_csv(
         sio,
-        (
-            (row['_id'], row['value'])
-            for row in result.find().sort([('value', pymongo.DESCENDING)])
-        ),
+        sorted(counts.items(), key=lambda row: row[1], reverse=True),
         ['name', 'count'],
     )
     utils.send_file(app, FILE_NAME, CONTENT_TYPE, sio, node, user)
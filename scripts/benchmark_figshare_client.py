@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Time `Figshare.project` against a local Figshare stand-in that answers
+every request after a fixed delay, comparing serial and concurrent article
+fetching and a warm response cache.
+
+    python -m scripts.benchmark_figshare_client --articles 200 --latency 0.05
+"""
+import json
+import time
+import argparse
+import threading
+import collections
+from SocketServer import ThreadingMixIn
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from website.addons.figshare import api
+from website.addons.figshare import settings as figshare_settings
+
+
+NodeSettings = collections.namedtuple('NodeSettings', ['api_url'])
+
+
+class FigshareStandInHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        parts = self.path.strip('/').split('/')
+        if parts[0] == 'projects' and len(parts) == 2:
+            body = {'id': int(parts[1]), 'title': 'Benchmark project'}
+        elif parts[0] == 'projects' and parts[-1] == 'articles':
+            body = [{'id': idx} for idx in range(self.server.articles)]
+        elif parts[0] == 'articles' and len(parts) == 2:
+            body = {'items': [{'article_id': int(parts[1]), 'title': 'Article', 'files': []}]}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class FigshareStandIn(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, articles, latency):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), FigshareStandInHandler)
+        self.articles = articles
+        self.latency = latency
+
+
+def time_project(client, node_settings):
+    start = time.time()
+    project = client.project(node_settings, 1)
+    return time.time() - start, len(project['articles'])
+
+
+def main(articles, latency, workers):
+    server = FigshareStandIn(articles, latency)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    node_settings = NodeSettings('http://127.0.0.1:{0}/'.format(server.server_address[1]))
+
+    original_workers = figshare_settings.MAX_WORKERS
+    try:
+        results = []
+        for label, max_workers, warm in (
+            ('serial', 1, False),
+            ('concurrent ({0} workers)'.format(workers), workers, False),
+            ('warm cache', workers, True),
+        ):
+            figshare_settings.MAX_WORKERS = max_workers
+            if not warm:
+                api.clear_cache()
+            elapsed, fetched = time_project(api.Figshare(), node_settings)
+            results.append((label, elapsed, fetched))
+    finally:
+        figshare_settings.MAX_WORKERS = original_workers
+        api.clear_cache()
+        server.shutdown()
+
+    print('{0} articles, {1:.3f}s simulated latency'.format(articles, latency))
+    for label, elapsed, fetched in results:
+        print('{0:<28} {1:8.3f}s  ({2} articles)'.format(label, elapsed, fetched))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, default=figshare_settings.MAX_WORKERS)
+    args = parser.parse_args()
+    main(args.articles, args.latency, args.workers)
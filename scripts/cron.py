@@ -83,6 +83,18 @@ def main(dry_run=True):
     digests = ensure_item(cron, 'bash {}'.format(app_prefix('scripts/send_digests.sh')))
     digests.hour.on(2)      # 2 a.m.
 
+    discovery = ensure_item(
+        cron,
+        cd_app(tasks.bin_prefix('python -m scripts.refresh_activity_snapshot')),
+    )
+    discovery.minute.on(0)  # Hourly
+
+    oauth_tokens = ensure_item(
+        cron,
+        cd_app(tasks.bin_prefix('python -m scripts.refresh_oauth_tokens')),
+    )
+    oauth_tokens.minute.every(10)  # Every 10 minutes
+
     schedule_osf_storage(cron)
     schedule_glacier(cron)
 
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Backfill lowercase tag keys on nodes and rebuild the precomputed meeting
+page rows and submission counts for every conference.
+
+    python -m scripts.migrate_conference_submissions dry
+"""
+
+import sys
+import logging
+
+from framework.mongo import database
+
+from website.app import init_app
+from website.conferences.model import Conference, refresh_conference_submissions
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def migrate_tag_keys(dry_run=True):
+    """Set `tag_keys` directly in the database so that nodes are not re-saved
+    (which would re-index them and notify piwik).
+    """
+    count = 0
+    for node in database['node'].find({'tags': {'$ne': []}}, {'tags': True, 'tag_keys': True}):
+        tag_keys = sorted({tag.lower() for tag in node.get('tags') or []})
+        if tag_keys == node.get('tag_keys'):
+            continue
+        count += 1
+        if not dry_run:
+            database['node'].update(
+                {'_id': node['_id']},
+                {'$set': {'tag_keys': tag_keys}},
+            )
+    logger.info('Set tag keys on {0} nodes'.format(count))
+
+
+def migrate_submissions(dry_run=True):
+    for conference in Conference.find():
+        if not dry_run:
+            refresh_conference_submissions(conference)
+        logger.info('Conference {0}: {1} submissions'.format(
+            conference.endpoint,
+            conference.num_submissions,
+        ))
+
+
+def main(dry_run=True):
+    migrate_tag_keys(dry_run=dry_run)
+    migrate_submissions(dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
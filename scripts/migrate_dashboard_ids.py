@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Backfill `dashboard_id` on every user that has a dashboard, and
+`pointer_targets` on every folder.
+
+    python -m scripts.migrate_dashboard_ids dry
+"""
+
+import sys
+import logging
+
+from framework.mongo import database
+
+from website.app import init_app
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def migrate_dashboard_ids(dry_run=True):
+    count = 0
+    for node in database['node'].find({'is_dashboard': True}, {'creator': True}):
+        count += 1
+        if not dry_run:
+            database['user'].update(
+                {'_id': node['creator']},
+                {'$set': {'dashboard_id': node['_id']}},
+            )
+    logger.info('Set dashboard id on {0} users'.format(count))
+
+
+def compute_pointer_targets(nodes):
+    """Map pointed node ids to pointer ids from the raw `nodes` list of a
+    folder, which holds `[id, collection]` pairs.
+    """
+    pointer_ids = [
+        each[0] for each in nodes
+        if each[1] == 'pointer'
+    ]
+    return {
+        pointer['node']: pointer['_id']
+        for pointer in database['pointer'].find(
+            {'_id': {'$in': pointer_ids}},
+            {'node': True},
+        )
+        if pointer.get('node')
+    }
+
+
+def migrate_pointer_targets(dry_run=True):
+    """Set `pointer_targets` directly in the database so that folders are not
+    re-saved.
+    """
+    count = 0
+    for node in database['node'].find({'is_folder': True}, {'nodes': True}):
+        targets = compute_pointer_targets(node.get('nodes') or [])
+        count += 1
+        if not dry_run:
+            database['node'].update(
+                {'_id': node['_id']},
+                {'$set': {'pointer_targets': targets}},
+            )
+    logger.info('Set pointer targets on {0} folders'.format(count))
+
+
+def main(dry_run=True):
+    migrate_dashboard_ids(dry_run=dry_run)
+    migrate_pointer_targets(dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Backfill the activity summary (`log_count`, `last_log_date`,
+`last_log_user` and `user_log_counts`) on every node.
+
+    python -m scripts.migrate_log_summary dry
+"""
+
+import sys
+import logging
+import collections
+
+from framework.mongo import database
+
+from website.app import init_app
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def compute_summary(log_ids):
+    """Summarize logs from their raw records, in the order of `log_ids`."""
+    records = {
+        record['_id']: record
+        for record in database['nodelog'].find(
+            {'_id': {'$in': log_ids}},
+            {'date': True, 'user': True},
+        )
+    }
+    summary = {
+        'log_count': 0,
+        'last_log_date': None,
+        'last_log_user': None,
+        'user_log_counts': collections.Counter(),
+    }
+    for log_id in log_ids:
+        record = records.get(log_id)
+        if record is None:
+            continue
+        user_id = record.get('user')
+        summary['log_count'] += 1
+        summary['last_log_date'] = record.get('date')
+        summary['last_log_user'] = user_id
+        if user_id is not None:
+            summary['user_log_counts'][user_id] += 1
+    summary['user_log_counts'] = dict(summary['user_log_counts'])
+    return summary
+
+
+def migrate_log_summary(dry_run=True):
+    """Set summary fields directly in the database so that nodes are not
+    re-saved (which would re-index them and notify piwik).
+    """
+    count = 0
+    for node in database['node'].find({'log_count': None}, {'logs': True}):
+        summary = compute_summary(node.get('logs') or [])
+        count += 1
+        if not dry_run:
+            database['node'].update(
+                {'_id': node['_id']},
+                {'$set': summary},
+            )
+    logger.info('Set activity summary on {0} nodes'.format(count))
+
+
+def main(dry_run=True):
+    migrate_log_summary(dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Backfill `title_tokens`, the index used by node title search, on every
+node.
+
+    python -m scripts.migrate_title_tokens dry
+    python -m scripts.migrate_title_tokens restart
+"""
+
+import sys
+import logging
+
+from website.app import init_app
+from website.project.model import title_tokens
+from scripts import utils as scripts_utils
+from scripts.utils.batch_migration import BatchMigration
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+class MigrateTitleTokens(BatchMigration):
+    """Set tokens directly in the database so that nodes are not re-saved."""
+
+    name = 'title_tokens'
+    collection = 'node'
+    query = {'title_tokens': None}
+    fields = ['title']
+
+    def migrate(self, record):
+        return {'$set': {'title_tokens': title_tokens(record.get('title'))}}
+
+
+def main(dry_run=True, restart=False):
+    MigrateTitleTokens(dry_run=dry_run).run(restart=restart)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    restart = 'restart' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run, restart=restart)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Rebuild the co-contributor graph used for "most in common" contributor
+suggestions from the contributors of every node.
+
+    python -m scripts.rebuild_co_contributor_graph dry
+"""
+
+import sys
+import logging
+import collections
+
+from framework.mongo import database
+
+from website.app import init_app
+from website.project.co_contributors import CoContributorGraph, CoContributorNode
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def get_active_user_ids():
+    """Ids of active users; see `User.is_active`."""
+    return {
+        user['_id']
+        for user in database['user'].find(
+            {
+                'is_registered': True,
+                'password': {'$ne': None},
+                'merged_by': None,
+                'date_disabled': None,
+                'date_confirmed': {'$ne': None},
+            },
+            {'_id': True},
+        )
+    }
+
+
+def build_graph(active):
+    """Return ``(rows, nodes)``: the co-contributor counts of every user, and
+    the contributors of every node.
+    """
+    rows = collections.defaultdict(collections.Counter)
+    nodes = {}
+    for node in database['node'].find({}, {'contributors': True}):
+        contributors = sorted(set(node.get('contributors') or []))
+        nodes[node['_id']] = contributors
+        for user_id in contributors:
+            for other_id in contributors:
+                if other_id != user_id and other_id in active:
+                    rows[user_id][other_id] += 1
+    return rows, nodes
+
+
+def rebuild_co_contributor_graph(dry_run=True):
+    rows, nodes = build_graph(get_active_user_ids())
+    logger.info('Built co-contributor rows for {0} users from {1} nodes'.format(
+        len(rows), len(nodes)
+    ))
+    if dry_run:
+        return
+    # Rows and records are overwritten one at a time rather than dropped, so
+    # that updates made while the script runs are not lost for other rows
+    graph = CoContributorGraph._storage[0].store
+    for user_id, counts in rows.iteritems():
+        graph.update({'_id': user_id}, {'$set': {'counts': dict(counts)}}, upsert=True)
+    for row in graph.find({}, {'_id': True}):
+        if row['_id'] not in rows:
+            graph.update({'_id': row['_id']}, {'$set': {'counts': {}}})
+    snapshots = CoContributorNode._storage[0].store
+    for node_id, contributors in nodes.iteritems():
+        snapshots.update({'_id': node_id}, {'$set': {'contributors': contributors}}, upsert=True)
+
+
+def main(dry_run=True):
+    rebuild_co_contributor_graph(dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Rebuild the dashboard smart folder counts of every user, and the users each
+node is counted for, from the current nodes.
+
+    python -m scripts.rebuild_smart_folder_counts dry
+"""
+
+import sys
+import logging
+import collections
+
+from modularodm import Q
+
+from website.app import init_app
+from website.models import Node
+from website.project import smart_folders
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def build_counts():
+    """Return ``(counts, nodes)``: the smart folder counts of every user, and
+    the folder and users each node is counted for.
+    """
+    counts = collections.defaultdict(collections.Counter)
+    nodes = {}
+    for node in Node.find(Q('is_folder', 'ne', True)):
+        folder, user_ids = smart_folders.counted_users(node)
+        nodes[node._id] = (folder, sorted(user_ids))
+        for user_id in user_ids:
+            counts[user_id][folder] += 1
+    return counts, nodes
+
+
+def rebuild_smart_folder_counts(dry_run=True):
+    counts, nodes = build_counts()
+    logger.info('Built smart folder counts for {0} users from {1} nodes'.format(
+        len(counts), len(nodes)
+    ))
+    if dry_run:
+        return
+    # Counts and records are overwritten one at a time rather than dropped,
+    # so that updates made while the script runs are not lost for other users
+    store = smart_folders.SmartFolderCounts._storage[0].store
+    for user_id, row in counts.iteritems():
+        store.update(
+            {'_id': user_id},
+            {'$set': {
+                smart_folders.PROJECTS: row[smart_folders.PROJECTS],
+                smart_folders.REGISTRATIONS: row[smart_folders.REGISTRATIONS],
+            }},
+            upsert=True,
+        )
+    for record in store.find({}, {'_id': True}):
+        if record['_id'] not in counts:
+            store.update(
+                {'_id': record['_id']},
+                {'$set': {smart_folders.PROJECTS: 0, smart_folders.REGISTRATIONS: 0}},
+            )
+    records = smart_folders.SmartFolderNode._storage[0].store
+    for node_id, (folder, user_ids) in nodes.iteritems():
+        records.update(
+            {'_id': node_id},
+            {'$set': {'folder': folder, 'users': user_ids}},
+            upsert=True,
+        )
+
+
+def main(dry_run=True):
+    rebuild_smart_folder_counts(dry_run=dry_run)
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
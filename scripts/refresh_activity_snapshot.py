@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Recompute the public activity page snapshot. Run periodically from cron;
+see `scripts/cron.py`.
+"""
+
+import logging
+
+from website.app import init_app
+from website.discovery.utils import update_activity_snapshot
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def main():
+    snapshot = update_activity_snapshot()
+    logger.info('Activity snapshot generated at {0}'.format(snapshot.date_generated))
+
+
+if __name__ == '__main__':
+    init_app(set_backends=True, routes=False, mfr=False)
+    main()
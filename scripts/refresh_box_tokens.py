@@ -10,6 +10,8 @@ from dateutil.relativedelta import relativedelta
 
 from website.addons.box import model
 
+from scripts.refresh_oauth_tokens import refresh_all, refresh_legacy
+
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -22,15 +24,16 @@ def get_targets(delta):
 
 
 def main(delta, dry_run):
-    for record in get_targets(delta):
+    records = list(get_targets(delta))
+    for record in records:
         logger.info(
             'Refreshing tokens on record {0}; expires at {1}'.format(
                 record.user_id,
                 record.expires_at.strftime('%c')
             )
         )
-        if not dry_run:
-            record.refresh_access_token(force=True)
+    if not dry_run:
+        refresh_all([(refresh_legacy, record) for record in records])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""Refresh OAuth access tokens that are about to expire, so that requests do
+not have to wait on a refresh. Covers `ExternalAccount`s of providers that set
+`auto_refresh_url` and the legacy Box and Google Drive token records. Run
+periodically from cron; see `scripts/cron.py`.
+
+    python -m scripts.refresh_oauth_tokens [dry]
+"""
+import sys
+import time
+import random
+import logging
+import datetime
+from multiprocessing.pool import ThreadPool
+
+from modularodm import Q
+
+from website import settings
+from website.app import init_app
+from website.oauth.models import ExternalAccount
+from website.oauth.utils import PROVIDER_LOOKUP, get_service
+from website.addons.box.model import BoxOAuthSettings
+from website.addons.googledrive.model import GoogleDriveOAuthSettings
+
+from scripts import utils as scripts_utils
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+LEGACY_SETTINGS = (BoxOAuthSettings, GoogleDriveOAuthSettings)
+
+
+def get_refreshable_providers():
+    return [
+        short_name
+        for short_name, provider_class in PROVIDER_LOOKUP.items()
+        if provider_class.auto_refresh_url
+    ]
+
+
+def get_legacy_targets(window, models=LEGACY_SETTINGS):
+    # Legacy records store `expires_at` in UTC
+    cutoff = datetime.datetime.utcnow() + window
+    for model in models:
+        for record in model.find(Q('expires_at', 'lt', cutoff)):
+            yield record
+
+
+def get_account_targets(window):
+    providers = get_refreshable_providers()
+    if not providers:
+        return []
+    # `ExternalAccount.expires_at` is stored in local time
+    return ExternalAccount.find(
+        Q('provider', 'in', providers) &
+        Q('refresh_token', 'ne', None) &
+        Q('expires_at', 'lt', datetime.datetime.now() + window)
+    )
+
+
+def refresh_legacy(record):
+    record.refresh_access_token(force=True)
+
+
+def refresh_account(account):
+    provider = get_service(account.provider)
+    provider.account = account
+    provider.refresh_oauth_key(force=True)
+
+
+def refresh_with_retry(refresh, target, retries=None, jitter=None):
+    """Refresh one target after a random delay, spreading requests to the
+    provider over time; retry failures with exponential backoff.
+
+    :return bool: Whether the refresh succeeded
+    """
+    retries = settings.OAUTH_REFRESH_RETRIES if retries is None else retries
+    jitter = settings.OAUTH_REFRESH_JITTER if jitter is None else jitter
+    time.sleep(random.uniform(0, jitter))
+    for attempt in range(retries + 1):
+        try:
+            refresh(target)
+            return True
+        except Exception as error:
+            if attempt == retries:
+                logger.error('Failed to refresh tokens on {0!r}: {1}'.format(target, error))
+                return False
+            logger.warning('Retrying token refresh on {0!r}: {1}'.format(target, error))
+            time.sleep(2 ** attempt + random.uniform(0, jitter))
+
+
+def refresh_all(jobs, workers=None, retries=None, jitter=None):
+    """Run `(refresh, target)` jobs on at most `workers` threads.
+
+    :return tuple: Counts of successful and failed refreshes
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return 0, 0
+    workers = min(settings.OAUTH_REFRESH_WORKERS if workers is None else workers, len(jobs))
+    pool = ThreadPool(max(workers, 1))
+    try:
+        results = pool.map(
+            lambda job: refresh_with_retry(job[0], job[1], retries=retries, jitter=jitter),
+            jobs,
+        )
+    finally:
+        pool.close()
+        pool.join()
+    succeeded = sum(1 for result in results if result)
+    return succeeded, len(results) - succeeded
+
+
+def get_jobs(window):
+    jobs = [(refresh_legacy, record) for record in get_legacy_targets(window)]
+    jobs.extend((refresh_account, account) for account in get_account_targets(window))
+    return jobs
+
+
+def main(window=None, dry_run=True):
+    if window is None:
+        window = datetime.timedelta(seconds=settings.OAUTH_REFRESH_WINDOW)
+    jobs = get_jobs(window)
+    for _, target in jobs:
+        logger.info(
+            'Refreshing tokens on {0!r}; expires at {1}'.format(
+                target,
+                target.expires_at.strftime('%c'),
+            )
+        )
+    if dry_run:
+        return
+    succeeded, failed = refresh_all(jobs)
+    logger.info('Refreshed {0} tokens; {1} failed'.format(succeeded, failed))
+
+
+if __name__ == '__main__':
+    dry_run = 'dry' in sys.argv
+    init_app(set_backends=True, routes=False, mfr=False)
+    if not dry_run:
+        scripts_utils.add_file_logger(logger, __file__)
+    main(dry_run=dry_run)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+
+from framework.mongo import database
+
+from scripts.utils.batch_migration import (
+    BatchMigration, CHECKPOINTS, compute_bounds, describe_update,
+)
+
+
+COLLECTION = 'batchmigrationtest'
+
+
+class DoubleValues(BatchMigration):
+
+    name = 'double_values'
+    collection = COLLECTION
+    query = {'doubled': None}
+    fields = ['value']
+    batch_size = 3
+    partitions = 4
+    processes = 1
+
+    def migrate(self, record):
+        if record['value'] == 'fail':
+            raise ValueError('Cannot double')
+        return {'$set': {'doubled': record['value'] * 2}}
+
+
+class TestBatchMigration(OsfTestCase):
+
+    def setUp(self):
+        super(TestBatchMigration, self).setUp()
+        database[COLLECTION].remove({})
+        database[CHECKPOINTS].remove({})
+        database[COLLECTION].insert([
+            {'_id': '{0:02d}'.format(index), 'value': index % 3}
+            for index in range(20)
+        ])
+
+    def test_compute_bounds(self):
+        bounds = compute_bounds(database[COLLECTION], {}, 4)
+        assert_equal(
+            bounds,
+            [(None, '05'), ('05', '10'), ('10', '15'), ('15', None)],
+        )
+
+    def test_compute_bounds_empty(self):
+        assert_equal(compute_bounds(database[COLLECTION], {'value': 5}, 4), [])
+
+    def test_run(self):
+        totals = DoubleValues(dry_run=False).run()
+        assert_equal(totals, {'read': 20, 'updated': 20, 'errors': 0})
+        for record in database[COLLECTION].find():
+            assert_equal(record['doubled'], record['value'] * 2)
+        checkpoints = list(database[CHECKPOINTS].find({'migration': 'double_values'}))
+        assert_equal(len(checkpoints), 4)
+        assert_true(all(checkpoint['done'] for checkpoint in checkpoints))
+        assert_equal(sum(checkpoint['read'] for checkpoint in checkpoints), 20)
+
+    def test_dry_run(self):
+        totals = DoubleValues(dry_run=True).run()
+        assert_equal(totals['updated'], 20)
+        assert_equal(database[COLLECTION].find({'doubled': {'$exists': True}}).count(), 0)
+        assert_equal(database[CHECKPOINTS].find().count(), 0)
+
+    def test_resume_from_checkpoint(self):
+        DoubleValues(dry_run=False).run()
+        database[COLLECTION].update({}, {'$unset': {'doubled': True}}, multi=True)
+        database[CHECKPOINTS].update(
+            {'_id': 'double_values:0'},
+            {'$set': {'done': False, 'last_id': '02'}},
+        )
+        totals = DoubleValues(dry_run=False).run()
+        assert_equal(totals['read'], 2)
+        migrated = database[COLLECTION].find({'doubled': {'$exists': True}}).distinct('_id')
+        assert_equal(sorted(migrated), ['03', '04'])
+
+    def test_restart(self):
+        DoubleValues(dry_run=False).run()
+        database[COLLECTION].update({}, {'$unset': {'doubled': True}}, multi=True)
+        totals = DoubleValues(dry_run=False).run(restart=True)
+        assert_equal(totals['read'], 20)
+
+    def test_errors_are_counted(self):
+        database[COLLECTION].update({'_id': '07'}, {'$set': {'value': 'fail'}})
+        totals = DoubleValues(dry_run=False).run()
+        assert_equal(totals, {'read': 20, 'updated': 19, 'errors': 1})
+        assert_not_in('doubled', database[COLLECTION].find_one({'_id': '07'}))
+
+    def test_unknown_option(self):
+        with assert_raises(TypeError):
+            DoubleValues(batchsize=10)
+
+    def test_describe_update(self):
+        record = {'_id': '01', 'value': 1, 'old': 2}
+        update = {'$set': {'value': 2}, '$unset': {'old': True}}
+        assert_equal(describe_update(record, update), 'value: 1 -> 2; old: 2 -> unset')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from bson import ObjectId
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+
+from framework.mongo import database
+
+from scripts.analytics import log_rollups
+
+
+def make_log(created, action, user='u1', date=None):
+    # Primary keys carry their creation time, like those of saved logs
+    log_id = str(ObjectId.from_datetime(created))[:8] + str(ObjectId())[8:]
+    database['nodelog'].insert({
+        '_id': log_id,
+        'action': action,
+        'user': user,
+        'date': date or created,
+    })
+
+
+class TestLogRollups(OsfTestCase):
+
+    def setUp(self):
+        super(TestLogRollups, self).setUp()
+        for collection in ('nodelog', log_rollups.ACTION_ROLLUPS,
+                           log_rollups.USER_ROLLUPS, log_rollups.CHECKPOINTS):
+            database[collection].remove({})
+        self.day = datetime.datetime(2015, 3, 1)
+        self.now = self.day + datetime.timedelta(days=2, hours=12)
+        make_log(self.day + datetime.timedelta(hours=1), 'project_created')
+        make_log(self.day + datetime.timedelta(hours=2), 'project_created', user='u2')
+        make_log(self.day + datetime.timedelta(days=1, hours=3), 'tag_added')
+
+    def test_update_rollups(self):
+        assert_equal(log_rollups.update_rollups(now=self.now), 3)
+        assert_equal(
+            log_rollups.get_action_counts(),
+            {'project_created': 2, 'tag_added': 1},
+        )
+        assert_equal(
+            log_rollups.get_action_days('project_created'),
+            [(self.day, 2)],
+        )
+        assert_equal(log_rollups.get_user_counts(), {'u1': 2, 'u2': 1})
+        assert_equal(
+            log_rollups.get_user_counts(since=self.day + datetime.timedelta(days=1)),
+            {'u1': 1},
+        )
+
+    def test_update_is_incremental_and_idempotent(self):
+        log_rollups.update_rollups(now=self.now)
+        make_log(self.now, 'tag_added')
+        # Only the checkpoint's batch and later ones are processed again
+        assert_equal(log_rollups.update_rollups(now=self.now), 2)
+        assert_equal(
+            log_rollups.get_action_counts(),
+            {'project_created': 2, 'tag_added': 2},
+        )
+
+    def test_action_counts_window(self):
+        log_rollups.update_rollups(now=self.now)
+        counts = log_rollups.get_action_counts(
+            since=self.day,
+            until=self.day + datetime.timedelta(days=1),
+        )
+        assert_equal(counts, {'project_created': 2})
+
+    def test_no_logs(self):
+        database['nodelog'].remove({})
+        assert_equal(log_rollups.update_rollups(now=self.now), 0)
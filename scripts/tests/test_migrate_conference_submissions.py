@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from modularodm import Q
+
+from tests.base import OsfTestCase
+from tests.factories import ProjectFactory
+from tests.test_conferences import ConferenceFactory
+
+from framework.auth.core import Auth
+from framework.mongo import database
+
+from website.conferences.model import ConferenceSubmission
+
+from scripts.migrate_conference_submissions import main
+
+
+class TestMigrateConferenceSubmissions(OsfTestCase):
+
+    def setUp(self):
+        super(TestMigrateConferenceSubmissions, self).setUp()
+        self.conference = ConferenceFactory()
+        self.node = ProjectFactory(is_public=True)
+        self.node.add_tag(self.conference.endpoint.upper(), Auth(self.node.creator))
+        # Simulate data from before tag keys and submissions were maintained
+        database['node'].update({'_id': self.node._id}, {'$unset': {'tag_keys': True}})
+        ConferenceSubmission.remove()
+        self.conference.num_submissions = 0
+        self.conference.save()
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        assert_equal(ConferenceSubmission.find().count(), 0)
+        assert_not_in('tag_keys', database['node'].find_one({'_id': self.node._id}))
+
+    def test_migrate(self):
+        main(dry_run=False)
+        record = database['node'].find_one({'_id': self.node._id})
+        assert_equal(record['tag_keys'], [self.conference.endpoint])
+        submissions = ConferenceSubmission.find(Q('conference', 'eq', self.conference._id))
+        assert_equal(submissions.count(), 1)
+        self.conference.reload()
+        assert_equal(self.conference.num_submissions, 1)
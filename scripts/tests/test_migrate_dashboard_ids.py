@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import DashboardFactory, ProjectFactory, FolderFactory
+
+from framework.auth.core import Auth
+from framework.mongo import database
+
+from website.models import Node, User
+
+from scripts.migrate_dashboard_ids import main
+
+
+class TestMigrateDashboardIds(OsfTestCase):
+
+    def setUp(self):
+        super(TestMigrateDashboardIds, self).setUp()
+        self.dashboard = DashboardFactory()
+        self.user = self.dashboard.creator
+        self.project = ProjectFactory(creator=self.user)
+        self.folder = FolderFactory(creator=self.user)
+        self.dashboard.add_pointer(self.project, auth=Auth(self.user))
+        self.dashboard.add_pointer(self.folder, auth=Auth(self.user))
+        # Simulate data from before dashboard ids and pointer targets were
+        # stored
+        database['user'].update(
+            {'_id': self.user._id},
+            {'$unset': {'dashboard_id': True}},
+        )
+        database['node'].update(
+            {},
+            {'$unset': {'pointer_targets': True}},
+            multi=True,
+        )
+        User._clear_caches()
+        Node._clear_caches()
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        assert_not_in('dashboard_id', database['user'].find_one({'_id': self.user._id}))
+        assert_not_in('pointer_targets', database['node'].find_one({'_id': self.dashboard._id}))
+
+    def test_migrate(self):
+        main(dry_run=False)
+        user = User.load(self.user._id)
+        assert_equal(user.dashboard_id, self.dashboard._id)
+        dashboard = Node.load(self.dashboard._id)
+        assert_equal(
+            set(dashboard.pointer_targets),
+            {self.project._id, self.folder._id},
+        )
+        assert_equal(
+            dashboard.pointing_at(self.project._id),
+            dashboard.nodes_pointer[0]._id,
+        )
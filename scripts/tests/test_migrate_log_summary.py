@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import ProjectFactory, UserFactory
+
+from framework.auth.core import Auth
+from framework.mongo import database
+
+from website.models import Node
+
+from scripts.migrate_log_summary import main
+
+
+SUMMARY_FIELDS = ['log_count', 'last_log_date', 'last_log_user', 'user_log_counts']
+
+
+class TestMigrateLogSummary(OsfTestCase):
+
+    def setUp(self):
+        super(TestMigrateLogSummary, self).setUp()
+        self.node = ProjectFactory()
+        self.contrib = UserFactory()
+        self.node.add_contributor(self.contrib, auth=Auth(self.node.creator))
+        self.node.set_title('Changed', auth=Auth(self.contrib))
+        self.node.save()
+        # Simulate data from before the activity summary was maintained
+        database['node'].update(
+            {'_id': self.node._id},
+            {'$unset': {field: True for field in SUMMARY_FIELDS}},
+        )
+        Node._clear_caches()
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        record = database['node'].find_one({'_id': self.node._id})
+        for field in SUMMARY_FIELDS:
+            assert_not_in(field, record)
+
+    def test_migrate(self):
+        main(dry_run=False)
+        record = database['node'].find_one({'_id': self.node._id})
+        assert_equal(record['log_count'], 3)
+        assert_equal(record['last_log_user'], self.contrib._id)
+        assert_equal(
+            record['user_log_counts'],
+            {self.node.creator._id: 2, self.contrib._id: 1},
+        )
+        node = Node.load(self.node._id)
+        assert_equal(node.date_modified, node.logs[-1].date)
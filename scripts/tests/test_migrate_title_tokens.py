@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import ProjectFactory
+
+from framework.mongo import database
+
+from scripts.migrate_title_tokens import main
+from scripts.utils.batch_migration import CHECKPOINTS
+
+
+class TestMigrateTitleTokens(OsfTestCase):
+
+    def setUp(self):
+        super(TestMigrateTitleTokens, self).setUp()
+        self.node = ProjectFactory(title='Ab Cd')
+        database['node'].update(
+            {'_id': self.node._id},
+            {'$unset': {'title_tokens': True}},
+        )
+        database[CHECKPOINTS].remove({})
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        record = database['node'].find_one({'_id': self.node._id})
+        assert_not_in('title_tokens', record)
+
+    def test_migrate(self):
+        main(dry_run=False)
+        record = database['node'].find_one({'_id': self.node._id})
+        assert_equal(record['title_tokens'], ['a', 'ab', 'c', 'cd'])
+
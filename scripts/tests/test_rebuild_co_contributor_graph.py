@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import AuthUserFactory, ProjectFactory, UnregUserFactory
+
+from framework.auth.core import Auth
+
+from website.project import co_contributors
+
+from scripts.rebuild_co_contributor_graph import main
+
+
+class TestRebuildCoContributorGraph(OsfTestCase):
+
+    def setUp(self):
+        super(TestRebuildCoContributorGraph, self).setUp()
+        self.user = AuthUserFactory()
+        self.contributor = AuthUserFactory()
+        self.unregistered = UnregUserFactory()
+        self.projects = []
+        for _ in range(2):
+            project = ProjectFactory(creator=self.user)
+            project.add_contributor(self.contributor, auth=Auth(self.user))
+            project.add_contributor(self.unregistered, auth=Auth(self.user))
+            project.save()
+            self.projects.append(project)
+        co_contributors._graph().remove({})
+        co_contributors._nodes().remove({})
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        assert_is_none(co_contributors.get_counts(self.user._id))
+
+    def test_rebuild(self):
+        main(dry_run=False)
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 2})
+        assert_equal(
+            co_contributors.get_counts(self.unregistered._id),
+            {self.user._id: 2, self.contributor._id: 2},
+        )
+        for project in self.projects:
+            record = co_contributors._nodes().find_one({'_id': project._id})
+            assert_equal(
+                record['contributors'],
+                sorted([self.user._id, self.contributor._id, self.unregistered._id]),
+            )
+
+    def test_rebuild_overwrites_existing_rows(self):
+        stranger = AuthUserFactory()
+        co_contributors._graph().insert({'_id': self.user._id, 'counts': {self.contributor._id: 5}})
+        co_contributors._graph().insert({'_id': stranger._id, 'counts': {self.user._id: 1}})
+        main(dry_run=False)
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 2})
+        assert_equal(co_contributors.get_counts(stranger._id), {})
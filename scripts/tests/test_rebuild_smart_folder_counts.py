@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import AuthUserFactory, ProjectFactory, NodeFactory
+
+from website.project import smart_folders
+
+from scripts.rebuild_smart_folder_counts import main
+
+
+class TestRebuildSmartFolderCounts(OsfTestCase):
+
+    def setUp(self):
+        super(TestRebuildSmartFolderCounts, self).setUp()
+        self.user = AuthUserFactory()
+        self.project = ProjectFactory(creator=self.user)
+        self.component = NodeFactory(creator=self.user, parent=self.project)
+        self.other = NodeFactory(creator=self.user)
+        smart_folders._counts().remove({})
+        smart_folders._nodes().remove({})
+
+    def test_dry_run(self):
+        main(dry_run=True)
+        assert_is_none(smart_folders._counts().find_one({'_id': self.user._id}))
+
+    def test_rebuild(self):
+        main(dry_run=False)
+        record = smart_folders._counts().find_one({'_id': self.user._id})
+        assert_equal(record['projects'], 2)
+        assert_equal(record['registrations'], 0)
+        record = smart_folders._nodes().find_one({'_id': self.other._id})
+        assert_equal(record['folder'], 'projects')
+        assert_equal(record['users'], [self.user._id])
+        # The component is shown under the project, so it is counted for no one
+        record = smart_folders._nodes().find_one({'_id': self.component._id})
+        assert_equal(record['users'], [])
+
+    def test_rebuild_overwrites_existing_counts(self):
+        stranger = AuthUserFactory()
+        smart_folders._counts().insert({'_id': self.user._id, 'projects': 7, 'registrations': 1})
+        smart_folders._counts().insert({'_id': stranger._id, 'projects': 3, 'registrations': 0})
+        main(dry_run=False)
+        record = smart_folders._counts().find_one({'_id': self.user._id})
+        assert_equal((record['projects'], record['registrations']), (2, 0))
+        record = smart_folders._counts().find_one({'_id': stranger._id})
+        assert_equal((record['projects'], record['registrations']), (0, 0))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import mock
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import ExternalAccountFactory
+
+from website.oauth.models import ExternalAccount
+from website.addons.box.model import BoxOAuthSettings
+from website.addons.box.tests.factories import BoxOAuthSettingsFactory
+from website.addons.googledrive.model import GoogleDriveOAuthSettings
+from website.addons.googledrive.tests.factories import GoogleDriveOAuthSettingsFactory
+from website.addons.mendeley.model import Mendeley
+
+from scripts import refresh_oauth_tokens
+from scripts.refresh_oauth_tokens import (
+    get_account_targets,
+    get_legacy_targets,
+    main,
+    refresh_all,
+    refresh_with_retry,
+)
+
+
+class TestRefreshOAuthTokens(OsfTestCase):
+
+    def setUp(self):
+        super(TestRefreshOAuthTokens, self).setUp()
+        self.window = datetime.timedelta(minutes=20)
+
+    def tearDown(self):
+        super(TestRefreshOAuthTokens, self).tearDown()
+        BoxOAuthSettings.remove()
+        GoogleDriveOAuthSettings.remove()
+        ExternalAccount.remove()
+
+    def test_get_legacy_targets(self):
+        now = datetime.datetime.utcnow()
+        expiring = [
+            BoxOAuthSettingsFactory(expires_at=now + datetime.timedelta(minutes=5)),
+            GoogleDriveOAuthSettingsFactory(expires_at=now + datetime.timedelta(minutes=5)),
+        ]
+        fresh = BoxOAuthSettingsFactory(expires_at=now + datetime.timedelta(hours=1))
+        targets = list(get_legacy_targets(self.window))
+        for record in expiring:
+            assert_in(record, targets)
+        assert_not_in(fresh, targets)
+
+    def test_get_account_targets(self):
+        now = datetime.datetime.now()
+        expiring = ExternalAccountFactory(
+            provider=Mendeley.short_name,
+            refresh_token='refresh',
+            expires_at=now + datetime.timedelta(minutes=5),
+        )
+        fresh = ExternalAccountFactory(
+            provider=Mendeley.short_name,
+            refresh_token='refresh',
+            expires_at=now + datetime.timedelta(hours=1),
+        )
+        # Providers without `auto_refresh_url` cannot be refreshed
+        unsupported = ExternalAccountFactory(
+            provider='mock2',
+            refresh_token='refresh',
+            expires_at=now + datetime.timedelta(minutes=5),
+        )
+        targets = list(get_account_targets(self.window))
+        assert_equal(targets, [expiring])
+        assert_not_in(fresh, targets)
+        assert_not_in(unsupported, targets)
+
+    @mock.patch('scripts.refresh_oauth_tokens.time.sleep')
+    def test_refresh_with_retry(self, mock_sleep):
+        refresh = mock.Mock(side_effect=[Exception('timeout'), Exception('timeout'), None])
+        assert_true(refresh_with_retry(refresh, 'target', retries=2, jitter=0))
+        assert_equal(refresh.call_count, 3)
+
+    @mock.patch('scripts.refresh_oauth_tokens.time.sleep')
+    def test_refresh_with_retry_gives_up(self, mock_sleep):
+        refresh = mock.Mock(side_effect=Exception('timeout'))
+        assert_false(refresh_with_retry(refresh, 'target', retries=2, jitter=0))
+        assert_equal(refresh.call_count, 3)
+
+    @mock.patch('scripts.refresh_oauth_tokens.time.sleep')
+    def test_refresh_all(self, mock_sleep):
+        refresh = mock.Mock(side_effect=lambda target: target.fail and 1 / 0)
+        targets = [mock.Mock(fail=False) for _ in range(5)] + [mock.Mock(fail=True)]
+        succeeded, failed = refresh_all(
+            [(refresh, target) for target in targets],
+            workers=3, retries=0, jitter=0,
+        )
+        assert_equal((succeeded, failed), (5, 1))
+        assert_equal(refresh.call_count, 6)
+
+    @mock.patch('scripts.refresh_oauth_tokens.time.sleep')
+    @mock.patch.object(Mendeley, 'refresh_oauth_key')
+    @mock.patch.object(BoxOAuthSettings, 'refresh_access_token')
+    def test_main(self, mock_box_refresh, mock_mendeley_refresh, mock_sleep):
+        BoxOAuthSettingsFactory(expires_at=datetime.datetime.utcnow())
+        ExternalAccountFactory(
+            provider=Mendeley.short_name,
+            refresh_token='refresh',
+            expires_at=datetime.datetime.now(),
+        )
+        main(dry_run=False)
+        mock_box_refresh.assert_called_once_with(force=True)
+        mock_mendeley_refresh.assert_called_once_with(force=True)
+
+    @mock.patch.object(refresh_oauth_tokens, 'refresh_all')
+    def test_main_dry_run(self, mock_refresh_all):
+        BoxOAuthSettingsFactory(expires_at=datetime.datetime.utcnow())
+        main(dry_run=True)
+        assert_false(mock_refresh_all.called)
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""Runner for migrations that touch every matching record of a collection.
+
+The matching records are split into partitions by ranges of `_id`, and the
+partitions are processed by a pool of worker processes. Each worker reads its
+partition in batches sorted by `_id`, computes an update for each record, and
+writes records that get the same update with a single multi-update. Progress
+is checkpointed after every batch, so an interrupted migration picks up from
+the last batch written by each partition instead of starting over.
+
+Example usage:
+::
+
+    class MigrateTitleTokens(BatchMigration):
+
+        name = 'title_tokens'
+        collection = 'node'
+        query = {'title_tokens': None}
+        fields = ['title']
+
+        def migrate(self, record):
+            return {'$set': {'title_tokens': title_tokens(record.get('title'))}}
+
+    MigrateTitleTokens(dry_run=False).run()
+"""
+
+import json
+import time
+import logging
+import collections
+import multiprocessing
+
+from framework.mongo import database
+from framework.mongo import handlers
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS = 'migrationcheckpoints'
+
+COUNTERS = ('read', 'updated', 'errors')
+
+
+class BatchMigration(object):
+
+    # Name of the migration; checkpoints are stored under this name
+    name = None
+    # Collection to migrate
+    collection = None
+    # Query selecting the records to migrate
+    query = {}
+    # Fields passed to `migrate`; all fields if None
+    fields = None
+    batch_size = 500
+    partitions = 16
+    # Records are processed in the calling process if 1
+    processes = 4
+
+    def __init__(self, dry_run=True, **kwargs):
+        self.dry_run = dry_run
+        for key, value in kwargs.items():
+            if not hasattr(self, key):
+                raise TypeError('Unknown option {0!r}'.format(key))
+            setattr(self, key, value)
+        if self.name is None:
+            self.name = self.__class__.__name__
+
+    def migrate(self, record):
+        """Return the update to apply to ``record``, or None to leave it
+        unchanged.
+        """
+        raise NotImplementedError
+
+    def run(self, restart=False):
+        """Process every partition that has not been completed and return the
+        totals of records read, updated and failed. Dry runs neither write
+        records nor read or write checkpoints.
+
+        :param bool restart: Discard checkpoints and start from scratch
+        """
+        if restart and not self.dry_run:
+            reset_checkpoints(self.name)
+        partitions = self.get_partitions()
+        pending = [
+            partition for partition in partitions
+            if not partition.get('done')
+        ]
+        logger.info('{0}: processing {1} of {2} partitions'.format(
+            self.name, len(pending), len(partitions)
+        ))
+        start = time.time()
+        if self.processes > 1 and len(pending) > 1:
+            pool = multiprocessing.Pool(self.processes, initializer=_init_worker)
+            try:
+                results = pool.map(_run_partition, [(self, partition) for partition in pending])
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self.run_partition(partition) for partition in pending]
+        totals = dict.fromkeys(COUNTERS, 0)
+        for result in results:
+            for key in COUNTERS:
+                totals[key] += result[key]
+        logger.info('{0}: {1}'.format(self.name, format_stats(totals, time.time() - start)))
+        return totals
+
+    def get_partitions(self):
+        """Return the stored partitions of this migration, or split the
+        matching records into new partitions.
+        """
+        if not self.dry_run:
+            stored = list(
+                database[CHECKPOINTS].find({'migration': self.name}).sort('index', 1)
+            )
+            if stored:
+                return stored
+        partitions = [
+            {
+                '_id': '{0}:{1}'.format(self.name, index),
+                'migration': self.name,
+                'index': index,
+                'lower': lower,
+                'upper': upper,
+                'last_id': None,
+                'done': False,
+            }
+            for index, (lower, upper) in enumerate(
+                compute_bounds(database[self.collection], self.query, self.partitions)
+            )
+        ]
+        if partitions and not self.dry_run:
+            database[CHECKPOINTS].insert(partitions)
+        return partitions
+
+    def read_batch(self, partition, last_id):
+        bounds = {}
+        if last_id is not None:
+            bounds['$gt'] = last_id
+        elif partition['lower'] is not None:
+            bounds['$gte'] = partition['lower']
+        if partition['upper'] is not None:
+            bounds['$lt'] = partition['upper']
+        if not bounds:
+            query = self.query
+        elif '_id' in self.query:
+            query = {'$and': [self.query, {'_id': bounds}]}
+        else:
+            query = dict(self.query, _id=bounds)
+        return list(
+            database[self.collection].find(query, self.fields)
+            .sort('_id', 1)
+            .limit(self.batch_size)
+        )
+
+    def run_partition(self, partition):
+        stats = dict.fromkeys(COUNTERS, 0)
+        last_id = partition['last_id']
+        start = time.time()
+        while True:
+            batch = self.read_batch(partition, last_id)
+            if not batch:
+                break
+            updates = collections.OrderedDict()
+            for record in batch:
+                stats['read'] += 1
+                try:
+                    update = self.migrate(record)
+                except Exception:
+                    stats['errors'] += 1
+                    logger.exception('{0}: failed to migrate {1}'.format(self.name, record['_id']))
+                    continue
+                if not update:
+                    continue
+                if self.dry_run:
+                    logger.info('{0}: {1} {2}'.format(
+                        self.name, record['_id'], describe_update(record, update)
+                    ))
+                    stats['updated'] += 1
+                    continue
+                key = json.dumps(update, sort_keys=True, default=repr)
+                updates.setdefault(key, (update, []))[1].append(record['_id'])
+            for update, ids in updates.values():
+                try:
+                    database[self.collection].update(
+                        {'_id': {'$in': ids}}, update, multi=True
+                    )
+                except Exception:
+                    stats['errors'] += len(ids)
+                    logger.exception('{0}: failed to update {1} records'.format(self.name, len(ids)))
+                else:
+                    stats['updated'] += len(ids)
+            last_id = batch[-1]['_id']
+            if not self.dry_run:
+                save_checkpoint(partition, last_id, stats)
+        if not self.dry_run:
+            save_checkpoint(partition, last_id, stats, done=True)
+        logger.info('{0}: partition {1}: {2}'.format(
+            self.name, partition['index'], format_stats(stats, time.time() - start)
+        ))
+        return stats
+
+
+def _init_worker():
+    """Give each worker process its own client; clients must not be shared
+    across a fork.
+    """
+    handlers._mongo_client = handlers.get_mongo_client()
+
+
+def _run_partition(args):
+    migration, partition = args
+    return migration.run_partition(partition)
+
+
+def compute_bounds(collection, query, count):
+    """Split the records matching ``query`` into up to ``count`` ranges of
+    `_id` of about the same size. Each range is a ``(lower, upper)`` pair,
+    where `lower` is inclusive, `upper` is exclusive, and None is unbounded.
+    """
+    total = collection.find(query).count()
+    if not total:
+        return []
+    size = max(total // count, 1)
+    boundaries = []
+    for offset in range(size, total, size):
+        record = collection.find(query, {'_id': True}).sort('_id', 1).skip(offset).limit(1)
+        record = next(iter(record), None)
+        if record is not None and (not boundaries or record['_id'] != boundaries[-1]):
+            boundaries.append(record['_id'])
+        if len(boundaries) == count - 1:
+            break
+    lowers = [None] + boundaries
+    uppers = boundaries + [None]
+    return zip(lowers, uppers)
+
+
+def save_checkpoint(partition, last_id, stats, done=False):
+    """Record progress on a partition; counters include those of earlier,
+    interrupted runs.
+    """
+    values = {'last_id': last_id, 'done': done}
+    for key in COUNTERS:
+        values[key] = partition.get(key, 0) + stats[key]
+    database[CHECKPOINTS].update({'_id': partition['_id']}, {'$set': values})
+
+
+def reset_checkpoints(name):
+    database[CHECKPOINTS].remove({'migration': name})
+
+
+def describe_update(record, update):
+    """Describe the changes ``update`` makes to fields of ``record``."""
+    changes = []
+    for operator, values in sorted(update.items()):
+        for key, value in sorted(values.items()):
+            if operator == '$set':
+                changes.append('{0}: {1!r} -> {2!r}'.format(key, record.get(key), value))
+            elif operator == '$unset':
+                changes.append('{0}: {1!r} -> unset'.format(key, record.get(key)))
+            else:
+                changes.append('{0} {1} {2!r}'.format(operator, key, value))
+    return '; '.join(changes)
+
+
+def format_stats(stats, seconds):
+    return '{read} read, {updated} updated, {errors} errors in {seconds:.1f}s ({rate:.1f} records/s)'.format(
+        seconds=seconds,
+        rate=stats['read'] / seconds if seconds else 0.0,
+        **stats
+    )
@@ -600,6 +600,27 @@ def clear_sessions(months=1, dry_run=False):
     clear_sessions.clear_sessions_relative(months=months, dry_run=dry_run)
 
 
+@task
+def precompile_templates():
+    """Compile page and email templates to settings.MAKO_MODULE_PATH and report
+    compile time per template. Run at build/deploy time.
+    """
+    from framework.routing import precompile_mako_templates
+    from website import mails
+    report = precompile_mako_templates() + mails.precompile_templates()
+    report.sort(key=lambda row: row[1], reverse=True)
+    for path, elapsed, error in report:
+        print('{0:8.3f}s  {1}{2}'.format(
+            elapsed,
+            path,
+            '  ERROR: {0!r}'.format(error) if error else '',
+        ))
+    print('Compiled {0} templates in {1:.3f}s'.format(
+        len(report),
+        sum(row[1] for row in report),
+    ))
+
+
 @task
 def clear_mfr_cache():
     run('rm -rf {0}/*'.format(settings.MFR_TEMP_PATH), echo=True)
@@ -7,14 +7,16 @@ import json
 import unittest
 import os
 
+import mock
 import flask
 from lxml.html import fragment_fromstring
 import werkzeug.wrappers
 
 from framework.exceptions import HTTPError, http
 from framework.routing import (
-    Renderer, JSONRenderer, WebRenderer,
-    render_mako_string,
+    Renderer, JSONRenderer, WebRenderer, EmbedSlot,
+    render_mako_string, split_embeds, get_embed_timings,
+    load_mako_template, precompile_mako_templates, mako_cache, _tpl_lookup,
 )
 
 from tests.base import AppTestCase, OsfTestCase
@@ -230,6 +232,22 @@ class WebRendererTemplateTestCase(OsfTestCase):
         # The contents of the inner template should be present in the page.
         self.assertIn('child template content', resp.data)
 
+    def test_inherited_template(self):
+        """Templates in subdirectories inherit from templates named relative to
+        the root of the template lookup, as page templates do.
+        """
+        self.app.app.preprocess_request()
+        directories = _tpl_lookup.directories + [TEMPLATES_PATH]
+        r = WebRenderer(
+            'pages/child.html',
+            render_mako_string,
+            template_dir=TEMPLATES_PATH,
+        )
+        with mock.patch.object(_tpl_lookup, 'directories', directories):
+            resp = r({'name': 'base'})
+        self.assertIn('<div class="base">', resp.data)
+        self.assertIn('child of base', resp.data)
+
     def test_render_included_template(self):
         """``WebRenderer.render_element()`` is the internal method called when
         a template string is rendered. This test case examines the same
@@ -319,6 +337,115 @@ class WebRendererTemplateTestCase(OsfTestCase):
         )
 
 
+    def test_render_assembles_embeds(self):
+        self.app.app.preprocess_request()
+
+        r = WebRenderer(
+            'nested_child.html',
+            render_mako_string,
+            template_dir=TEMPLATES_PATH,
+        )
+        rendered = r._render(
+            {},
+            template_name='nested_parent.html',
+        )
+        self.assertIn('<p>child template content</p>', rendered)
+        self.assertNotIn('mod-meta', rendered)
+
+    def test_embed_timings_recorded(self):
+        self.app.app.preprocess_request()
+
+        r = WebRenderer(
+            'nested_parent.html',
+            render_mako_string,
+            template_dir=TEMPLATES_PATH,
+        )
+        r({})
+        timings = get_embed_timings()
+        self.assertEqual(len(timings), 1)
+        self.assertEqual(timings[0][0], 'nested_child.html')
+
+    @mock.patch('framework.routing.settings.EMBED_RENDER_WORKERS', 4)
+    def test_concurrent_embeds(self):
+        self.app.app.preprocess_request()
+        r = WebRenderer(
+            'nested_child.html',
+            render_mako_string,
+            template_dir=TEMPLATES_PATH,
+        )
+        embed = "<div mod-meta='{\"tpl\": \"nested_child.html\", \"replace\": true}'></div>"
+        with mock.patch.object(self.app.app, 'do_teardown_request') as mock_teardown:
+            rendered = r._render_slots(split_embeds(embed * 4)[1::2], {})
+        self.assertFalse(mock_teardown.called)
+        self.assertEqual(len(rendered), 4)
+        for template_rendered, is_replace in rendered:
+            self.assertIn('child template content', template_rendered)
+            self.assertTrue(is_replace)
+        self.assertEqual(len(get_embed_timings()), 4)
+
+
+class MakoTemplateCacheTestCase(AppTestCase):
+
+    def tearDown(self):
+        super(MakoTemplateCacheTestCase, self).tearDown()
+        mako_cache.clear()
+
+    def test_load_missing_template_raises_ioerror(self):
+        with self.assertRaises(IOError):
+            load_mako_template(TEMPLATES_PATH, 'not_a_real_file.html')
+
+    def test_load_template_writes_compiled_module(self):
+        tpl = load_mako_template(TEMPLATES_PATH, 'nested_child.html')
+        self.assertTrue(os.path.isfile(tpl.module.__file__))
+        self.assertIn('child template content', tpl.render())
+
+    def test_precompile_reports_each_template(self):
+        report = precompile_mako_templates([
+            (TEMPLATES_PATH, 'nested_child.html'),
+            (TEMPLATES_PATH, 'not_a_real_file.html'),
+        ])
+        self.assertEqual(len(report), 2)
+        path, elapsed, error = report[0]
+        self.assertEqual(path, os.path.join(TEMPLATES_PATH, 'nested_child.html'))
+        self.assertIsNone(error)
+        self.assertIsInstance(report[1][2], IOError)
+
+
+class SplitEmbedsTestCase(unittest.TestCase):
+
+    def test_no_embeds(self):
+        self.assertEqual(split_embeds('<p>static</p>'), ['<p>static</p>'])
+
+    def test_segments_and_slots_in_order(self):
+        rendered = ''.join((
+            '<body>',
+            "<div class=\"a\" mod-meta='{\"tpl\": \"a.mako\"}'></div>",
+            '<p>middle</p>',
+            "<span mod-meta='{\"tpl\": \"b.mako\"}'>\n</span>",
+            '</body>',
+        ))
+        segments = split_embeds(rendered)
+        self.assertEqual(len(segments), 5)
+        self.assertEqual(segments[0], '<body>')
+        self.assertEqual(
+            segments[1],
+            EmbedSlot(
+                meta='{"tpl": "a.mako"}',
+                open_tag="<div class=\"a\" mod-meta='{\"tpl\": \"a.mako\"}'>",
+                close_tag='</div>',
+            ),
+        )
+        self.assertEqual(segments[2], '<p>middle</p>')
+        self.assertEqual(segments[3].meta, '{"tpl": "b.mako"}')
+        self.assertEqual(segments[3].close_tag, '</span>')
+        self.assertEqual(segments[4], '</body>')
+
+    def test_multiline_meta_is_unescaped(self):
+        rendered = "<div mod-meta='{\n\"uri\": \"/a/?b=1&amp;c=2\"\n}'></div>"
+        slot = split_embeds(rendered)[1]
+        self.assertEqual(json.loads(slot.meta)['uri'], '/a/?b=1&c=2')
+
+
 class JSONRendererEncoderTestCase(unittest.TestCase):
 
     def test_encode_custom_class(self):
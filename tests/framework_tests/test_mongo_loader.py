@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import mock
+from nose.tools import *  # noqa
+
+from framework.auth import User
+from framework.mongo import loader
+
+from tests.base import OsfTestCase
+from tests.factories import ProjectFactory, UserFactory
+
+
+class TestBatchLoader(OsfTestCase):
+
+    def setUp(self):
+        super(TestBatchLoader, self).setUp()
+        self.users = [UserFactory() for _ in range(3)]
+        self.keys = [user._id for user in self.users]
+        User._clear_caches()
+        self.ctx = self.app.app.test_request_context()
+        self.ctx.push()
+        loader.loader_before_request()
+
+    def tearDown(self):
+        self.ctx.pop()
+        super(TestBatchLoader, self).tearDown()
+
+    def test_load_many_preserves_order(self):
+        keys = list(reversed(self.keys)) + ['missing']
+        users = loader.load_many(User, keys)
+        assert_equal([user._id for user in users[:-1]], keys[:-1])
+        assert_is_none(users[-1])
+
+    def test_load_many_single_query(self):
+        storage = User._storage[0]
+        with mock.patch.object(storage, 'get', side_effect=AssertionError) as mock_get:
+            loader.load_many(User, self.keys)
+            # Later loads are served from the ODM cache
+            for key in self.keys:
+                User.load(key)
+        assert_false(mock_get.called)
+        state = loader.get_state()
+        assert_equal(state.queries, 1)
+        assert_equal(state.loads_avoided, 2)
+
+    def test_prime_batches_until_flush(self):
+        loader.prime(User, self.keys[:2])
+        loader.prime(User, self.keys[2:])
+        loaded = loader.flush(User)
+        assert_equal(set(loaded), set(self.keys))
+        assert_equal(loader.get_state().queries, 1)
+
+    def test_cached_records_not_fetched(self):
+        User.load(self.keys[0])
+        loader.load_many(User, self.keys)
+        assert_equal(loader.get_state().loads_avoided, 1)
+        assert_equal(loader.flush(User), {})
+
+    def test_visible_contributors(self):
+        project = ProjectFactory(creator=self.users[0])
+        for user in self.users[1:]:
+            project.add_contributor(user, visible=True, log=False)
+        project.save()
+        User._clear_caches()
+        loader.loader_before_request()
+
+        assert_equal(
+            [user._id for user in project.visible_contributors],
+            project.visible_contributor_ids,
+        )
+        assert_equal(loader.get_state().queries, 1)
@@ -18,7 +18,7 @@ from framework.mongo import set_up_storage
 
 from website import settings
 from website.util import api_url_for, rubeus
-from website.addons.base import exceptions, GuidFile
+from website.addons.base import exceptions, GuidFile, metadata_cache
 from website.project import new_private_link
 from website.project.utils import serialize_node
 from website.addons.base import AddonConfig, AddonNodeSettingsBase, views
@@ -225,6 +225,18 @@ class TestAddonLogs(OsfTestCase):
         self.node.reload()
         assert_equal(len(self.node.logs), nlogs + 1)
 
+    def test_add_log_invalidates_metadata_cache(self):
+        metadata_cache.store('github', self.node._id, '/pizza', 'master', {'name': 'pizza'})
+        metadata_cache.store('github', self.node._id, '/pasta', 'master', {'name': 'pasta'})
+        url = self.node.api_url_for('create_waterbutler_log')
+        payload = self.build_payload(metadata={'path': '/pizza'})
+        self.test_app.put_json(url, payload, headers={'Content-Type': 'application/json'})
+        assert_is_none(metadata_cache.get('github', self.node._id, '/pizza', 'master'))
+        assert_equal(
+            metadata_cache.get('github', self.node._id, '/pasta', 'master'),
+            {'name': 'pasta'},
+        )
+
     def test_add_log_missing_args(self):
         path = 'pizza'
         url = self.node.api_url_for('create_waterbutler_log')
@@ -407,6 +419,63 @@ class TestAddonFileViewHelpers(OsfFileTestCase):
         assert_equals(getattr(guid, 'name', 'foo'), 'test')
 
 
+class TestGuidFileMetadataCache(OsfFileTestCase):
+
+    def setUp(self):
+        super(TestGuidFileMetadataCache, self).setUp()
+        metadata_cache.clear()
+        self.node = ProjectFactory()
+        self.response = mock.Mock(ok=True, status_code=200)
+        self.response.json.return_value = {'data': {'name': 'bar.md'}}
+
+    def tearDown(self):
+        super(TestGuidFileMetadataCache, self).tearDown()
+        metadata_cache.clear()
+
+    @mock.patch('website.addons.base.metadata_cache.fetch')
+    def test_fetch_metadata_is_cached(self, mock_fetch):
+        mock_fetch.return_value = self.response
+        DummyGuidFile(node=self.node)._fetch_metadata(should_raise=True)
+        guid = DummyGuidFile(node=self.node)
+        guid._fetch_metadata(should_raise=True)
+        assert_equal(mock_fetch.call_count, 1)
+        assert_equal(guid._metadata_cache, {'name': 'bar.md'})
+
+    @mock.patch('website.addons.base.metadata_cache.fetch')
+    def test_revisions_cached_separately(self, mock_fetch):
+        mock_fetch.return_value = self.response
+        for revision in ('1', '2', '1'):
+            guid = DummyGuidFile(node=self.node)
+            guid.maybe_set_version(versionidentifier=revision)
+            guid._fetch_metadata()
+        assert_equal(mock_fetch.call_count, 2)
+
+    @mock.patch('website.addons.base.metadata_cache.fetch')
+    def test_error_responses_not_cached(self, mock_fetch):
+        mock_fetch.return_value = mock.Mock(ok=False, status_code=404)
+        with assert_raises(exceptions.FileDoesntExistError):
+            DummyGuidFile(node=self.node)._fetch_metadata(should_raise=True)
+        assert_is_none(metadata_cache.get('dummy', self.node._id, '/path/to/file/'))
+
+    @mock.patch('website.addons.base.metadata_cache.time.time')
+    def test_mutable_entries_expire(self, mock_time):
+        mock_time.return_value = 1000
+        metadata_cache.store('dummy', self.node._id, '/foo', None, {'name': 'foo'})
+        metadata_cache.store('dummy', self.node._id, '/foo', 'abc', {'name': 'foo'}, immutable=True)
+        mock_time.return_value = 1000 + settings.WATERBUTLER_METADATA_TTL
+        assert_is_none(metadata_cache.get('dummy', self.node._id, '/foo'))
+        assert_equal(metadata_cache.get('dummy', self.node._id, '/foo', 'abc'), {'name': 'foo'})
+
+    def test_invalidate_folder(self):
+        metadata_cache.store('dummy', self.node._id, '/foo/bar', None, {})
+        metadata_cache.store('dummy', self.node._id, '/foo/bar', '1', {}, immutable=True)
+        metadata_cache.store('dummy', self.node._id, '/foobar', None, {})
+        metadata_cache.invalidate('dummy', self.node._id, '/foo/')
+        assert_is_none(metadata_cache.get('dummy', self.node._id, '/foo/bar'))
+        assert_is_none(metadata_cache.get('dummy', self.node._id, '/foo/bar', '1'))
+        assert_equal(metadata_cache.get('dummy', self.node._id, '/foobar'), {})
+
+
 def assert_urls_equal(url1, url2):
     furl1 = furl.furl(url1)
     furl2 = furl.furl(url2)
@@ -1,17 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+
+import mock
 from nose.tools import *  # noqa
 
 from scripts import parse_citation_styles
 from framework.auth.core import Auth
+from website import settings
 from website.util import api_url_for
+from website.addons.citations import library
+from website.citations.models import CitationLibrary
 from website.citations.utils import datetime_to_csl
 from website.models import Node, User
 from flask import redirect
 
 from tests.base import OsfTestCase
-from tests.factories import ProjectFactory, UserFactory, AuthUserFactory
+from tests.factories import ProjectFactory, UserFactory, AuthUserFactory, ExternalAccountFactory
 
 
 class CitationsUtilsTestCase(OsfTestCase):
@@ -163,3 +168,113 @@ class CitationsViewsTestCase(OsfTestCase):
         response = self.app.get("/api/v1" + "/project/" + node._id + "/citation/", auto_follow=True, auth=user.auth)
         assert_true(response.json)
 
+
+
+class FakeCitationsProvider(object):
+    """Implements the sync interface of `website.addons.citations.library`."""
+
+    def __init__(self, account):
+        self.account = account
+        self.folders = [{'id': 'folder'}]
+        self.documents = {}
+        self.deleted = []
+        self.members = {'folder': []}
+        self.conversions = []
+        self.cursors = []
+
+    def _fetch_folders(self):
+        return self.folders
+
+    def _folder_key(self, folder):
+        return folder['id']
+
+    def _fetch_changes(self, cursor):
+        self.cursors.append(cursor)
+        changes = [
+            (document_id, version, {'id': document_id, 'title': title})
+            for document_id, (version, title) in sorted(self.documents.items())
+        ]
+        return str(len(self.cursors)), iter(changes), self.deleted
+
+    def _citation_for_document(self, document):
+        self.conversions.append(document['id'])
+        return document
+
+    def _fetch_folder_document_ids(self, folder_id):
+        return self.members[folder_id]
+
+
+class CitationLibraryTestCase(OsfTestCase):
+
+    def setUp(self):
+        super(CitationLibraryTestCase, self).setUp()
+        self.provider = FakeCitationsProvider(ExternalAccountFactory())
+        self.provider.documents = {
+            'a': ('1', 'Alpha'),
+            'b': ('1', 'Beta'),
+        }
+
+    def test_first_view_syncs(self):
+        citations = library.get_citations(self.provider)
+        assert_equal([each['title'] for each in citations], ['Alpha', 'Beta'])
+        citation_library = CitationLibrary.load(self.provider.account._id)
+        assert_equal(citation_library.cursor, '1')
+        assert_equal(citation_library.folders, [{'id': 'folder'}])
+
+    def test_sync_is_incremental(self):
+        library.sync_library(self.provider)
+        self.provider.documents = {'b': ('2', 'Beta 2'), 'c': ('1', 'Gamma')}
+        library.sync_library(self.provider)
+        assert_equal(self.provider.cursors, [None, '1'])
+        citations = library.get_citations(self.provider)
+        assert_equal(
+            [each['title'] for each in citations],
+            ['Alpha', 'Beta 2', 'Gamma'],
+        )
+
+    def test_unchanged_versions_not_converted_again(self):
+        library.sync_library(self.provider)
+        self.provider.documents['b'] = ('2', 'Beta 2')
+        library.sync_library(self.provider)
+        assert_equal(self.provider.conversions, ['a', 'b', 'b'])
+
+    def test_deleted_documents_removed(self):
+        library.sync_library(self.provider)
+        self.provider.documents = {}
+        self.provider.deleted = ['a']
+        library.sync_library(self.provider)
+        assert_equal(
+            [each['title'] for each in library.get_citations(self.provider)],
+            ['Beta'],
+        )
+
+    def test_folder_membership_cached(self):
+        self.provider.members['folder'] = ['b']
+        assert_equal(
+            [each['title'] for each in library.get_citations(self.provider, 'folder')],
+            ['Beta'],
+        )
+        self.provider.members['folder'] = ['a', 'b']
+        assert_equal(len(library.get_citations(self.provider, 'folder')), 1)
+        library.sync_library(self.provider)
+        assert_equal(len(library.get_citations(self.provider, 'folder')), 2)
+
+    @mock.patch('website.addons.citations.library.settings.CITATION_LIBRARY_INLINE_SYNC_LIMIT', 1)
+    @mock.patch('website.addons.citations.library.refresh_citation_library')
+    def test_first_view_sync_is_limited(self, mock_refresh):
+        citations = library.get_citations(self.provider)
+        assert_equal(len(citations), 1)
+        citation_library = CitationLibrary.load(self.provider.account._id)
+        assert_is_none(citation_library.cursor)
+        mock_refresh.assert_called_once_with(citation_library._id)
+
+    @mock.patch('website.addons.citations.library.refresh_citation_library')
+    def test_stale_library_refreshed_in_background(self, mock_refresh):
+        citation_library = library.sync_library(self.provider)
+        citation_library.date_synced = datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=settings.CITATION_LIBRARY_REFRESH_INTERVAL + 1
+        )
+        citation_library.save()
+        library.get_citations(self.provider)
+        library.get_citations(self.provider)
+        mock_refresh.assert_called_once_with(citation_library._id)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+from tests.factories import AuthUserFactory, ProjectFactory
+
+from framework.auth import Auth
+
+from website.project import co_contributors
+
+
+class TestComputeDeltas(OsfTestCase):
+
+    def test_added(self):
+        deltas = co_contributors.compute_deltas(['a'], ['a', 'b', 'c'], {'a', 'b', 'c'})
+        assert_equal(deltas['a'], {'b': 1, 'c': 1})
+        assert_equal(deltas['b'], {'a': 1, 'c': 1})
+        assert_equal(deltas['c'], {'a': 1, 'b': 1})
+
+    def test_removed(self):
+        deltas = co_contributors.compute_deltas(['a', 'b', 'c'], ['a', 'b'], {'a', 'b', 'c'})
+        assert_equal(deltas['a'], {'c': -1})
+        assert_equal(deltas['b'], {'c': -1})
+        assert_equal(deltas['c'], {'a': -1, 'b': -1})
+
+    def test_inactive_not_added_to_rows(self):
+        deltas = co_contributors.compute_deltas(['a'], ['a', 'b'], {'a'})
+        assert_equal(deltas['a'], {})
+        assert_equal(deltas['b'], {'a': 1})
+
+
+class TestCoContributorGraph(OsfTestCase):
+
+    def setUp(self):
+        super(TestCoContributorGraph, self).setUp()
+        self.user = AuthUserFactory()
+        self.contributor = AuthUserFactory()
+        self.project = ProjectFactory(creator=self.user)
+        self.project.add_contributor(self.contributor, auth=Auth(self.user))
+        self.project.save()
+
+    def test_rows_not_created_by_node_changes(self):
+        assert_is_none(co_contributors.get_counts(self.user._id))
+        record = co_contributors._nodes().find_one({'_id': self.project._id})
+        assert_equal(
+            record['contributors'],
+            sorted([self.user._id, self.contributor._id]),
+        )
+
+    def test_rows_built_on_first_read(self):
+        counts = co_contributors.get_or_build_counts(self.user)
+        assert_equal(counts, {self.contributor._id: 1})
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 1})
+
+    def test_built_rows_updated_on_save(self):
+        co_contributors.get_or_build_counts(self.user)
+        project = ProjectFactory(creator=self.user)
+        project.add_contributor(self.contributor, auth=Auth(self.user))
+        project.save()
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 2})
+        # Rows that were not built are left alone
+        assert_is_none(co_contributors.get_counts(self.contributor._id))
+
+    def test_update_node_is_idempotent(self):
+        co_contributors.get_or_build_counts(self.user)
+        contributor_ids = self.project.contributors._to_primary_keys()
+        co_contributors.update_node(self.project._id, contributor_ids)
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 1})
+
+    def test_fork_not_double_counted(self):
+        co_contributors.get_or_build_counts(self.user)
+        self.project.fork_node(Auth(self.user))
+        assert_equal(co_contributors.get_counts(self.user._id), {self.contributor._id: 1})
+
+    def test_rebuild_user(self):
+        co_contributors.get_or_build_counts(self.contributor)
+        co_contributors._graph().remove({'_id': self.user._id})
+        counts = co_contributors.rebuild_user(self.user)
+        assert_equal(counts, {self.contributor._id: 1})
+        assert_equal(co_contributors.get_counts(self.contributor._id), {self.user._id: 1})
+
+    def test_unrecorded_node_not_counted_twice(self):
+        co_contributors._nodes().remove({})
+        assert_equal(
+            co_contributors.get_or_build_counts(self.user),
+            {self.contributor._id: 1},
+        )
+        other = AuthUserFactory()
+        self.project.add_contributor(other, auth=Auth(self.user))
+        self.project.save()
+        assert_equal(
+            co_contributors.get_counts(self.user._id),
+            {self.contributor._id: 1, other._id: 1},
+        )
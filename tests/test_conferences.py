@@ -12,11 +12,14 @@ from modularodm import Q
 from modularodm.exceptions import ValidationError
 
 from framework.auth.core import Auth
+from framework.mongo import database
 
 from website import settings
 from website.models import User, Node
 from website.conferences import views
-from website.conferences.model import Conference
+from website.conferences.model import (
+    Conference, ConferenceSubmission, refresh_conference_submissions,
+)
 from website.conferences import utils, message
 from website.util import api_url_for, web_url_for
 
@@ -455,6 +458,56 @@ class TestConferenceEmailViews(OsfTestCase):
         assert_equal(res.status_code, 200)
         assert_equal(len(res.json), n_conference_nodes)
 
+    def test_conference_data_paginated(self):
+        conference = ConferenceFactory()
+        nodes = create_fake_conference_nodes(5, conference.endpoint)
+
+        url = api_url_for('conference_data', meeting=conference.endpoint)
+        res = self.app.get(url, {'page': 1, 'size': 2})
+        assert_equal(res.status_code, 200)
+        assert_equal(len(res.json), 2)
+        assert_equal([row['id'] for row in res.json], [2, 3])
+        assert_equal(
+            [row['title'] for row in res.json],
+            [nodes[2].title, nodes[3].title],
+        )
+
+    def test_conference_data_reads_live_download_count(self):
+        conference = ConferenceFactory()
+        node = ProjectFactory(is_public=True)
+        record = node.get_addon('osfstorage').root_node.append_file('poster.pdf')
+        node.add_tag(conference.endpoint, Auth(node.creator))
+        node.save()
+        url = api_url_for('conference_data', meeting=conference.endpoint)
+        assert_equal(self.app.get(url).json[0]['download'], 0)
+        # Downloads are counted without saving the node
+        database['pagecounters'].update(
+            {'_id': record.get_download_page()},
+            {'$inc': {'total': 2}},
+            upsert=True,
+        )
+        assert_equal(self.app.get(url).json[0]['download'], 2)
+
+    def test_conference_data_bad_page(self):
+        conference = ConferenceFactory()
+        url = api_url_for('conference_data', meeting=conference.endpoint)
+        res = self.app.get(url, {'page': 'foo'}, expect_errors=True)
+        assert_equal(res.status_code, 400)
+
+    def test_conference_view_uses_submission_count(self):
+        conference = ConferenceFactory()
+        create_fake_conference_nodes(
+            settings.CONFERNCE_MIN_COUNT,
+            conference.endpoint,
+        )
+        other = ConferenceFactory()
+        create_fake_conference_nodes(1, other.endpoint)
+
+        res = views.conference_view()
+        names = [meeting['name'] for meeting in res['meetings']]
+        assert_in(conference.name, names)
+        assert_not_in(other.name, names)
+
     def test_conference_results(self):
         conference = ConferenceFactory()
 
@@ -472,6 +525,61 @@ class TestConferenceModel(OsfTestCase):
             ConferenceFactory(endpoint='spsp2014', name=None).save()
 
 
+class TestConferenceSubmissions(OsfTestCase):
+
+    def setUp(self):
+        super(TestConferenceSubmissions, self).setUp()
+        self.conference = ConferenceFactory()
+        self.node = create_fake_conference_nodes(1, self.conference.endpoint.upper())[0]
+        self.conference.reload()
+
+    def test_tag_keys_lowercased(self):
+        assert_equal(self.node.tag_keys, [self.conference.endpoint])
+
+    def test_submission_added(self):
+        submissions = ConferenceSubmission.find(Q('node', 'eq', self.node._id))
+        assert_equal(submissions.count(), 1)
+        assert_equal(submissions[0].title, self.node.title)
+        assert_equal(self.conference.num_submissions, 1)
+
+    def test_submission_updated_on_rename(self):
+        self.node.set_title('New title', auth=Auth(self.node.creator))
+        self.node.save()
+        submission = ConferenceSubmission.find_one(Q('node', 'eq', self.node._id))
+        assert_equal(submission.title, 'New title')
+
+    def test_submission_removed_when_private(self):
+        self.node.set_privacy('private', auth=Auth(self.node.creator))
+        self.conference.reload()
+        assert_equal(ConferenceSubmission.find(Q('node', 'eq', self.node._id)).count(), 0)
+        assert_equal(self.conference.num_submissions, 0)
+
+    def test_submission_removed_when_untagged(self):
+        self.node.remove_tag(self.conference.endpoint.upper(), auth=Auth(self.node.creator))
+        self.conference.reload()
+        assert_equal(ConferenceSubmission.find(Q('node', 'eq', self.node._id)).count(), 0)
+        assert_equal(self.conference.num_submissions, 0)
+
+    def test_capitalized_endpoint_matches_tag(self):
+        conference = ConferenceFactory(endpoint='CapsConf2015')
+        node = create_fake_conference_nodes(1, 'capsconf2015')[0]
+        conference.reload()
+        submissions = ConferenceSubmission.find(Q('conference', 'eq', conference._id))
+        assert_equal([each.node._id for each in submissions], [node._id])
+        assert_equal(conference.num_submissions, 1)
+        # Full refresh agrees with the incremental sync
+        refresh_conference_submissions(conference)
+        conference.reload()
+        submissions = ConferenceSubmission.find(Q('conference', 'eq', conference._id))
+        assert_equal([each.node._id for each in submissions], [node._id])
+        assert_equal(conference.num_submissions, 1)
+
+    def test_submission_count_incremented_in_database(self):
+        create_fake_conference_nodes(2, self.conference.endpoint)
+        self.conference.reload()
+        assert_equal(self.conference.num_submissions, 3)
+
+
 class TestConferenceIntegration(ContextTestCase):
 
     @mock.patch('website.conferences.views.send_mail')
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+import mock
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase, capture_signals
+from tests.factories import (
+    AuthUserFactory, ProjectFactory, NodeFactory, UnregUserFactory,
+)
+
+from framework.auth import Auth
+from framework.auth import signals as auth_signals
+
+from website.models import NodeLog
+from website.project import contributor_changes
+
+
+class TestComputeDelta(OsfTestCase):
+
+    def setUp(self):
+        super(TestComputeDelta, self).setUp()
+        self.user = AuthUserFactory()
+        self.project = ProjectFactory(creator=self.user)
+        self.contributor = AuthUserFactory()
+        self.project.add_contributor(self.contributor, permissions=['read'], auth=Auth(self.user))
+        self.project.save()
+
+    def test_existing_contributors_skipped(self):
+        new = AuthUserFactory()
+        delta = contributor_changes.compute_delta(
+            self.project,
+            add=[
+                {'user': self.contributor, 'permissions': ['read'], 'visible': True},
+                {'user': new, 'permissions': ['read'], 'visible': True},
+            ],
+        )
+        assert_equal([contrib['user'] for contrib in delta.added], [new])
+
+    def test_unchanged_permissions_and_visibility_skipped(self):
+        delta = contributor_changes.compute_delta(
+            self.project,
+            permissions={
+                self.user._id: ['read', 'write', 'admin'],
+                self.contributor._id: ['read', 'write'],
+            },
+            visible={self.user._id: True, self.contributor._id: False},
+        )
+        assert_equal(delta.permissions, {self.contributor._id: ['read', 'write']})
+        assert_equal(delta.visible, {self.contributor._id: False})
+        assert_false(delta.revokes_write)
+
+    def test_no_change(self):
+        delta = contributor_changes.compute_delta(self.project, remove=[AuthUserFactory()])
+        assert_false(delta)
+
+    def test_must_keep_registered_admin(self):
+        with assert_raises(ValueError):
+            contributor_changes.compute_delta(self.project, remove=[self.user])
+        with assert_raises(ValueError):
+            contributor_changes.compute_delta(
+                self.project,
+                permissions={self.user._id: ['read']},
+            )
+
+
+class TestApplyDeltas(OsfTestCase):
+
+    def setUp(self):
+        super(TestApplyDeltas, self).setUp()
+        self.user = AuthUserFactory()
+        self.auth = Auth(self.user)
+        self.project = ProjectFactory(creator=self.user)
+        self.components = [
+            NodeFactory(creator=self.user, parent=self.project)
+            for _ in range(2)
+        ]
+        self.nodes = [self.project] + self.components
+        self.new = [AuthUserFactory() for _ in range(3)]
+        self.add = [
+            {'user': user, 'permissions': ['read', 'write'], 'visible': True}
+            for user in self.new
+        ]
+
+    def test_add_to_many_nodes(self):
+        n_logs = [len(node.logs) for node in self.nodes]
+        deltas = contributor_changes.compute_deltas(self.nodes, add=self.add)
+        contributor_changes.apply_deltas(deltas, self.auth)
+        for node, n_log in zip(self.nodes, n_logs):
+            node.reload()
+            for user in self.new:
+                assert_true(node.is_contributor(user))
+                assert_equal(node.get_permissions(user), ['read', 'write'])
+                assert_in(user._id, node.visible_contributor_ids)
+            assert_equal(len(node.logs), n_log + 1)
+            assert_equal(node.logs[-1].action, NodeLog.CONTRIB_ADDED)
+            assert_equal(
+                node.logs[-1].params['contributors'],
+                [user._id for user in self.new],
+            )
+        assert_equal(self.user.recently_added[0], self.new[-1])
+
+    def test_remove_and_update(self):
+        deltas = contributor_changes.compute_deltas(self.nodes, add=self.add)
+        contributor_changes.apply_deltas(deltas, self.auth)
+        deltas = contributor_changes.compute_deltas(
+            self.nodes,
+            remove=[self.new[0]],
+            permissions={self.new[1]._id: ['read']},
+            visible={self.new[2]._id: False},
+        )
+        contributor_changes.apply_deltas(deltas, self.auth)
+        for node in self.nodes:
+            node.reload()
+            assert_false(node.is_contributor(self.new[0]))
+            assert_equal(node.get_permissions(self.new[1]), ['read'])
+            assert_not_in(self.new[2]._id, node.visible_contributor_ids)
+            actions = [log.action for log in node.logs[-3:]]
+            assert_equal(actions, [
+                NodeLog.CONTRIB_REMOVED,
+                NodeLog.PERMISSIONS_UPDATED,
+                NodeLog.MADE_CONTRIBUTOR_INVISIBLE,
+            ])
+
+    def test_unregistered_records_removed(self):
+        unreg = UnregUserFactory()
+        unreg.add_unclaimed_record(
+            node=self.project, referrer=self.user, given_name=unreg.fullname,
+        )
+        unreg.save()
+        self.project.add_contributor(unreg, auth=self.auth, save=True)
+        deltas = contributor_changes.compute_deltas([self.project], remove=[unreg])
+        contributor_changes.apply_deltas(deltas, self.auth)
+        unreg.reload()
+        assert_not_in(self.project._id, unreg.unclaimed_records)
+
+    def test_hooks_deferred_to_task(self):
+        deltas = contributor_changes.compute_deltas(self.nodes, add=self.add)
+        contributor_changes.apply_deltas(deltas, self.auth)
+        deltas = contributor_changes.compute_deltas(self.nodes, remove=[self.new[0]])
+        with mock.patch('website.project.tasks.run_contributor_hooks') as mock_run_hooks:
+            with capture_signals() as mock_signals:
+                contributor_changes.apply_deltas(deltas, self.auth)
+        assert_equal(mock_signals.signals_sent(), set())
+        assert_equal(mock_run_hooks.call_count, 1)
+        changes, user_id = mock_run_hooks.call_args[0]
+        assert_equal(user_id, self.user._id)
+        assert_equal([change['node'] for change in changes], [node._id for node in self.nodes])
+        assert_equal(changes[0]['removed'], [self.new[0]._id])
+
+    def test_run_hooks(self):
+        deltas = contributor_changes.compute_deltas(self.nodes, add=self.add)
+        contributor_changes.apply_deltas(deltas, self.auth)
+        deltas = contributor_changes.compute_deltas([self.project], remove=[self.new[0]])
+        with capture_signals() as mock_signals:
+            changes = contributor_changes.apply_deltas(deltas, self.auth)
+        assert_in(auth_signals.contributor_removed, mock_signals.signals_sent())
+        assert_true(changes[0]['revoked'])
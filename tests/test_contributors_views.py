@@ -149,6 +149,35 @@ class TestContributorViews(OsfTestCase):
         assert_equal(contributor_2._id, res_contribs[1]['id'])
         assert_equal(res_contribs[1]['n_projects_in_common'], 1)
 
+    def test_most_in_common_contributors_after_removal(self):
+        contributor = AuthUserFactory()
+        self.project.add_contributor(contributor, auth=self.auth)
+        self.project.save()
+        project_2 = ProjectFactory(creator=self.user)
+        url = project_2.api_url_for('get_most_in_common_contributors')
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(len(res.json['contributors']), 1)
+
+        self.project.remove_contributor(contributor, auth=self.auth)
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(len(res.json['contributors']), 0)
+
+    def test_most_in_common_contributors_excludes_disabled(self):
+        contributor = AuthUserFactory()
+        self.project.add_contributor(contributor, auth=self.auth)
+        self.project.save()
+        contributor.is_disabled = True
+        contributor.save()
+        project_2 = ProjectFactory(creator=self.user)
+        url = project_2.api_url_for('get_most_in_common_contributors')
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(len(res.json['contributors']), 0)
+
+        contributor.is_disabled = False
+        contributor.save()
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(len(res.json['contributors']), 1)
+
     def test_get_recently_added_contributors(self):
         project = ProjectFactory(creator=self.user)
         project.add_contributor(AuthUserFactory(), auth=self.auth)
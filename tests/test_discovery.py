@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import mock
+import requests
+from nose.tools import *  # noqa (PEP8 asserts)
+
+from framework.auth.core import Auth
+
+from website.discovery import views
+from website.discovery.model import ActivitySnapshot
+from website.discovery.utils import update_activity_snapshot, get_activity_snapshot
+
+from tests.base import OsfTestCase
+from tests.factories import ProjectFactory, RegistrationFactory
+
+
+class TestActivitySnapshot(OsfTestCase):
+
+    def setUp(self):
+        super(TestActivitySnapshot, self).setUp()
+        ActivitySnapshot.remove()
+        self.project = ProjectFactory(is_public=True)
+        self.registration = RegistrationFactory(project=self.project, is_public=True)
+
+    def test_snapshot_built_on_demand(self):
+        assert_is_none(ActivitySnapshot.load(ActivitySnapshot.ACTIVITY))
+        snapshot = get_activity_snapshot()
+        assert_in(self.project._id, snapshot.recent_public_projects)
+        assert_is_not_none(snapshot.date_generated)
+        assert_equal(snapshot, ActivitySnapshot.load(ActivitySnapshot.ACTIVITY))
+
+    def test_activity_served_from_snapshot(self):
+        update_activity_snapshot()
+        new_project = ProjectFactory(is_public=True)
+        res = views.activity()
+        assert_in(self.project, res['recent_public_projects'])
+        assert_not_in(new_project, res['recent_public_projects'])
+
+    def test_activity_drops_nodes_made_private(self):
+        update_activity_snapshot()
+        self.project.set_privacy('private', auth=Auth(self.project.creator))
+        res = views.activity()
+        assert_not_in(self.project, res['recent_public_projects'])
+
+    @mock.patch('website.discovery.utils.settings.PIWIK_HOST', 'http://piwik.test/')
+    @mock.patch('website.discovery.utils.fetch_popular_nodes')
+    def test_popular_nodes_from_piwik(self, mock_fetch):
+        mock_fetch.return_value = (
+            [self.project._id],
+            [],
+            {self.project._id: {'hits': 5, 'visits': 2}},
+        )
+        snapshot = update_activity_snapshot()
+        assert_equal(snapshot.popular_public_projects, [self.project._id])
+        assert_equal(snapshot.hits[self.project._id]['hits'], 5)
+
+    @mock.patch('website.discovery.utils.settings.PIWIK_HOST', 'http://piwik.test/')
+    @mock.patch('website.discovery.utils.fetch_popular_nodes')
+    def test_piwik_timeout_keeps_previous_popular_nodes(self, mock_fetch):
+        mock_fetch.return_value = ([self.project._id], [], {})
+        update_activity_snapshot()
+        mock_fetch.side_effect = requests.Timeout
+        snapshot = update_activity_snapshot()
+        assert_equal(snapshot.popular_public_projects, [self.project._id])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import mock
+from nose.tools import *  # noqa
+from modularodm import Q
+
+from tests.base import OsfTestCase
+from tests.factories import AuthUserFactory, ProjectFactory, NodeFactory
+
+from framework.auth import Auth
+from framework.exceptions import PermissionsError
+
+from website.models import Node
+from website.project import forking
+from website.project.views.node import _view_project
+
+
+class TestForkJob(OsfTestCase):
+
+    def setUp(self):
+        super(TestForkJob, self).setUp()
+        self.user = AuthUserFactory()
+        self.auth = Auth(self.user)
+        self.project = ProjectFactory(creator=self.user)
+        self.component = NodeFactory(creator=self.user, parent=self.project)
+        self.deleted = NodeFactory(creator=self.user, parent=self.project)
+        self.deleted.remove_node(self.auth)
+
+    def test_start_fork(self):
+        job = forking.start_fork(self.project, self.auth)
+        assert_equal(job.status, forking.ForkJob.COMPLETE)
+        assert_equal(job.nodes, 3)
+        assert_equal(job.addons_done, job.addons_total)
+        fork = Node.load(job.fork)
+        assert_false(fork.is_deleted)
+        assert_equal(fork.title, 'Fork of ' + self.project.title)
+        assert_equal(fork.forked_from, self.project)
+
+    def test_deleted_nodes_stay_deleted(self):
+        job = forking.start_fork(self.project, self.auth)
+        fork = Node.load(job.fork)
+        forked = {node.forked_from._id: node for node in fork.nodes}
+        assert_false(forked[self.component._id].is_deleted)
+        assert_true(forked[self.deleted._id].is_deleted)
+
+    def test_failed_fork_is_hidden(self):
+        with mock.patch.object(Node, '_fork_addons', side_effect=ValueError):
+            job = forking.start_fork(self.project, self.auth)
+        assert_equal(job.status, forking.ForkJob.FAILED)
+        assert_true(Node.load(job.fork).is_deleted)
+        assert_equal(self.project.forks, [])
+
+    def test_reveal_invalidates_cached_original(self):
+        def view_while_forking(*args, **kwargs):
+            _view_project(self.project, self.auth)
+            return []
+        with mock.patch.object(Node, '_fork_addons', side_effect=view_while_forking):
+            forking.start_fork(self.project, self.auth)
+        result = _view_project(self.project, self.auth)
+        assert_equal(result['node']['fork_count'], 1)
+
+    def test_start_fork_private_non_contributor(self):
+        with assert_raises(PermissionsError):
+            forking.start_fork(self.project, Auth(AuthUserFactory()))
+        jobs = forking.ForkJob.find(Q('node', 'eq', self.project._id))
+        assert_equal(jobs.count(), 0)
@@ -15,4 +15,13 @@ def test_plain_mail():
 def test_html_mail():
     mail = mails.Mail('test', subject='A test email')
     rendered = mail.html(name='World')
-    assert_equal(rendered.strip(), 'Hello <p>World</p>')
\ No newline at end of file
+    assert_equal(rendered.strip(), 'Hello <p>World</p>')
+
+
+def test_precompile_templates_reports_each_template():
+    report = mails.precompile_templates()
+    names = [row[0] for row in report]
+    assert_in('test.txt.mako', names)
+    assert_in('test.html.mako', names)
+    for _, elapsed, error in report:
+        assert_true(elapsed >= 0)
@@ -2014,7 +2014,6 @@ class TestProject(OsfTestCase):
                              'permission': 'write',
                              'visible': True}],
                 auth=self.consolidate_auth,
-                save=True
             )
 
     def test_manage_contributors_logs_when_users_reorder(self):
@@ -2035,7 +2034,6 @@ class TestProject(OsfTestCase):
                 },
             ],
             auth=self.consolidate_auth,
-            save=True
         )
         latest_log = self.project.logs[-1]
         assert_equal(latest_log.action, NodeLog.CONTRIB_REORDERED)
@@ -2043,6 +2041,44 @@ class TestProject(OsfTestCase):
         assert_in(self.user._id, latest_log.params['contributors'])
         assert_in(user2._id, latest_log.params['contributors'])
 
+    def test_manage_contributors_removes_and_reorders_with_one_log_each(self):
+        user2, user3 = UserFactory(), UserFactory()
+        self.project.add_contributor(contributor=user2, auth=self.consolidate_auth)
+        self.project.add_contributor(contributor=user3, auth=self.consolidate_auth)
+        self.project.save()
+        nlogs = len(self.project.logs)
+        self.project.manage_contributors(
+            user_dicts=[
+                {'id': user3._id, 'permission': 'admin', 'visible': False},
+                {'id': self.user._id, 'permission': 'admin', 'visible': True},
+            ],
+            auth=self.consolidate_auth,
+        )
+        self.project.reload()
+        assert_equal(self.project.contributors, [user3, self.user])
+        assert_true(self.project.has_permission(user3, 'admin'))
+        assert_not_in(user3._id, self.project.visible_contributor_ids)
+        actions = [log.action for log in self.project.logs[nlogs:]]
+        assert_equal(
+            actions,
+            [
+                NodeLog.CONTRIB_REORDERED,
+                NodeLog.CONTRIB_REMOVED,
+                NodeLog.PERMISSIONS_UPDATED,
+                NodeLog.MADE_CONTRIBUTOR_INVISIBLE,
+            ],
+        )
+
+    def test_remove_contributors_cannot_remove_last_admin(self):
+        user2 = UserFactory()
+        self.project.add_contributor(contributor=user2, auth=self.consolidate_auth)
+        self.project.save()
+        assert_false(
+            self.project.remove_contributors([self.user], auth=self.consolidate_auth)
+        )
+        self.project.reload()
+        assert_in(self.user, self.project.contributors)
+
     def test_add_private_link(self):
         link = PrivateLinkFactory()
         link.nodes.append(self.project)
@@ -2084,13 +2120,13 @@ class TestProject(OsfTestCase):
         ]
         with assert_raises(ValueError):
             self.project.manage_contributors(
-                users, auth=self.consolidate_auth, save=True
+                users, auth=self.consolidate_auth
             )
 
     def test_manage_contributors_no_contributors(self):
         with assert_raises(ValueError):
             self.project.manage_contributors(
-                [], auth=self.consolidate_auth, save=True,
+                [], auth=self.consolidate_auth,
             )
 
     def test_manage_contributors_no_admins(self):
@@ -2106,7 +2142,7 @@ class TestProject(OsfTestCase):
         ]
         with assert_raises(ValueError):
             self.project.manage_contributors(
-                users, auth=self.consolidate_auth, save=True,
+                users, auth=self.consolidate_auth,
             )
 
     def test_manage_contributors_no_registered_admins(self):
@@ -2122,7 +2158,7 @@ class TestProject(OsfTestCase):
         ]
         with assert_raises(ValueError):
             self.project.manage_contributors(
-                users, auth=self.consolidate_auth, save=True,
+                users, auth=self.consolidate_auth,
             )
 
     def test_set_title_works_with_valid_title(self):
@@ -2136,6 +2172,19 @@ class TestProject(OsfTestCase):
         assert_equal(latest_log.action, 'edit_title')
         assert_equal(latest_log.params['title_original'], 'That Was Then')
 
+    def test_title_tokens_updated_on_save(self):
+        proj = ProjectFactory(title=u'Über Data', creator=self.user)
+        assert_equal(proj.title_tokens, ['d', 'da', 'dat', 'data', 'u', 'ub', 'ube', 'uber'])
+        proj.set_title('Now', auth=self.consolidate_auth)
+        proj.save()
+        assert_equal(proj.title_tokens, ['n', 'no', 'now'])
+
+    def test_title_tokens_keep_non_latin_words(self):
+        proj = ProjectFactory(title=u'心理学 Исследование', creator=self.user)
+        assert_in(u'心理学', proj.title_tokens)
+        assert_in(u'исс', proj.title_tokens)
+        assert_in(u'исследование', proj.title_tokens)
+
     def test_set_title_fails_if_empty_or_whitespace(self):
         proj = ProjectFactory(title='That Was Then', creator=self.user)
         with assert_raises(ValidationValueError):
@@ -2501,10 +2550,52 @@ class TestProject(OsfTestCase):
         )
 
     def test_date_modified(self):
-        self.project.logs.append(NodeLogFactory())
+        self.project.add_log(
+            NodeLog.EDITED_TITLE,
+            params={'project': self.project._id},
+            auth=Auth(self.project.creator),
+            log_date=datetime.datetime.utcnow() + datetime.timedelta(minutes=1),
+        )
         assert_equal(self.project.date_modified, self.project.logs[-1].date)
         assert_not_equal(self.project.date_modified, self.project.date_created)
 
+    def test_log_summary(self):
+        contrib = UserFactory()
+        self.project.add_contributor(contrib, auth=Auth(self.project.creator))
+        self.project.add_log(
+            NodeLog.EDITED_TITLE,
+            params={'project': self.project._id},
+            auth=Auth(contrib),
+        )
+        self.project.save()
+        self.project.reload()
+        assert_equal(self.project.total_log_count, len(self.project.logs))
+        assert_equal(self.project.last_modified_by, contrib)
+        assert_equal(self.project.get_user_log_count(contrib), 1)
+        assert_equal(
+            self.project.get_user_log_count(self.project.creator),
+            len(self.project.logs) - 1,
+        )
+        assert_equal(self.project.get_user_log_count(None), 0)
+
+    def test_log_summary_computed_if_missing(self):
+        expected = (
+            len(self.project.logs),
+            self.project.logs[-1].date,
+            self.project.creator._id,
+        )
+        self.project.log_count = None
+        self.project.last_log_date = None
+        self.project.last_log_user = None
+        assert_equal(
+            (
+                self.project.total_log_count,
+                self.project.date_modified,
+                self.project.last_modified_by_id,
+            ),
+            expected,
+        )
+
     def test_replace_contributor(self):
         contrib = UserFactory()
         self.project.add_contributor(contrib, auth=Auth(self.project.creator))
@@ -3283,6 +3374,23 @@ class TestPointer(OsfTestCase):
         parent.save()
         assert_equal(get_pointer_parent(parent.nodes[0]), parent)
 
+    def test_folder_pointing_at(self):
+        folder = FolderFactory()
+        pointed = ProjectFactory()
+        pointer = folder.add_pointer(pointed, Auth(folder.creator))
+        assert_equal(folder.pointer_targets, {pointed._id: pointer._id})
+        assert_equal(folder.pointing_at(pointed._id), pointer._id)
+        folder.rm_pointer(pointer, Auth(folder.creator))
+        assert_equal(folder.pointer_targets, {})
+        assert_is_none(folder.pointing_at(pointed._id))
+
+    def test_project_pointing_at(self):
+        parent = ProjectFactory()
+        pointed = ProjectFactory()
+        pointer = parent.add_pointer(pointed, Auth(parent.creator))
+        assert_equal(parent.pointing_at(pointed._id), pointer._id)
+        assert_equal(parent.pointer_targets, {})
+
     def test_clone(self):
         cloned = self.pointer._clone()
         self._assert_clone(self.pointer, cloned)
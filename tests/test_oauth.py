@@ -2,8 +2,10 @@ import httplib as http
 import logging
 import json
 import time
+import datetime
 import urlparse
 
+import mock
 import httpretty
 from nose.tools import *  # noqa
 
@@ -510,3 +512,49 @@ class TestExternalProviderOAuth2(OsfTestCase):
             ExternalAccount.find().count(),
             1
         )
+
+    def _refreshable_account(self, expires_at):
+        account = ExternalAccountFactory(
+            provider='mock2',
+            oauth_key='old_access_token',
+            refresh_token='old_refresh_token',
+            expires_at=expires_at,
+        )
+        self.provider.account = account
+        return account
+
+    @httpretty.activate
+    @mock.patch.object(MockOAuth2Provider, 'auto_refresh_url', 'https://mock2.com/callback')
+    def test_refresh_oauth_key_expired(self):
+        _prepare_mock_oauth2_handshake_response()
+        account = self._refreshable_account(
+            datetime.datetime.now() - datetime.timedelta(minutes=1)
+        )
+
+        assert_true(self.provider.refresh_oauth_key())
+
+        account.reload()
+        assert_equal(account.oauth_key, 'mock_access_token')
+        assert_equal(account.refresh_token, 'mock_refresh_token')
+        assert_greater(account.expires_at, datetime.datetime.now())
+
+    @httpretty.activate
+    @mock.patch.object(MockOAuth2Provider, 'auto_refresh_url', 'https://mock2.com/callback')
+    def test_refresh_oauth_key_not_expired(self):
+        # Tokens close to expiry are left to scripts/refresh_oauth_tokens.py
+        _prepare_mock_oauth2_handshake_response()
+        account = self._refreshable_account(
+            datetime.datetime.now() + datetime.timedelta(minutes=1)
+        )
+
+        assert_false(self.provider.refresh_oauth_key())
+        assert_equal(account.oauth_key, 'old_access_token')
+
+        assert_true(self.provider.refresh_oauth_key(force=True))
+        assert_equal(account.oauth_key, 'mock_access_token')
+
+    def test_refresh_oauth_key_unsupported(self):
+        self._refreshable_account(
+            datetime.datetime.now() - datetime.timedelta(minutes=1)
+        )
+        assert_false(self.provider.refresh_oauth_key(force=True))
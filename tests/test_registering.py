@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import httplib as http
+
+import mock
+from nose.tools import *  # noqa
+from modularodm import Q
+
+from tests.base import OsfTestCase
+from tests.factories import AuthUserFactory, ProjectFactory, NodeFactory
+
+from framework.auth import Auth
+from framework.exceptions import PermissionsError
+
+from website.models import Node
+from website.project import registering
+from website.project.model import ensure_schemas
+
+
+class TestRegistrationJob(OsfTestCase):
+
+    def setUp(self):
+        super(TestRegistrationJob, self).setUp()
+        self.user = AuthUserFactory()
+        self.auth = Auth(self.user)
+        self.project = ProjectFactory(creator=self.user)
+        self.component = NodeFactory(creator=self.user, parent=self.project)
+        self.deleted = NodeFactory(creator=self.user, parent=self.project)
+        self.deleted.remove_node(self.auth)
+        self.pointed = ProjectFactory(creator=self.user)
+        self.project.add_pointer(self.pointed, auth=self.auth)
+
+    def start(self):
+        return registering.start_registration(
+            self.project, None, self.auth, 'Template1', 'Some words',
+        )
+
+    def get_registrations(self):
+        return Node.find(Q('registered_from', 'eq', self.project._id))
+
+    def test_snapshot(self):
+        job = registering.create_job(self.project, None, self.auth, 'Template1', '')
+        assert_equal(job.order, [self.component._id, self.project._id])
+        assert_equal(
+            job.children[self.project._id],
+            [self.component._id, self.project.nodes[-1]._id],
+        )
+        assert_equal(job.pointers, [self.project.nodes[-1]._id])
+
+    def test_snapshot_permissions(self):
+        with assert_raises(PermissionsError):
+            registering.create_job(
+                self.project, None, Auth(AuthUserFactory()), 'Template1', '',
+            )
+
+    def test_register(self):
+        job = self.start()
+        assert_equal(job.status, registering.RegistrationJob.COMPLETE)
+        registration = Node.load(job.registration)
+        assert_false(registration.is_deleted)
+        assert_equal(registration.registered_meta['Template1'], 'Some words')
+        assert_equal(len(registration.nodes), 2)
+        component = registration.nodes[0]
+        assert_true(component.is_registration_of(self.component))
+        assert_false(component.is_deleted)
+        assert_false(registration.nodes[1].primary)
+        assert_equal(registration.nodes[1].node, self.pointed)
+        assert_equal(self.project.logs[-1].action, 'project_registered')
+
+    @mock.patch('website.search.search.update_nodes')
+    def test_single_index_update(self, mock_update_nodes):
+        job = self.start()
+        assert_equal(mock_update_nodes.call_count, 1)
+        indexed = mock_update_nodes.call_args[0][0]
+        assert_equal(
+            {node._id for node in indexed},
+            set(job.registered.values()),
+        )
+
+    @mock.patch('website.project.registering.view_cache')
+    def test_finalize_invalidates_cached_originals(self, mock_view_cache):
+        job = self.start()
+        for node_id, registration_id in job.registered.items():
+            mock_view_cache.invalidate.assert_any_call(node_id, registration_id)
+
+    def test_failed_stage_is_hidden(self):
+        failing = mock.Mock(side_effect=ValueError)
+        with mock.patch.dict(registering.STAGE_FUNCTIONS, {'archive': failing}):
+            job = self.start()
+        assert_equal(job.status, registering.RegistrationJob.FAILED)
+        assert_equal(job.stage, 'archive')
+        assert_true(Node.load(job.registration).is_deleted)
+        assert_equal(self.project.registrations, [])
+
+    def test_failed_registration_not_listed(self):
+        failing = mock.Mock(side_effect=ValueError)
+        with mock.patch.dict(registering.STAGE_FUNCTIONS, {'archive': failing}):
+            self.start()
+        url = self.project.api_url_for('get_registrations')
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(res.json['nodes'], [])
+        job = self.start()
+        res = self.app.get(url, auth=self.user.auth)
+        assert_equal(
+            [node['id'] for node in res.json['nodes']],
+            [job.registration],
+        )
+
+    def test_retry_does_not_duplicate(self):
+        failing = mock.Mock(side_effect=ValueError)
+        with mock.patch.dict(registering.STAGE_FUNCTIONS, {'archive': failing}):
+            job = self.start()
+        registering.retry(job)
+        assert_equal(job.status, registering.RegistrationJob.COMPLETE)
+        assert_equal(self.get_registrations().count(), 1)
+        assert_false(Node.load(job.registration).is_deleted)
+        logs = [log for log in self.project.logs if log.action == 'project_registered']
+        assert_equal(len(logs), 1)
+
+
+class TestRegistrationViews(OsfTestCase):
+
+    def setUp(self):
+        super(TestRegistrationViews, self).setUp()
+        ensure_schemas()
+        self.user = AuthUserFactory()
+        self.project = ProjectFactory(creator=self.user)
+        self.url = self.project.api_url_for(
+            'node_register_template_page_post',
+            template='Open-Ended_Registration',
+        )
+
+    def test_register(self):
+        res = self.app.post_json(self.url, {}, auth=self.user.auth)
+        assert_equal(res.status_code, http.ACCEPTED)
+        res = self.app.get(res.json['statusUrl'], auth=self.user.auth)
+        assert_equal(res.json['status'], 'complete')
+        registration = Node.find_one(Q('registered_from', 'eq', self.project._id))
+        assert_equal(res.json['url'], registration.url)
+
+    def test_status_other_user(self):
+        res = self.app.post_json(self.url, {}, auth=self.user.auth)
+        res = self.app.get(
+            res.json['statusUrl'],
+            auth=AuthUserFactory().auth,
+            expect_errors=True,
+        )
+        assert_equal(res.status_code, http.FORBIDDEN)
+
+    def test_retry_complete_job(self):
+        res = self.app.post_json(self.url, {}, auth=self.user.auth)
+        job_id = res.json['statusUrl'].rstrip('/').split('/')[-1]
+        url = self.project.api_url_for('node_registration_retry', job_id=job_id)
+        res = self.app.post_json(url, {}, auth=self.user.auth, expect_errors=True)
+        assert_equal(res.status_code, http.BAD_REQUEST)
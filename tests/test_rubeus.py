@@ -2,10 +2,13 @@
 # encoding: utf-8
 
 import os
+import time
+import threading
 from types import NoneType
 from xmlrpclib import DateTime
 
 import mock
+import flask
 from nose.tools import *
 from webtest_plus import TestApp
 
@@ -13,7 +16,8 @@ from tests.base import OsfTestCase
 from tests.factories import (UserFactory, ProjectFactory, NodeFactory,
     AuthFactory, PointerFactory, DashboardFactory, FolderFactory, RegistrationFactory)
 from framework.auth import Auth
-from website.util import rubeus, api_url_for
+from website.util import rubeus, api_url_for, metrics
+from website.project import smart_folders
 import website.app
 from website.util.rubeus import sort_by_name
 from website.settings import ALL_MY_REGISTRATIONS_ID, ALL_MY_PROJECTS_ID, \
@@ -314,6 +318,15 @@ class TestSerializingNodeWithAddon(OsfTestCase):
             },
         )
 
+    def test_serialize_node_includes_component_addons(self):
+        node = NodeFactory(parent=self.project, creator=self.auth.user)
+        node.get_addons = mock.Mock(return_value=[mock_addon])
+        self.project.nodes[0].get_addons = node.get_addons
+        ret = self.serializer._serialize_node(self.project)
+        component = ret['children'][-1]
+        assert_equal(ret['children'][0], serialized)
+        assert_equal(component['children'], [serialized])
+
     def test_collect_js_recursive(self):
         self.project.get_addons.return_value[0].config.include_js = {'files': ['foo.js']}
         self.project.get_addons.return_value[0].config.short_name = 'dropbox'
@@ -481,6 +494,162 @@ class TestSmartFolderViews(OsfTestCase):
         res = self.app.get(url + ALL_MY_REGISTRATIONS_ID)
         assert_equal(len(res.json[u'data']), init_len + 1)
 
+    @mock.patch('website.project.decorators.Auth.from_kwargs')
+    def test_smart_folder_rows_are_summaries(self, mock_from_kwargs):
+        mock_from_kwargs.return_value = Auth(user=self.user)
+        project = ProjectFactory(creator=self.user)
+        NodeFactory(creator=self.user, parent=project)
+
+        url = api_url_for('get_dashboard', nid=ALL_MY_PROJECTS_ID)
+        res = self.app.get(url)
+        assert_equal(len(res.json['data']), 1)
+        row = res.json['data'][0]
+        assert_equal(row['node_id'], project._id)
+        assert_true(row['isSummary'])
+        assert_equal(row['children'], [])
+        assert_equal(row['childrenCount'], 1)
+        assert_is_none(res.json['next_cursor'])
+
+    @mock.patch('website.project.decorators.Auth.from_kwargs')
+    def test_smart_folder_cursor_pagination(self, mock_from_kwargs):
+        mock_from_kwargs.return_value = Auth(user=self.user)
+        titles = ['a', 'b', 'b', 'c', 'd']
+        for title in titles:
+            ProjectFactory(creator=self.user, title=title)
+
+        url = api_url_for('get_dashboard', nid=ALL_MY_PROJECTS_ID)
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            res = self.app.get(url, params)
+            assert_true(len(res.json['data']) <= 2)
+            seen.extend(res.json['data'])
+            cursor = res.json['next_cursor']
+            if cursor is None:
+                break
+        assert_equal([row['name'] for row in seen], sorted(titles, reverse=True))
+        assert_equal(len({row['node_id'] for row in seen}), len(titles))
+
+    @mock.patch('website.project.decorators.Auth.from_kwargs')
+    def test_smart_folder_invalid_cursor(self, mock_from_kwargs):
+        mock_from_kwargs.return_value = Auth(user=self.user)
+        url = api_url_for('get_dashboard', nid=ALL_MY_PROJECTS_ID)
+        res = self.app.get(url, {'cursor': 'nope', 'limit': 2}, expect_errors=True)
+        assert_equal(res.status_code, 400)
+
+
+class TestSmartFolderCounts(OsfTestCase):
+
+    def setUp(self):
+        super(TestSmartFolderCounts, self).setUp()
+        self.dash = DashboardFactory()
+        self.user = self.dash.creator
+        self.auth = AuthFactory(user=self.user)
+
+    def get_counts(self):
+        dash_hgrid = rubeus.to_project_hgrid(self.dash, self.auth)
+        return {
+            node_hgrid['node_id']: node_hgrid['childrenCount']
+            for node_hgrid in dash_hgrid
+        }
+
+    def test_counts_built_on_first_read(self):
+        project = ProjectFactory(creator=self.user)
+        NodeFactory(creator=self.user, parent=project)
+        RegistrationFactory(creator=self.user)
+        counts = smart_folders.get_counts(self.user)
+        assert_equal(counts, {'projects': 2, 'registrations': 1})
+
+    def test_smart_folders_read_stored_counts(self):
+        smart_folders.SmartFolderCounts(_id=self.user._id, projects=4, registrations=2).save()
+        counts = self.get_counts()
+        assert_equal(counts[ALL_MY_PROJECTS_ID], 4)
+        assert_equal(counts[ALL_MY_REGISTRATIONS_ID], 2)
+
+    def test_component_of_own_project_not_counted(self):
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 0)
+        project = ProjectFactory(creator=self.user)
+        NodeFactory(creator=self.user, parent=project)
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+
+    def test_component_of_other_project_counted(self):
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 0)
+        project = ProjectFactory()
+        NodeFactory(creator=self.user, parent=project)
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+        # The component is shown under the project once the user contributes
+        # to it
+        project.add_contributor(self.user, auth=Auth(project.creator))
+        project.save()
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+        project.remove_contributor(self.user, auth=Auth(project.creator))
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+
+    def test_deleting_project_updates_count(self):
+        project = ProjectFactory(creator=self.user)
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+        project.remove_node(self.auth)
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 0)
+
+    def test_adding_and_removing_contributor_updates_count(self):
+        project = ProjectFactory()
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 0)
+        project.add_contributor(self.user, auth=Auth(project.creator))
+        project.save()
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 1)
+        project.remove_contributor(self.user, auth=Auth(project.creator))
+        assert_equal(self.get_counts()[ALL_MY_PROJECTS_ID], 0)
+
+    def test_registering_and_forking_update_counts(self):
+        project = ProjectFactory(creator=self.user)
+        NodeFactory(creator=self.user, parent=project)
+        assert_equal(self.get_counts()[ALL_MY_REGISTRATIONS_ID], 0)
+        project.register_node(None, self.auth, '', None)
+        project.fork_node(self.auth)
+        counts = self.get_counts()
+        assert_equal(counts[ALL_MY_PROJECTS_ID], 2)
+        assert_equal(counts[ALL_MY_REGISTRATIONS_ID], 1)
+
+    def test_counts_match_rebuilt_counts(self):
+        smart_folders.get_counts(self.user)
+        other = ProjectFactory()
+        NodeFactory(creator=self.user, parent=other)
+        project = ProjectFactory(creator=self.user)
+        component = NodeFactory(creator=self.user, parent=project)
+        NodeFactory(creator=self.user, parent=component)
+        NodeFactory(creator=self.user, parent=component).remove_node(self.auth)
+        other.add_contributor(self.user, auth=Auth(other.creator), save=True)
+        counts = smart_folders.get_counts(self.user)
+        # Counts built from scratch agree with the maintained counts
+        smart_folders._counts().remove({})
+        smart_folders._nodes().remove({})
+        assert_equal(counts, smart_folders.get_counts(self.user))
+
+    def test_unrecorded_node_not_counted_twice(self):
+        project = ProjectFactory(creator=self.user)
+        smart_folders._counts().remove({})
+        smart_folders._nodes().remove({})
+        assert_equal(smart_folders.get_counts(self.user)['projects'], 1)
+        project.add_contributor(UserFactory(), auth=self.auth)
+        project.save()
+        assert_equal(smart_folders.get_counts(self.user)['projects'], 1)
+
+    def test_counts_not_created_by_node_changes(self):
+        ProjectFactory(creator=self.user)
+        assert_is_none(smart_folders._counts().find_one({'_id': self.user._id}))
+
+    @mock.patch('website.project.smart_folders._apply')
+    def test_unchanged_node_not_applied(self, mock_apply):
+        project = ProjectFactory(creator=self.user)
+        mock_apply.reset_mock()
+        project.set_title('New title', auth=self.auth)
+        project.save()
+        smart_folders.update_node(project)
+        assert_false(mock_apply.called)
+
 
 def assert_valid_hgrid_folder(node_hgrid):
     folder_types = {
@@ -554,3 +723,117 @@ def assert_valid_hgrid_smart_folder(node_hgrid):
     assert_valid_hgrid_folder(node_hgrid)
     for attr, correct_value in smart_folder_values.items():
         assert_equal(correct_value, node_hgrid[attr])
+
+
+def make_slow_addon(short_name, delay):
+    """Mock addon settings whose provider request takes `delay` seconds."""
+    addon = mock.Mock()
+    addon.config.short_name = short_name
+    addon.config.full_name = short_name
+    addon.config.urls = None
+    addon.config.max_file_size = 128
+    addon.config.accept_extensions = True
+    addon.config.icon_url = ''
+
+    def fetch():
+        time.sleep(delay)
+        return short_name
+
+    def get_hgrid_data(*args, **kwargs):
+        return [{'name': kwargs.get('prefetched', short_name)}]
+    addon.config.prefetch_hgrid_data.return_value = fetch
+    addon.config.get_hgrid_data.side_effect = get_hgrid_data
+    return addon
+
+
+class TestConcurrentAddonCollection(OsfTestCase):
+
+    def setUp(self):
+        super(TestConcurrentAddonCollection, self).setUp()
+        self.auth = AuthFactory()
+        self.project = ProjectFactory(creator=self.auth.user)
+        self.serializer = rubeus.NodeFileCollector(node=self.project, auth=self.auth)
+        metrics.reset()
+
+    def make_addons(self, count, delay):
+        addons = [make_slow_addon('addon{0}'.format(i), delay) for i in range(count)]
+        for addon in addons:
+            addon.owner = self.project
+        return addons
+
+    @mock.patch('website.util.rubeus.settings.RUBEUS_ADDON_WORKERS', 4)
+    def test_addons_fetched_concurrently(self):
+        addons = self.make_addons(4, 0.2)
+        start = time.time()
+        ret = self.serializer._fetch_addon_roots(addons)
+        assert_less(time.time() - start, 0.6)
+        assert_equal(
+            ret,
+            [[{'name': 'addon{0}'.format(i)}] for i in range(4)],
+        )
+
+    @mock.patch('website.util.rubeus.settings.RUBEUS_ADDON_WORKERS', 4)
+    def test_only_provider_requests_run_in_pool(self):
+        addons = self.make_addons(4, 0)
+        request_thread = threading.current_thread()
+        fetched_in = []
+        built_in = []
+
+        def fetch():
+            fetched_in.append((threading.current_thread(), flask.has_request_context()))
+            return 'fetched'
+
+        def get_hgrid_data(addon, *args, **kwargs):
+            built_in.append(threading.current_thread())
+            return [{'name': kwargs['prefetched']}]
+        for addon in addons:
+            addon.config.prefetch_hgrid_data.return_value = fetch
+            addon.config.get_hgrid_data.side_effect = get_hgrid_data
+        app = self.app.app
+        with app.test_request_context('/'):
+            with mock.patch.object(app, 'do_teardown_request') as mock_teardown:
+                ret = self.serializer._fetch_addon_roots(addons)
+            assert_false(mock_teardown.called)
+        assert_equal(ret, [[{'name': 'fetched'}]] * 4)
+        # Database access, in prefetch_hgrid_data and get_hgrid_data, stays on
+        # the request thread
+        for addon in addons:
+            assert_equal(addon.config.prefetch_hgrid_data.call_count, 1)
+        assert_equal(built_in, [request_thread] * 4)
+        for thread, has_request_context in fetched_in:
+            assert_not_equal(thread, request_thread)
+            assert_false(has_request_context)
+
+    @mock.patch('website.util.rubeus.settings.RUBEUS_ADDON_WORKERS', 4)
+    def test_addon_without_prefetch_built_on_request_thread(self):
+        addons = self.make_addons(3, 0)
+        addons[1].config.prefetch_hgrid_data = None
+        ret = self.serializer._fetch_addon_roots(addons)
+        assert_equal(
+            ret,
+            [[{'name': 'addon{0}'.format(i)}] for i in range(3)],
+        )
+        _, kwargs = addons[1].config.get_hgrid_data.call_args
+        assert_not_in('prefetched', kwargs)
+
+    def test_addons_fetched_in_order_by_default(self):
+        addons = self.make_addons(2, 0)
+        ret = self.serializer._fetch_addon_roots(addons)
+        assert_equal(ret, [[{'name': 'addon0'}], [{'name': 'addon1'}]])
+        for addon in addons:
+            assert_false(addon.config.prefetch_hgrid_data.called)
+
+    @mock.patch('website.util.rubeus.settings.RUBEUS_ADDON_TIMEOUT', 0.1)
+    @mock.patch('website.util.rubeus.settings.RUBEUS_ADDON_WORKERS', 4)
+    def test_slow_addon_replaced_by_placeholder(self):
+        fast = make_slow_addon('fast', 0)
+        slow = make_slow_addon('slow', 1)
+        fast.owner = slow.owner = self.project
+        ret = self.serializer._fetch_addon_roots([fast, slow])
+        assert_equal(ret[0], [{'name': 'fast'}])
+        placeholder = ret[1][0]
+        assert_true(placeholder['unavailable'])
+        assert_equal(placeholder['name'], 'slow: Provider unavailable')
+        assert_false(placeholder['permissions']['edit'])
+        assert_false(slow.config.get_hgrid_data.called)
+        assert_equal(metrics.counters['rubeus.hgrid.slow.timeout'], 1)
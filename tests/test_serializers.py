@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import mock
 from nose.tools import *  # noqa (PEP8 asserts)
 
 from tests.factories import (
@@ -14,6 +15,7 @@ from tests.base import OsfTestCase
 
 from framework.auth import Auth
 from framework import utils as framework_utils
+from website.project import view_cache
 from website.project.views.node import _get_summary, _view_project, _serialize_node_search
 from website.views import _render_node
 from website.profile import utils
@@ -153,6 +155,57 @@ class TestViewProject(OsfTestCase):
         assert_equal(result['node']['points'], 1)
 
 
+class TestViewProjectCache(OsfTestCase):
+
+    def setUp(self):
+        super(TestViewProjectCache, self).setUp()
+        self.project = ProjectFactory()
+        self.auth = Auth(self.project.creator)
+
+    @mock.patch('website.project.views.node._view_project_shared')
+    def test_shared_data_cached(self, mock_shared):
+        mock_shared.return_value = {'node': {'title': 'cached'}, 'parent_node': {}}
+        first = _view_project(self.project, self.auth)
+        second = _view_project(self.project, self.auth)
+        assert_equal(mock_shared.call_count, 1)
+        assert_equal(second['node']['title'], 'cached')
+        # Per-user fields are computed for every request
+        assert_equal(first['user'], second['user'])
+        assert_false(second['node']['in_dashboard'])
+
+    def test_save_invalidates(self):
+        _view_project(self.project, self.auth)
+        self.project.set_title('Changed', auth=self.auth, save=True)
+        result = _view_project(self.project, self.auth)
+        assert_equal(result['node']['title'], 'Changed')
+
+    def test_fork_invalidates_original(self):
+        _view_project(self.project, self.auth)
+        self.project.fork_node(self.auth)
+        result = _view_project(self.project, self.auth)
+        assert_equal(result['node']['fork_count'], 1)
+
+    def test_pointer_invalidates_pointee(self):
+        _view_project(self.project, self.auth)
+        pointer_project = ProjectFactory(is_public=True)
+        pointer_project.add_pointer(self.project, Auth(pointer_project.creator), save=True)
+        result = _view_project(self.project, self.auth)
+        assert_equal(result['node']['points'], 1)
+
+    def test_parent_change_invalidates_children(self):
+        child = NodeFactory(parent=self.project, creator=self.project.creator)
+        _view_project(child, self.auth)
+        self.project.set_title('New parent title', auth=self.auth, save=True)
+        result = _view_project(child, self.auth)
+        assert_equal(result['parent_node']['title'], 'New parent title')
+
+    def test_store_ignores_outdated_version(self):
+        version, _ = view_cache.get(self.project._id)
+        view_cache.invalidate(self.project._id)
+        view_cache.store(self.project._id, version, {'node': {}})
+        assert_is_none(view_cache.get(self.project._id)[1])
+
+
 class TestNodeLogSerializers(OsfTestCase):
 
     def test_serialize_log(self):
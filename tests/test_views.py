@@ -21,7 +21,7 @@ from framework.auth import User, Auth
 from framework.auth.utils import impute_names_model
 
 from website import mailchimp_utils
-from website.views import _rescale_ratio
+from website.views import _rescale_ratio, find_dashboard
 from website.util import permissions
 from website.models import Node, Pointer, NodeLog
 from website.project.model import ensure_schemas, has_anonymous_link
@@ -228,6 +228,28 @@ class TestProjectViews(OsfTestCase):
         my_user.reload()
         dashboard = my_user.node__contributed.find(Q('is_dashboard', 'eq', True))
         assert_equal(dashboard.count(), 1)
+        assert_equal(my_user.dashboard_id, dashboard[0]._id)
+
+    def test_find_dashboard_uses_stored_id(self):
+        dashboard = DashboardFactory(creator=self.user1)
+        self.user1.dashboard_id = dashboard._id
+        self.user1.save()
+        with mock.patch('website.views.Node.load', return_value=dashboard) as mock_load:
+            assert_equal(find_dashboard(self.user1), dashboard)
+        mock_load.assert_called_once_with(dashboard._id)
+
+    def test_find_dashboard_replaces_stale_id(self):
+        dashboard = DashboardFactory(creator=self.user1)
+        self.user1.dashboard_id = ProjectFactory(creator=self.user1)._id
+        self.user1.save()
+        assert_equal(find_dashboard(self.user1), dashboard)
+        assert_equal(self.user1.dashboard_id, dashboard._id)
+
+    def test_find_dashboard_stores_missing_id(self):
+        dashboard = DashboardFactory(creator=self.user1)
+        assert_is_none(self.user1.dashboard_id)
+        assert_equal(find_dashboard(self.user1), dashboard)
+        assert_equal(self.user1.dashboard_id, dashboard._id)
 
     def test_add_contributor_post(self):
         # Two users are added as a contributor via a POST request
@@ -1588,6 +1610,28 @@ class TestAddingContributorViews(OsfTestCase):
         assert_equal(len(child.contributors),
                      n_contributors_pre + len(payload['users']))
 
+    def test_add_contribs_to_multiple_nodes_adds_one_log_per_node(self):
+        child = NodeFactory(parent=self.project, creator=self.creator)
+        n_logs_pre = [len(self.project.logs), len(child.logs)]
+        reg_dicts = []
+        for _ in range(3):
+            reg_dict = add_contributor_json(UserFactory())
+            reg_dict['permission'] = 'write'
+            reg_dict['visible'] = True
+            reg_dicts.append(reg_dict)
+        payload = {
+            'users': reg_dicts,
+            'node_ids': [child._primary_key],
+        }
+        url = self.project.api_url_for('project_contributors_post')
+        self.app.post_json(url, payload, auth=self.creator.auth)
+        self.project.reload()
+        child.reload()
+        assert_equal(
+            [len(self.project.logs), len(child.logs)],
+            [count + 1 for count in n_logs_pre],
+        )
+
 
 class TestUserInviteViews(OsfTestCase):
 
@@ -2172,6 +2216,48 @@ class TestPointerViews(OsfTestCase):
         assert_in(pointer_project._id, pointer_ids)
         assert_not_in(folder._id, pointer_ids)
 
+    def _search_node(self, query, **kwargs):
+        payload = {'query': query, 'nodeId': self.project._id}
+        payload.update(kwargs)
+        return self.app.post_json(
+            api_url_for('search_node'), payload, auth=self.user.auth,
+        )
+
+    def test_search_node_matches_word_prefixes(self):
+        ProjectFactory(creator=self.user, title=u'Réaction kinetics')
+        ProjectFactory(creator=self.user, title='Unrelated')
+        res = self._search_node('reac KIN')
+        assert_equal([each['title'] for each in res.json['nodes']], [u'Réaction kinetics'])
+        assert_equal(self._search_node('action').json['nodes'], [])
+
+    def test_search_node_matches_non_latin_words(self):
+        ProjectFactory(creator=self.user, title=u'Исследование памяти')
+        ProjectFactory(creator=self.user, title=u'心理学 study')
+        res = self._search_node(u'иссл')
+        assert_equal([each['title'] for each in res.json['nodes']], [u'Исследование памяти'])
+        res = self._search_node(u'心理学')
+        assert_equal([each['title'] for each in res.json['nodes']], [u'心理学 study'])
+
+    def test_search_node_excludes_private_nodes_of_others(self):
+        ProjectFactory(title='Secret plans')
+        ProjectFactory(title='Public plans', is_public=True)
+        res = self._search_node('plans', includePublic=True)
+        assert_equal([each['title'] for each in res.json['nodes']], ['Public plans'])
+        res = self._search_node('plans', includePublic=False)
+        assert_equal(res.json['nodes'], [])
+
+    def test_search_node_pagination(self):
+        for i in range(7):
+            ProjectFactory(creator=self.user, title='Paged {0}'.format(i))
+        first = self._search_node('paged', size=5, page=0).json
+        second = self._search_node('paged', size=5, page=1).json
+        assert_equal(first['total'], 7)
+        assert_equal(first['pages'], 2)
+        assert_equal(len(first['nodes']), 5)
+        assert_equal(len(second['nodes']), 2)
+        ids = [each['id'] for each in first['nodes'] + second['nodes']]
+        assert_equal(len(set(ids)), 7)
+
     def test_add_pointers(self):
 
         url = self.project.api_url + 'pointer/'
@@ -3644,6 +3730,21 @@ class TestDashboardViews(OsfTestCase):
         res = self.app.get(url, auth=self.contrib.auth)
         assert_equal(len(res.json['data']), 1)
 
+    def test_dashboard_page_includes_dashboard(self):
+        res = self.app.get(web_url_for('dashboard'), auth=self.creator.auth)
+        line = next(
+            line for line in res.body.splitlines()
+            if line.strip().startswith('dashboard:')
+        )
+        rendered = json.loads(line.split(':', 1)[1])
+        url = api_url_for('get_dashboard')
+        fetched = self.app.get(url, auth=self.creator.auth).json
+        assert_equal(rendered['id'], fetched['id'])
+        assert_equal(rendered['timezone'], fetched['timezone'])
+        assert_equal(len(rendered['data']), 1)
+        assert_equal(rendered['data'][0]['node_id'], self.dashboard._id)
+        assert_equal(rendered['data'][0]['node_id'], fetched['data'][0]['node_id'])
+
     def test_get_dashboard_nodes(self):
         project = ProjectFactory(creator=self.creator)
         component = NodeFactory(creator=self.creator, parent=project)
@@ -3855,7 +3956,7 @@ class TestForkViews(OsfTestCase):
         url = self.project.api_url_for('node_fork_page')
         non_contributor = AuthUserFactory()
         res = self.app.post_json(url, auth=non_contributor.auth)
-        assert_equal(res.status_code, 200)
+        assert_equal(res.status_code, http.ACCEPTED)
 
     def test_fork_project_contributor(self):
         contributor = AuthUserFactory()
@@ -3865,7 +3966,31 @@ class TestForkViews(OsfTestCase):
 
         url = self.project.api_url_for('node_fork_page')
         res = self.app.post_json(url, auth=contributor.auth)
-        assert_equal(res.status_code, 200)
+        assert_equal(res.status_code, http.ACCEPTED)
+
+    def test_fork_status(self):
+        url = self.project.api_url_for('node_fork_page')
+        res = self.app.post_json(url, auth=self.user.auth)
+        res = self.app.get(res.json['statusUrl'], auth=self.user.auth)
+        assert_equal(res.json['status'], 'complete')
+        assert_equal(res.json['nodes'], 1)
+        fork = self.project.forks[0]
+        assert_equal(res.json['url'], fork.url)
+
+    def test_fork_status_other_user(self):
+        url = self.project.api_url_for('node_fork_page')
+        res = self.app.post_json(url, auth=self.user.auth)
+        res = self.app.get(
+            res.json['statusUrl'],
+            auth=AuthUserFactory().auth,
+            expect_errors=True,
+        )
+        assert_equal(res.status_code, http.FORBIDDEN)
+
+    def test_fork_status_not_found(self):
+        url = self.project.api_url_for('node_fork_status', job_id='abcde')
+        res = self.app.get(url, auth=self.user.auth, expect_errors=True)
+        assert_equal(res.status_code, http.NOT_FOUND)
 
     def test_registered_forks_dont_show_in_fork_list(self):
         fork = self.project.fork_node(self.consolidated_auth)
@@ -4052,6 +4177,39 @@ class TestProfileNodeList(OsfTestCase):
         assert_not_in(self.private._id, node_ids)
         assert_not_in(self.deleted._id, node_ids)
 
+    def test_get_public_projects_paginated(self):
+        for _ in range(2):
+            project = ProjectFactory(is_public=True)
+            project.add_contributor(self.user, auth=Auth(project.creator))
+            project.save()
+        url = api_url_for('get_public_projects', uid=self.user._id)
+        res = self.app.get(url, {'size': 2, 'page': 1})
+        assert_equal(len(res.json['nodes']), 1)
+        assert_equal(res.json['total'], 3)
+        assert_equal(res.json['pages'], 2)
+
+    def test_get_public_projects_not_modified(self):
+        url = api_url_for('get_public_projects', uid=self.user._id)
+        res = self.app.get(url)
+        etag = res.headers['ETag']
+        res = self.app.get(url, headers={'If-None-Match': etag})
+        assert_equal(res.status_code, 304)
+
+    def test_get_public_projects_etag_changes_with_privacy(self):
+        url = api_url_for('get_public_projects', uid=self.user._id)
+        etag = self.app.get(url).headers['ETag']
+        self.private.set_privacy('public', auth=Auth(self.private.creator))
+        res = self.app.get(url, headers={'If-None-Match': etag})
+        assert_equal(res.status_code, 200)
+        assert_in(self.private._id, [each['id'] for each in res.json['nodes']])
+
+    def test_get_public_projects_updated_on_contributor_removal(self):
+        url = api_url_for('get_public_projects', uid=self.user._id)
+        self.app.get(url)
+        self.public.remove_contributor(self.user, auth=Auth(self.public.creator))
+        res = self.app.get(url)
+        assert_not_in(self.public._id, [each['id'] for each in res.json['nodes']])
+
 class TestStaticFileViews(OsfTestCase):
 
     def test_robots_dot_txt(self):
@@ -23,6 +23,7 @@ from framework.exceptions import PermissionsError
 from website import settings
 from website.addons.base import exceptions
 from website.addons.base import serializer
+from website.addons.base import metadata_cache
 from website.project.model import Node
 
 from website.oauth.signals import oauth_complete
@@ -64,7 +65,8 @@ class AddonConfig(object):
                  added_default=None, added_mandatory=None,
                  node_settings_model=None, user_settings_model=None, include_js=None, include_css=None,
                  widget_help=None, views=None, configs=None, models=None,
-                 has_hgrid_files=False, get_hgrid_data=None, max_file_size=None, high_max_file_size=None,
+                 has_hgrid_files=False, get_hgrid_data=None, prefetch_hgrid_data=None,
+                 max_file_size=None, high_max_file_size=None,
                  accept_extensions=True,
                  node_settings_template=None, user_settings_template=None,
                  **kwargs):
@@ -101,6 +103,11 @@ class AddonConfig(object):
         self.has_hgrid_files = has_hgrid_files
         # WARNING: get_hgrid_data can return None if the addon is added but has no credentials.
         self.get_hgrid_data = get_hgrid_data  # if has_hgrid_files and not get_hgrid_data rubeus.make_dummy()
+        # Optional; reads what the provider requests need from the database and
+        # returns a function making only those requests, whose result is passed
+        # to get_hgrid_data as `prefetched`. Lets rubeus make the requests off
+        # the request thread.
+        self.prefetch_hgrid_data = prefetch_hgrid_data
         self.max_file_size = max_file_size
         self.high_max_file_size = high_max_file_size
         self.accept_extensions = accept_extensions
@@ -382,6 +389,13 @@ class GuidFile(GuidStoredObject):
     def revision(self):
         return getattr(self, '_revision', None)
 
+    @property
+    def revision_is_immutable(self):
+        """Whether the requested revision always refers to the same content,
+        in which case its metadata may be cached indefinitely.
+        """
+        return False
+
     def maybe_set_version(self, **kwargs):
         self._revision = kwargs.get(self.version_identifier)
 
@@ -399,14 +413,32 @@ class GuidFile(GuidStoredObject):
         raise exceptions.AddonEnrichmentError(response.status_code)
 
     def _fetch_metadata(self, should_raise=False):
-        # Note: We should look into caching this at some point
-        # Some attributes may change however.
-        resp = requests.get(self.metadata_url)
+        cached = metadata_cache.get(
+            self.provider, self.node._id, self.waterbutler_path, self.revision
+        )
+        if cached is not None:
+            self._metadata_cache = cached
+            return
+
+        try:
+            resp = metadata_cache.fetch(self.metadata_url)
+        except requests.exceptions.Timeout:
+            raise exceptions.AddonEnrichmentError(504)
 
         if should_raise:
             self._exception_from_response(resp)
         self._metadata_cache = resp.json()['data']
 
+        if resp.ok:
+            metadata_cache.store(
+                self.provider,
+                self.node._id,
+                self.waterbutler_path,
+                self.revision,
+                self._metadata_cache,
+                immutable=self.revision_is_immutable,
+            )
+
 
 class AddonSettingsBase(StoredObject):
 
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Per-worker cache of WaterButler file metadata, shared by all `GuidFile`
+instances. Entries are keyed by (provider, node, path, revision); metadata for
+immutable revisions is kept until evicted or invalidated, everything else
+expires after `settings.WATERBUTLER_METADATA_TTL` seconds.
+"""
+import time
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from website import settings
+
+# (provider, node_id) -> {(path, revision): (expires_at, metadata)}
+_cache = {}
+_size = 0
+_lock = threading.Lock()
+
+_session = None
+
+
+def get_session():
+    """Return the pooled HTTP session used to fetch metadata on cache misses."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.WATERBUTLER_POOL_SIZE,
+            pool_maxsize=settings.WATERBUTLER_POOL_SIZE,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session = session
+    return _session
+
+
+def fetch(url):
+    """Fetch metadata from WaterButler over the pooled session."""
+    return get_session().get(url, timeout=settings.WATERBUTLER_METADATA_TIMEOUT)
+
+
+def _normalize(path):
+    return (path or '').strip('/')
+
+
+def get(provider, node_id, path, revision=None):
+    """Return cached metadata for a file, or None if missing or expired."""
+    with _lock:
+        entries = _cache.get((provider, node_id))
+        if not entries:
+            return None
+        entry = entries.get((_normalize(path), revision))
+        if entry is None:
+            return None
+        expires_at, metadata = entry
+        if expires_at is not None and expires_at <= time.time():
+            _remove(entries, (provider, node_id), (_normalize(path), revision))
+            return None
+        return metadata
+
+
+def store(provider, node_id, path, revision, metadata, immutable=False):
+    """Cache metadata for a file. Immutable revisions never expire."""
+    global _size
+    expires_at = None if immutable else time.time() + settings.WATERBUTLER_METADATA_TTL
+    with _lock:
+        if _size >= settings.WATERBUTLER_METADATA_CACHE_SIZE:
+            _clear()
+        entries = _cache.setdefault((provider, node_id), {})
+        key = (_normalize(path), revision)
+        if key not in entries:
+            _size += 1
+        entries[key] = (expires_at, metadata)
+
+
+def invalidate(provider, node_id, path=None):
+    """Drop every cached revision of `path` and of anything beneath it, or of
+    every file the provider has on the node if no path is given.
+    """
+    prefix = _normalize(path)
+    with _lock:
+        entries = _cache.get((provider, node_id))
+        if not entries:
+            return
+        for key in list(entries):
+            cached_path = key[0]
+            if (
+                not prefix or
+                cached_path == prefix or
+                cached_path.startswith(prefix + '/')
+            ):
+                _remove(entries, (provider, node_id), key)
+
+
+def clear():
+    with _lock:
+        _clear()
+
+
+def _remove(entries, bucket, key):
+    global _size
+    del entries[key]
+    _size -= 1
+    if not entries:
+        del _cache[bucket]
+
+
+def _clear():
+    global _size
+    _cache.clear()
+    _size = 0
@@ -23,6 +23,7 @@ from website import mails
 from website import settings
 from website.project import decorators
 from website.addons.base import exceptions
+from website.addons.base import metadata_cache
 from website.models import User, Node, NodeLog
 from website.util import rubeus
 from website.project.utils import serialize_node
@@ -249,6 +250,13 @@ def create_waterbutler_log(payload, **kwargs):
             'project': destination_node.parent_id,
         })
 
+        for bundle_node, bundle in ((source_node, 'source'), (destination_node, 'destination')):
+            metadata_cache.invalidate(
+                payload[bundle]['provider'],
+                bundle_node._id,
+                payload[bundle].get('path'),
+            )
+
         if not payload.get('errors'):
             destination_node.add_log(
                 action=action,
@@ -280,6 +288,7 @@ def create_waterbutler_log(payload, **kwargs):
             raise HTTPError(httplib.BAD_REQUEST)
 
         metadata['path'] = metadata['path'].lstrip('/')
+        metadata_cache.invalidate(payload['provider'], node._id, metadata['path'])
 
         node_addon.create_waterbutler_log(auth, action, metadata)
 
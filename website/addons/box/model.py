@@ -116,9 +116,15 @@ class BoxOAuthSettings(StoredObject):
             BoxOAuthSettings.remove_one(self)
 
     def _needs_refresh(self):
+        """Whether the access token has expired. Tokens about to expire are
+        refreshed ahead of time by ``scripts/refresh_oauth_tokens.py``.
+        """
+        return self.expires_within(0)
+
+    def expires_within(self, seconds):
         if self.expires_at is None:
             return False
-        return (self.expires_at - datetime.utcnow()).total_seconds() < settings.REFRESH_TIME
+        return (self.expires_at - datetime.utcnow()).total_seconds() <= seconds
 
 
 class BoxUserSettings(AddonUserSettingsBase):
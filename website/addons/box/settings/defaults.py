@@ -2,7 +2,5 @@
 BOX_KEY = None
 BOX_SECRET = None
 
-REFRESH_TIME = 5 * 60  # 5 minutes
-
 BOX_OAUTH_TOKEN_ENDPOINT = 'https://www.box.com/api/oauth2/token'
 BOX_OAUTH_AUTH_ENDPOINT = 'https://www.box.com/api/oauth2/authorize'
@@ -34,7 +34,7 @@ class TestFileGuid(OsfTestCase):
         assert_equals(guid.path, '1234567890/foo/bar')
         assert_equals(guid.waterbutler_path, '/1234567890/foo/bar')
 
-    @mock.patch('website.addons.base.requests.get')
+    @mock.patch('website.addons.base.metadata_cache.fetch')
     def test_unique_identifier(self, mock_get):
         uid = '#!'
         mock_response = mock.Mock(ok=True, status_code=200)
@@ -51,7 +51,7 @@ class TestFileGuid(OsfTestCase):
         guid.enrich()
         assert_equals(uid, guid.unique_identifier)
 
-    @mock.patch('website.addons.base.requests.get')
+    @mock.patch('website.addons.base.metadata_cache.fetch')
     def test_unique_identifier_version(self, mock_get):
         uid = '#!'
         mock_response = mock.Mock(ok=True, status_code=200)
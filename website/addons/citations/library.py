@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Incrementally synced citation store for reference manager accounts.
+
+Providers (``ExternalProvider`` subclasses such as Mendeley and Zotero) plug
+in by implementing:
+
+* ``_fetch_folders()``: list of folder dicts, stored as-is
+* ``_folder_key(folder)``: id of a stored folder dict
+* ``_fetch_changes(cursor)``: ``(new_cursor, documents, deleted_ids)``, where
+  ``documents`` iterates over ``(document_id, version, document)`` for every
+  document changed since ``cursor`` (all documents if ``cursor`` is None)
+* ``_citation_for_document(document)``: CSL dict for a fetched document
+* ``_fetch_folder_document_ids(folder_id)``: ids of the documents in a folder
+"""
+import datetime
+import itertools
+
+from modularodm import Q
+
+from framework.tasks import app
+from framework.tasks.handlers import queued_task
+from framework.transactions.context import transaction
+
+from website import settings
+from website.oauth.models import ExternalAccount
+from website.oauth.utils import get_service
+from website.citations.models import CitationLibrary, LibraryCitation
+
+SYNC_CHUNK_SIZE = 500
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_library(provider):
+    """Return the citation library of ``provider.account``. A library that has
+    never been synced is synced now, up to CITATION_LIBRARY_INLINE_SYNC_LIMIT
+    documents; a stale one is served as-is while a refresh is queued.
+    """
+    library = CitationLibrary.load(provider.account._id)
+    if library is None or library.date_synced is None:
+        return sync_library(
+            provider,
+            limit=settings.CITATION_LIBRARY_INLINE_SYNC_LIMIT,
+        )
+
+    now = datetime.datetime.utcnow()
+    interval = datetime.timedelta(seconds=settings.CITATION_LIBRARY_REFRESH_INTERVAL)
+    requested = library.date_refresh_requested
+    if library.date_synced < now - interval and (requested is None or requested < now - interval):
+        library.date_refresh_requested = now
+        library.save()
+        refresh_citation_library(library._id)
+    return library
+
+
+def sync_library(provider, limit=None):
+    """Fetch folders and changed documents from the provider, converting each
+    new document version to CSL once.
+
+    :param ExternalProvider provider: Provider with ``account`` set
+    :param int limit: Stop after this many changed documents. The sync cursor
+        is then left unchanged and a full refresh is queued.
+    :return CitationLibrary:
+    """
+    account = provider.account
+    library = CitationLibrary.load(account._id)
+    if library is None:
+        library = CitationLibrary(_id=account._id, provider=account.provider)
+
+    library.folders = provider._fetch_folders()
+    cursor, documents, deleted_ids = provider._fetch_changes(library.cursor)
+
+    truncated = False
+    if limit is not None:
+        documents = itertools.islice(documents, limit + 1)
+
+    synced = 0
+    for chunk in _chunks(documents, SYNC_CHUNK_SIZE):
+        if limit is not None and synced + len(chunk) > limit:
+            chunk = chunk[:limit - synced]
+            truncated = True
+        synced += len(chunk)
+        _sync_documents(provider, library, chunk)
+
+    if deleted_ids:
+        LibraryCitation.remove(
+            Q('library', 'eq', library._id) &
+            Q('document_id', 'in', list(deleted_ids))
+        )
+
+    # Refresh membership of folders that have been viewed and still exist
+    folder_keys = set(provider._folder_key(folder) for folder in library.folders)
+    library.folder_documents = {
+        folder_id: provider._fetch_folder_document_ids(folder_id)
+        for folder_id in library.folder_documents or {}
+        if folder_id in folder_keys
+    }
+
+    if not truncated:
+        library.cursor = cursor
+    library.date_synced = datetime.datetime.utcnow()
+    library.save()
+
+    if truncated:
+        refresh_citation_library(library._id)
+
+    return library
+
+
+def _sync_documents(provider, library, chunk):
+    existing = {
+        citation.document_id: citation
+        for citation in LibraryCitation.find(
+            Q('library', 'eq', library._id) &
+            Q('document_id', 'in', [document_id for document_id, _, _ in chunk])
+        )
+    }
+    for document_id, version, document in chunk:
+        citation = existing.get(document_id)
+        if citation is None:
+            citation = LibraryCitation(
+                library=library._id,
+                document_id=document_id,
+                position=library.next_position,
+            )
+            library.next_position += 1
+        elif version is not None and citation.version == version:
+            continue
+        citation.version = version
+        citation.csl = provider._citation_for_document(document)
+        citation.save()
+
+
+def get_citations(provider, list_id=None):
+    """CSL citations for a folder, or for the whole library if ``list_id`` is
+    None or 'ROOT'. Folder membership is fetched once, then kept up to date
+    by syncs.
+    """
+    library = get_library(provider)
+    if list_id in (None, 'ROOT'):
+        return [citation.csl for citation in library.citations]
+
+    document_ids = (library.folder_documents or {}).get(list_id)
+    if document_ids is None:
+        document_ids = provider._fetch_folder_document_ids(list_id)
+        folder_documents = dict(library.folder_documents or {})
+        folder_documents[list_id] = document_ids
+        library.folder_documents = folder_documents
+        library.save()
+
+    citations = {
+        citation.document_id: citation.csl
+        for citation in LibraryCitation.find(
+            Q('library', 'eq', library._id) &
+            Q('document_id', 'in', document_ids)
+        )
+    }
+    return [
+        citations[document_id]
+        for document_id in document_ids
+        if document_id in citations
+    ]
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def refresh_citation_library(account_id):
+    account = ExternalAccount.load(account_id)
+    if account is None:
+        return
+    provider = get_service(account.provider)
+    provider.account = account
+    sync_library(provider)
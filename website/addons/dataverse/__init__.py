@@ -37,6 +37,7 @@ INCLUDE_CSS = {
 
 HAS_HGRID_FILES = True
 GET_HGRID_DATA = views.hgrid.dataverse_hgrid_root
+PREFETCH_HGRID_DATA = views.hgrid.dataverse_hgrid_fetch
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 NODE_SETTINGS_TEMPLATE = os.path.join(HERE, 'templates', 'dataverse_node_settings.mako')
@@ -14,13 +14,17 @@ def _connect(token, host=settings.HOST):
         return None
 
 
-def connect_from_settings(user_settings):
+def connect_from_token(token):
     try:
-        return _connect(user_settings.api_token) if user_settings else None
+        return _connect(token)
     except UnauthorizedError:
         return None
 
 
+def connect_from_settings(user_settings):
+    return connect_from_token(user_settings.api_token) if user_settings else None
+
+
 def connect_or_401(token):
     try:
         return _connect(token)
@@ -290,7 +290,7 @@ class TestDataverseViewsConfig(DataverseAddonTestCase):
 
 class TestDataverseViewsHgrid(DataverseAddonTestCase):
 
-    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_settings')
+    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_token')
     @mock.patch('website.addons.dataverse.views.hgrid.get_files')
     def test_dataverse_root_published(self, mock_files, mock_connection):
         mock_connection.return_value = create_mock_connection()
@@ -315,7 +315,7 @@ class TestDataverseViewsHgrid(DataverseAddonTestCase):
         assert_true(res.json[0]['hasPublishedFiles'])
         assert_equal(res.json[0]['version'], 'latest-published')
 
-    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_settings')
+    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_token')
     @mock.patch('website.addons.dataverse.views.hgrid.get_files')
     def test_dataverse_root_not_published(self, mock_files, mock_connection):
         mock_connection.return_value = create_mock_connection()
@@ -339,7 +339,7 @@ class TestDataverseViewsHgrid(DataverseAddonTestCase):
         assert_equal(res.json, [])
 
 
-    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_settings')
+    @mock.patch('website.addons.dataverse.views.hgrid.connect_from_token')
     @mock.patch('website.addons.dataverse.views.hgrid.get_files')
     def test_dataverse_root_no_connection(self, mock_files, mock_connection):
         mock_connection.return_value = create_mock_connection()
@@ -1,16 +1,33 @@
 # -*- coding: utf-8 -*-
 
 from website.addons.dataverse.client import get_dataset, get_files, \
-    get_dataverse, connect_from_settings
+    get_dataverse, connect_from_token
 
 from website.project.decorators import must_be_contributor_or_public
 from website.project.decorators import must_have_addon
 from website.util import rubeus
 
 
+def dataverse_hgrid_fetch(node_addon, auth, **kwargs):
+    """Return a function fetching the linked dataverse, dataset and published
+    files, or None if no dataset is linked.
+    """
+    if not node_addon.complete:
+        return None
+    token = node_addon.user_settings.api_token
+    alias = node_addon.dataverse_alias
+    doi = node_addon.dataset_doi
+
+    def fetch():
+        dataverse = get_dataverse(connect_from_token(token), alias)
+        dataset = get_dataset(dataverse, doi)
+        published_files = get_files(dataset, published=True) if dataset else None
+        return dataverse, dataset, published_files
+    return fetch
+
+
 def dataverse_hgrid_root(node_addon, auth, **kwargs):
     node = node_addon.owner
-    user_settings = node_addon.user_settings
 
     default_version = 'latest-published'
     version = 'latest-published' if not node.can_edit(auth) else default_version
@@ -19,15 +36,15 @@ def dataverse_hgrid_root(node_addon, auth, **kwargs):
     if not node_addon.complete:
         return []
 
-    connection = connect_from_settings(user_settings)
-    dataverse = get_dataverse(connection, node_addon.dataverse_alias)
-    dataset = get_dataset(dataverse, node_addon.dataset_doi)
+    if 'prefetched' in kwargs:
+        dataverse, dataset, published_files = kwargs['prefetched']
+    else:
+        dataverse, dataset, published_files = dataverse_hgrid_fetch(node_addon, auth)()
 
     # Quit if doi does not produce a dataset
     if dataset is None:
         return []
 
-    published_files = get_files(dataset, published=True)
     can_edit = node.can_edit(auth)
 
     # Produce draft version or quit if no published version is available
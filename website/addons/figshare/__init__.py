@@ -30,6 +30,7 @@ INCLUDE_CSS = {}
 
 HAS_HGRID_FILES = True
 GET_HGRID_DATA = views.hgrid.figshare_hgrid_data
+PREFETCH_HGRID_DATA = views.hgrid.figshare_hgrid_fetch
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 NODE_SETTINGS_TEMPLATE = None  # use default nodes settings templates
@@ -1,7 +1,12 @@
 import os
+import copy
 import json
+import time
+import threading
+from multiprocessing.pool import ThreadPool
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1Session
 
 from website.util.sanitize import escape_html
@@ -9,28 +14,79 @@ from website.util.sanitize import escape_html
 from . import settings as figshare_settings
 
 
+# Connection pool shared by all clients in this process
+_adapter = HTTPAdapter(
+    pool_connections=figshare_settings.POOL_SIZE,
+    pool_maxsize=figshare_settings.POOL_SIZE,
+)
+
+# (owner token, url, output) -> (expires_at, response value)
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+
+def _mount_adapter(session):
+    session.mount('http://', _adapter)
+    session.mount('https://', _adapter)
+    return session
+
+
+def _get_cached(key):
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _response_cache[key]
+            return None
+    # Callers may modify responses in place
+    return copy.deepcopy(entry[1])
+
+
+def _set_cached(key, value):
+    with _response_cache_lock:
+        if len(_response_cache) >= figshare_settings.CACHE_MAX_ENTRIES:
+            _response_cache.clear()
+        _response_cache[key] = (
+            time.time() + figshare_settings.CACHE_TTL,
+            copy.deepcopy(value),
+        )
+
+
+def clear_cache(owner_token=None):
+    """Drop cached responses fetched with `owner_token`, or all of them."""
+    with _response_cache_lock:
+        if owner_token is None:
+            _response_cache.clear()
+            return
+        for key in list(_response_cache):
+            if key[0] == owner_token:
+                del _response_cache[key]
+
+
 def _get_project_url(node_settings, project, *args):
     return os.path.join(node_settings.api_url, 'projects', str(project), *args)
 
 class Figshare(object):
 
     def __init__(self, client_token=None, client_secret=None, owner_token=None, owner_secret=None):
+        self.owner_token = owner_token
         # if no OAuth
         if owner_token is None:
-            self.session = requests
+            self.session = _mount_adapter(requests.Session())
         else:
             self.client_token = client_token
             self.client_secret = client_secret
             self.owner_token = owner_token
             self.owner_secret = owner_secret
 
-            self.session = OAuth1Session(
+            self.session = _mount_adapter(OAuth1Session(
                 client_token,
                 client_secret=client_secret,
                 resource_owner_key=owner_token,
                 resource_owner_secret=owner_secret,
                 signature_type='auth_header'
-            )
+            ))
         self.last_error = None
 
     @classmethod
@@ -51,10 +107,18 @@ class Figshare(object):
         return e
 
     def _send(self, url, method='get', output='json', cache=True, **kwargs):
+        # Only successful GETs without extra arguments are cached, per owner
+        cache_key = None
+        if cache and method.lower() == 'get' and output is not None and not kwargs:
+            cache_key = (self.owner_token, url, output)
+            cached = _get_cached(cache_key)
+            if cached is not None:
+                return cached
+
         func = getattr(self.session, method.lower())
 
         # Send request
-        req = func(url, **kwargs)
+        req = func(url, timeout=figshare_settings.REQUEST_TIMEOUT, **kwargs)
 
         # Get return value
         rv = None
@@ -65,11 +129,26 @@ class Figshare(object):
                 rv = getattr(req, output)
                 if callable(rv):
                     rv = rv()
-            return escape_html(rv)
+            rv = escape_html(rv)
+            if cache_key is not None:
+                _set_cached(cache_key, rv)
+            return rv
         else:
             self.last_error = req.status_code
             return False
 
+    def _map(self, func, items):
+        """Apply `func` to `items` over a bounded thread pool, keeping order."""
+        items = list(items)
+        workers = min(figshare_settings.MAX_WORKERS, len(items))
+        if workers < 2:
+            return [func(item) for item in items]
+        pool = ThreadPool(workers)
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+
     def _send_with_data(self, url, method='post', output='json', **kwargs):
         mapper = kwargs.get('mapper')
         if mapper:
@@ -115,11 +194,15 @@ class Figshare(object):
             os.path.join(node_settings.api_url, 'projects', "{0}".format(project_id), 'articles'))
         project['articles'] = []
         if(articles):
-            project['articles'] = []
-            for article in articles:
-                fetched = self.article(node_settings, article['id'])
-                if fetched:
-                    project['articles'].append(fetched['items'][0])
+            fetched_articles = self._map(
+                lambda article: self.article(node_settings, article['id']),
+                articles,
+            )
+            project['articles'] = [
+                fetched['items'][0]
+                for fetched in fetched_articles
+                if fetched
+            ]
         return project
 
     # ARTICLE LEVEL API
@@ -127,7 +210,10 @@ class Figshare(object):
         articles = self._send(os.path.join(node_settings.api_url, 'articles'))
         if not articles:
             return [], self.last_error
-        articles = [self.article(node_settings, article['article_id']) for article in articles['items']]
+        articles = self._map(
+            lambda article: self.article(node_settings, article['article_id']),
+            articles['items'],
+        )
         return articles, 200
 
     def article_is_public(self, article):
@@ -11,7 +11,7 @@ from website.addons.base import exceptions
 from website.addons.base import AddonNodeSettingsBase, AddonUserSettingsBase
 
 from . import messages
-from .api import Figshare
+from .api import Figshare, clear_cache
 from . import exceptions as fig_exceptions
 from . import settings as figshare_settings
 
@@ -195,6 +195,10 @@ class AddonFigShareNodeSettings(AddonNodeSettingsBase):
         }
 
     def create_waterbutler_log(self, auth, action, metadata):
+        # Article listings changed; don't serve them from the response cache
+        if self.user_settings:
+            clear_cache(self.user_settings.oauth_access_token or '')
+
         if action in [NodeLog.FILE_ADDED, NodeLog.FILE_UPDATED]:
             name = metadata['name']
             url = self.owner.web_url_for('addon_view_or_download_file', provider='figshare', path=metadata['path'])
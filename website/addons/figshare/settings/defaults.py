@@ -5,3 +5,12 @@ API_URL = 'http://api.figshare.com/v1/'
 API_OAUTH_URL = API_URL + 'my_data/'
 
 MAX_RENDER_SIZE = 1000
+
+# Concurrent article fetches per project and pooled connections per process
+MAX_WORKERS = 8
+POOL_SIZE = 10
+REQUEST_TIMEOUT = 30
+
+# Seconds to cache successful GET responses, per owner
+CACHE_TTL = 60
+CACHE_MAX_ENTRIES = 5000
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 import os
 
+import mock
 from nose.tools import *  # noqa (PEP8 asserts)
 from tests.base import OsfTestCase
 from tests.factories import NodeFactory
 
 from framework.auth.core import Auth
-from website.addons.figshare.api import _get_project_url, Figshare
+from website.addons.figshare import settings as figshare_settings
+from website.addons.figshare.api import _get_project_url, Figshare, clear_cache
 
 class TestFigshareAPIWrapper(OsfTestCase):
 
@@ -22,3 +24,80 @@ class TestFigshareAPIWrapper(OsfTestCase):
         url = _get_project_url(self.node_settings, 123)
         expected = os.path.join(self.node_settings.api_url, 'projects', '123')
         assert_equal(url, expected)
+
+
+class TestFigshareClientCaching(OsfTestCase):
+
+    def setUp(self):
+        OsfTestCase.setUp(self)
+        clear_cache()
+        self.node = NodeFactory()
+        self.node.add_addon('figshare', auth=Auth(self.node.creator))
+        self.node.save()
+        self.node_settings = self.node.get_addon('figshare')
+        self.client = Figshare()
+        self.client.session = mock.Mock()
+
+    def tearDown(self):
+        OsfTestCase.tearDown(self)
+        clear_cache()
+
+    def _response(self, data, status_code=200):
+        return mock.Mock(status_code=status_code, json=mock.Mock(return_value=data))
+
+    def test_send_caches_successful_gets(self):
+        self.client.session.get.return_value = self._response({'id': 1})
+        assert_equal(self.client._send('http://figshare/articles/1'), {'id': 1})
+        assert_equal(self.client._send('http://figshare/articles/1'), {'id': 1})
+        assert_equal(self.client.session.get.call_count, 1)
+
+    def test_send_respects_cache_false(self):
+        self.client.session.get.return_value = self._response({'id': 1})
+        self.client._send('http://figshare/articles/1', cache=False)
+        self.client._send('http://figshare/articles/1', cache=False)
+        assert_equal(self.client.session.get.call_count, 2)
+
+    def test_send_does_not_cache_errors(self):
+        self.client.session.get.return_value = self._response({}, status_code=500)
+        assert_false(self.client._send('http://figshare/articles/1'))
+        assert_false(self.client._send('http://figshare/articles/1'))
+        assert_equal(self.client.session.get.call_count, 2)
+
+    @mock.patch('website.addons.figshare.api.time.time')
+    def test_send_cache_expires(self, mock_time):
+        mock_time.return_value = 1000
+        self.client.session.get.return_value = self._response({'id': 1})
+        self.client._send('http://figshare/articles/1')
+        mock_time.return_value = 1000 + figshare_settings.CACHE_TTL
+        self.client._send('http://figshare/articles/1')
+        assert_equal(self.client.session.get.call_count, 2)
+
+    def test_cached_responses_are_copies(self):
+        self.client.session.get.return_value = self._response({'id': 1})
+        self.client._send('http://figshare/articles/1')['id'] = 2
+        assert_equal(self.client._send('http://figshare/articles/1'), {'id': 1})
+
+    def test_clear_cache_by_owner(self):
+        self.client.session.get.return_value = self._response({'id': 1})
+        self.client._send('http://figshare/articles/1')
+        clear_cache('someone-else')
+        self.client._send('http://figshare/articles/1')
+        assert_equal(self.client.session.get.call_count, 1)
+        clear_cache(self.client.owner_token)
+        self.client._send('http://figshare/articles/1')
+        assert_equal(self.client.session.get.call_count, 2)
+
+    def test_project_fetches_articles_in_order(self):
+        def get(url, **kwargs):
+            if url.endswith('articles'):
+                return self._response([{'id': idx} for idx in range(20)])
+            if '/articles/' in url:
+                article_id = int(url.rsplit('/', 1)[1])
+                return self._response({'items': [{'article_id': article_id}]})
+            return self._response({'id': 'project'})
+        self.client.session.get.side_effect = get
+        project = self.client.project(self.node_settings, 'project')
+        assert_equal(
+            [article['article_id'] for article in project['articles']],
+            range(20),
+        )
@@ -88,7 +88,7 @@ class TestFileGuid(OsfTestCase):
 
         assert_equal(guid.name, 'Morty')
 
-    @mock.patch('website.addons.base.requests.get')
+    @mock.patch('website.addons.base.metadata_cache.fetch')
     def test_enrich_raises(self, mock_get):
         mock_response = mock.Mock(ok=True, status_code=200)
         mock_get.return_value = mock_response
@@ -108,7 +108,7 @@ class TestFileGuid(OsfTestCase):
 
         assert_equal(guid.name, 'Morty')
 
-    @mock.patch('website.addons.base.requests.get')
+    @mock.patch('website.addons.base.metadata_cache.fetch')
     def test_enrich_works(self, mock_get):
         mock_response = mock.Mock(ok=True, status_code=200)
         mock_get.return_value = mock_response
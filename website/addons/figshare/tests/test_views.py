@@ -282,6 +282,24 @@ class TestUtils(OsfTestCase):
         ref = views.hgrid.figshare_hgrid_data(self.node_settings, self.auth)
         assert_equal(ref, None)
 
+    @mock.patch('website.addons.figshare.api.Figshare.project')
+    def test_hgrid_fetch_reads_settings_up_front(self, project):
+        self.node_settings.figshare_type = 'project'
+        fetch = views.hgrid.figshare_hgrid_fetch(self.node_settings, self.auth)
+        assert_false(project.called)
+        fetch()
+        endpoint, figshare_id = project.call_args[0]
+        assert_equal(endpoint.api_url, self.node_settings.api_url)
+        assert_equal(figshare_id, self.node_settings.figshare_id)
+
+    @mock.patch('website.addons.figshare.api.Figshare.project')
+    def test_hgrid_data_uses_prefetched_item(self, project):
+        ref = views.hgrid.figshare_hgrid_data(
+            self.node_settings, self.auth, prefetched=None,
+        )
+        assert_equal(ref, None)
+        assert_false(project.called)
+
 
 class TestViewsAuth(OsfTestCase):
 
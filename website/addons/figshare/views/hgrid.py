@@ -4,12 +4,31 @@ from website.util import rubeus
 
 from ..api import Figshare
 
+
+class _Endpoint(object):
+    """Stands in for the node settings in requests made off the request
+    thread, which only read the API URL.
+    """
+    def __init__(self, api_url):
+        self.api_url = api_url
+
+
+def figshare_hgrid_fetch(node_settings, auth, **kwargs):
+    """Return a function fetching the linked figshare project or article."""
+    client = Figshare.from_settings(node_settings.user_settings)
+    endpoint = _Endpoint(node_settings.api_url)
+    figshare_id = node_settings.figshare_id
+    if node_settings.figshare_type == 'project':
+        return lambda: client.project(endpoint, figshare_id)
+    return lambda: client.article(endpoint, figshare_id)
+
+
 def figshare_hgrid_data(node_settings, auth, parent=None, **kwargs):
     node = node_settings.owner
-    if node_settings.figshare_type == 'project':
-        item = Figshare.from_settings(node_settings.user_settings).project(node_settings, node_settings.figshare_id)
+    if 'prefetched' in kwargs:
+        item = kwargs['prefetched']
     else:
-        item = Figshare.from_settings(node_settings.user_settings).article(node_settings, node_settings.figshare_id)
+        item = figshare_hgrid_fetch(node_settings, auth)()
     if not node_settings.figshare_id or not node_settings.has_auth or not item:
         return
     #TODO Test me
@@ -1,12 +1,13 @@
 import os
 
-from . import routes, views, model
+from . import routes, views, model, cache
 
 MODELS = [
     model.AddonGitHubUserSettings,
     model.AddonGitHubNodeSettings,
     model.GithubGuidFile,
     model.AddonGitHubOauthSettings,
+    cache.GithubCachedResponse,
 ]
 USER_SETTINGS_MODEL = model.AddonGitHubUserSettings
 NODE_SETTINGS_MODEL = model.AddonGitHubNodeSettings
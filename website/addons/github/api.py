@@ -5,12 +5,11 @@ import github3
 import cachecontrol
 from requests.adapters import HTTPAdapter
 
+from website.addons.github import cache
 from website.addons.github import settings as github_settings
 from website.addons.github.exceptions import NotFoundError
 
 
-# Initialize caches
-https_cache = cachecontrol.CacheControlAdapter()
 default_adapter = HTTPAdapter()
 
 
@@ -27,8 +26,14 @@ class GitHub(object):
         else:
             self.gh3 = github3.GitHub()
 
-        # Caching libary
+        self.gh3._session.hooks['response'].append(cache.record_rate_limit)
+
+        # Caching libary; responses are shared across workers through Mongo
         if github_settings.CACHE:
+            https_cache = cachecontrol.CacheControlAdapter(
+                cache=cache.MongoCache(cache.token_namespace(access_token)),
+                cache_etags=True,
+            )
             self.gh3._session.mount('https://api.github.com/user', default_adapter)
             self.gh3._session.mount('https://', https_cache)
 
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Mongo-backed HTTP cache for GitHub API responses, shared by all workers.
+
+Responses are stored by `cachecontrol` together with their ETags; once stale,
+they are revalidated with `If-None-Match`, and GitHub does not count the
+resulting 304s against the rate limit. Entries are namespaced by a hash of
+the access token, since GitHub varies responses on `Authorization`.
+"""
+import re
+import base64
+import hashlib
+import datetime
+
+import pymongo
+from modularodm import Q
+from modularodm import fields
+from modularodm.storage.base import KeyExistsException
+from cachecontrol.cache import BaseCache
+
+from framework.mongo import StoredObject
+
+from website.util import metrics
+from website.addons.github import settings as github_settings
+
+
+REPO_URL_PATTERN = re.compile(r'^https://api\.github\.com/repos/([^/]+/[^/?#]+)', re.I)
+
+
+def repo_key(user, repo):
+    return '{0}/{1}'.format(user, repo).lower()
+
+
+def repo_key_from_url(url):
+    match = REPO_URL_PATTERN.match(url)
+    return match.group(1).lower() if match else None
+
+
+class GithubCachedResponse(StoredObject):
+    """A serialized GitHub API response; expired by Mongo after
+    `github_settings.CACHE_EXPIRY` seconds without an update.
+    """
+    __indices__ = [
+        {
+            'key_or_list': [('date_modified', pymongo.ASCENDING)],
+            'expireAfterSeconds': github_settings.CACHE_EXPIRY,
+        }
+    ]
+
+    _id = fields.StringField(primary=True)
+    repo = fields.StringField(index=True)
+    data = fields.StringField()
+    date_modified = fields.DateTimeField(auto_now=datetime.datetime.utcnow)
+
+
+class MongoCache(BaseCache):
+    """`cachecontrol` cache storing responses in `GithubCachedResponse`.
+
+    :param str namespace: Prefix for cache keys, e.g. a hash of the access
+        token the responses were fetched with
+    """
+
+    def __init__(self, namespace=''):
+        self.namespace = namespace
+
+    def _key(self, key):
+        return '{0}:{1}'.format(self.namespace, key)
+
+    def get(self, key):
+        entry = GithubCachedResponse.load(self._key(key))
+        if entry is None:
+            metrics.increment('github.cache.miss')
+            return None
+        metrics.increment('github.cache.hit')
+        return base64.b64decode(entry.data)
+
+    def set(self, key, value):
+        entry = GithubCachedResponse.load(self._key(key))
+        if entry is None:
+            entry = GithubCachedResponse(_id=self._key(key), repo=repo_key_from_url(key))
+        entry.data = base64.b64encode(value)
+        try:
+            entry.save()
+        except KeyExistsException:
+            # Another worker cached the same response first
+            pass
+
+    def delete(self, key):
+        GithubCachedResponse.remove(Q('_id', 'eq', self._key(key)))
+
+
+def token_namespace(access_token):
+    if not access_token:
+        return 'anonymous'
+    return hashlib.sha1(access_token).hexdigest()
+
+
+def invalidate_repo(user, repo):
+    """Drop every cached response about a repo, for all tokens."""
+    GithubCachedResponse.remove(Q('repo', 'eq', repo_key(user, repo)))
+
+
+def record_rate_limit(response, *args, **kwargs):
+    """`requests` response hook recording GitHub's remaining rate limit.
+    Responses served from or revalidated against the cache are counted
+    separately, since they do not use up the limit.
+    """
+    if getattr(response, 'from_cache', False):
+        metrics.increment('github.api.cached')
+    else:
+        metrics.increment('github.api.requests')
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    if remaining is not None:
+        metrics.set_gauge('github.rate_limit.remaining', int(remaining))
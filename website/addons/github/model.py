@@ -63,6 +63,11 @@ class GithubGuidFile(GuidFile):
     def unique_identifier(self):
         return self._metadata_cache['extra']['fileSha']
 
+    @property
+    def revision_is_immutable(self):
+        # Commit SHAs are immutable; branch names are not
+        return bool(self.revision and utils.COMMIT_SHA_PATTERN.match(self.revision))
+
     @property
     def name(self):
         return os.path.split(self.path)[1]
@@ -15,4 +15,7 @@ HOOK_CONTENT_TYPE = 'json'
 # Max render size in bytes; no max if None
 MAX_RENDER_SIZE = None
 
+# Cache API responses in Mongo and revalidate them with their ETags
 CACHE = False
+# Seconds after which an unused cached response is dropped
+CACHE_EXPIRY = 60 * 60 * 24
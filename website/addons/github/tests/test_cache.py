@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import mock
+from nose.tools import *  # noqa
+
+from tests.base import OsfTestCase
+
+from website.util import metrics
+from website.addons.github import cache
+
+
+class TestMongoCache(OsfTestCase):
+
+    def setUp(self):
+        super(TestMongoCache, self).setUp()
+        self.url = 'https://api.github.com/repos/Fred/Rain/branches'
+        self.cache = cache.MongoCache(cache.token_namespace('secret'))
+
+    def test_set_get(self):
+        self.cache.set(self.url, b'\x00cached')
+        assert_equal(self.cache.get(self.url), b'\x00cached')
+
+    def test_namespaces_are_separate(self):
+        self.cache.set(self.url, 'cached')
+        other = cache.MongoCache(cache.token_namespace('other'))
+        assert_is_none(other.get(self.url))
+
+    def test_set_records_repo(self):
+        self.cache.set(self.url, 'cached')
+        entry = cache.GithubCachedResponse.load(self.cache._key(self.url))
+        assert_equal(entry.repo, 'fred/rain')
+
+    def test_delete(self):
+        self.cache.set(self.url, 'cached')
+        self.cache.delete(self.url)
+        assert_is_none(self.cache.get(self.url))
+
+    def test_invalidate_repo(self):
+        self.cache.set(self.url, 'cached')
+        cache.invalidate_repo('fred', 'rain')
+        assert_is_none(self.cache.get(self.url))
+
+    def test_repo_key_from_url(self):
+        assert_equal(cache.repo_key_from_url(self.url), 'fred/rain')
+        assert_equal(cache.repo_key_from_url('https://api.github.com/repos/fred/rain?page=2'), 'fred/rain')
+        assert_is_none(cache.repo_key_from_url('https://api.github.com/user/repos'))
+
+
+class TestRateLimitMetrics(OsfTestCase):
+
+    def setUp(self):
+        super(TestRateLimitMetrics, self).setUp()
+        metrics.reset()
+
+    def tearDown(self):
+        super(TestRateLimitMetrics, self).tearDown()
+        metrics.reset()
+
+    def test_records_remaining(self):
+        response = mock.Mock(from_cache=False, headers={'X-RateLimit-Remaining': '4999'})
+        cache.record_rate_limit(response)
+        assert_equal(metrics.gauges['github.rate_limit.remaining'], 4999)
+        assert_equal(metrics.counters['github.api.requests'], 1)
+
+    def test_counts_cached_responses(self):
+        response = mock.Mock(from_cache=True, headers={})
+        cache.record_rate_limit(response)
+        assert_equal(metrics.counters['github.api.cached'], 1)
+        assert_not_in('github.rate_limit.remaining', metrics.gauges)
@@ -13,7 +13,7 @@ from framework.exceptions import HTTPError
 from framework.auth import Auth
 
 from website.util import api_url_for
-from website.addons.github import views, utils
+from website.addons.github import views, utils, cache
 from website.addons.github.utils import check_permissions
 from website.addons.github.tests.utils import create_mock_github
 
@@ -350,6 +350,19 @@ class TestGithubViews(OsfTestCase):
         self.project.reload()
         assert_not_equal(self.project.logs[-1].action, "github_file_removed")
 
+    @mock.patch('website.addons.github.views.hooks.utils.verify_hook_signature')
+    def test_hook_callback_invalidates_cache(self, mock_verify):
+        repo_url = 'https://api.github.com/repos/{0}/{1}'.format(
+            self.node_settings.user, self.node_settings.repo,
+        )
+        mongo_cache = cache.MongoCache('token')
+        mongo_cache.set(repo_url + '/branches', 'branches')
+        mongo_cache.set('https://api.github.com/repos/other/repo', 'other')
+        url = "/api/v1/project/{0}/github/hook/".format(self.project._id)
+        self.app.post_json(url, {"test": True, "commits": []}, content_type="application/json")
+        assert_is_none(mongo_cache.get(repo_url + '/branches'))
+        assert_equal(mongo_cache.get('https://api.github.com/repos/other/repo'), 'other')
+
 
 class TestRegistrationsWithGithub(OsfTestCase):
 
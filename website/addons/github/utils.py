@@ -1,3 +1,4 @@
+import re
 import hmac
 import uuid
 import urllib
@@ -17,6 +18,9 @@ MESSAGES = {
     'delete': 'Deleted {0}'.format(MESSAGE_BASE),
 }
 
+# Full 40-character commit SHAs; abbreviated SHAs may become ambiguous
+COMMIT_SHA_PATTERN = re.compile(r'^[0-9a-f]{40}$')
+
 
 def make_hook_secret():
     return str(uuid.uuid4()).replace('-', '')
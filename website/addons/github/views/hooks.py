@@ -10,6 +10,7 @@ from website.project.decorators import must_be_valid_project
 from website.project.decorators import must_not_be_registration
 from website.project.decorators import must_have_addon
 
+from website.addons.github import cache
 from website.addons.github import utils
 
 
@@ -79,6 +80,9 @@ def github_hook_callback(node_addon, **kwargs):
 
     node = kwargs['node'] or kwargs['project']
 
+    # Branches and contents may have changed; drop cached API responses
+    cache.invalidate_repo(node_addon.user, node_addon.repo)
+
     payload = request.json
 
     for commit in payload.get('commits', []):
@@ -18,7 +18,6 @@ from website.addons.base import exceptions
 from website.addons.base import AddonUserSettingsBase, AddonNodeSettingsBase, GuidFile
 
 from website.addons.googledrive.client import GoogleAuthClient
-from website.addons.googledrive import settings as drive_settings
 from website.addons.googledrive.utils import GoogleDriveNodeLogger
 
 
@@ -149,9 +148,15 @@ class GoogleDriveOAuthSettings(StoredObject):
             GoogleDriveOAuthSettings.remove_one(self)
 
     def _needs_refresh(self):
+        """Whether the access token has expired. Tokens about to expire are
+        refreshed ahead of time by ``scripts/refresh_oauth_tokens.py``.
+        """
+        return self.expires_within(0)
+
+    def expires_within(self, seconds):
         if self.expires_at is None:
             return False
-        return (self.expires_at - datetime.utcnow()).total_seconds() < drive_settings.REFRESH_TIME
+        return (self.expires_at - datetime.utcnow()).total_seconds() <= seconds
 
 
 class GoogleDriveUserSettings(AddonUserSettingsBase):
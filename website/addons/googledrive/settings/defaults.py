@@ -3,8 +3,6 @@
 CLIENT_ID = 'chaneme'
 CLIENT_SECRET = 'changeme'
 
-REFRESH_TIME = 5 * 60  # 5 minutes
-
 # Check https://developers.google.com/drive/scopes for all available scopes
 OAUTH_SCOPE = [
     'https://www.googleapis.com/auth/userinfo.profile',
@@ -65,7 +65,7 @@ class TestFileGuid(OsfTestCase):
         assert_equals(guid.path, '/baz/foo/bar')
         assert_equals(guid.waterbutler_path, '/foo/bar')
 
-    @mock.patch('website.addons.base.requests.get')
+    @mock.patch('website.addons.base.metadata_cache.fetch')
     def test_unique_identifier(self, mock_get):
         mock_response = mock.Mock(ok=True, status_code=200)
         mock_get.return_value = mock_response
@@ -183,23 +183,19 @@ class TestGoogleDriveUserSettingsModel(OsfTestCase):
             'expires_at': time.time(),
         }
         user_settings = GoogleDriveUserSettingsFactory()
-        user_settings.expires_at = (datetime.utcnow() + relativedelta.relativedelta(seconds=5))
+        user_settings.expires_at = (datetime.utcnow() - relativedelta.relativedelta(seconds=5))
 
         user_settings.access_token
 
         mock_refresh.assert_called_once()
 
     @mock.patch.object(GoogleAuthClient, 'refresh')
-    def test_access_token_refreshes_timeout_longer(self, mock_refresh):
-        mock_refresh.return_value = {
-            'access_token': 'abc',
-            'refresh_token': '123',
-            'expires_at': time.time(),
-        }
+    def test_access_token_doesnt_refresh_before_expiry(self, mock_refresh):
+        # Tokens close to expiry are refreshed by scripts/refresh_oauth_tokens.py
         user_settings = GoogleDriveUserSettingsFactory()
         user_settings.expires_at = datetime.utcnow() + relativedelta.relativedelta(minutes=4)
         user_settings.access_token
-        mock_refresh.assert_called_once()
+        assert_false(mock_refresh.called)
 
     @mock.patch.object(GoogleAuthClient, 'refresh')
     def test_access_token_doesnt_refresh(self, mock_refresh):
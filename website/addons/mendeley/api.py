@@ -4,5 +4,7 @@ from mendeley.session import MendeleySession
 class APISession(MendeleySession):
 
     def request(self, *args, **kwargs):
-        kwargs['params'] = {'view': 'all'}
+        params = dict(kwargs.get('params') or {})
+        params['view'] = 'all'
+        kwargs['params'] = params
         return super(APISession, self).request(*args, **kwargs)
\ No newline at end of file
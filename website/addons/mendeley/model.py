@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import time
+import datetime
 
 import mendeley
 from modularodm import fields
 
 from website.addons.base import AddonOAuthNodeSettingsBase
 from website.addons.base import AddonOAuthUserSettingsBase
+from website.addons.citations import library
 from website.addons.citations.utils import serialize_folder
 from website.addons.mendeley import serializer
 from website.addons.mendeley import settings
@@ -24,6 +26,7 @@ class Mendeley(ExternalProvider):
 
     auth_url_base = 'https://api.mendeley.com/oauth/authorize'
     callback_url = 'https://api.mendeley.com/oauth/token'
+    auto_refresh_url = callback_url
     default_scopes = ['all']
 
     _client = None
@@ -64,6 +67,7 @@ class Mendeley(ExternalProvider):
     def client(self):
         """An API session with Mendeley"""
         if not self._client:
+            self.refresh_oauth_key()
             self._client = self._get_client({
                 'access_token': self.account.oauth_key,
                 'refresh_token': self.account.refresh_token,
@@ -75,7 +79,7 @@ class Mendeley(ExternalProvider):
     def citation_lists(self, extract_folder):
         """List of CitationList objects, derived from Mendeley folders"""
 
-        folders = self._get_folders()
+        folders = library.get_library(self).folders
         # TODO: Verify OAuth access to each folder
         all_documents = serialize_folder(
             'All Documents',
@@ -93,39 +97,54 @@ class Mendeley(ExternalProvider):
         :param str list_id: ID for a Mendeley folder. Optional.
         :return CitationList: CitationList for the folder, or for all documents
         """
-        if list_id == 'ROOT':
-            folder = None
-        else:
-            folder = self.client.folders.get(list_id)
-
-        if folder:
-            return self._citations_for_mendeley_folder(folder)
-        return self._citations_for_mendeley_user()
+        return library.get_citations(self, list_id)
 
     def _folder_metadata(self, folder_id):
         folder = self.client.folders.get(folder_id)
         return folder
 
-    def _citations_for_mendeley_folder(self, folder):
+    # Citation library sync; see ``website.addons.citations.library``
 
-        document_ids = [
-            document.id
-            for document in folder.documents.iter(page_size=500)
+    def _fetch_folders(self):
+        return [
+            dict(folder.json, name=folder.name)
+            for folder in self._get_folders()
         ]
-        citations = {
-            citation['id']: citation
-            for citation in self._citations_for_mendeley_user()
-        }
-        return map(lambda id: citations[id], document_ids)
 
-    def _citations_for_mendeley_user(self):
+    def _folder_key(self, folder):
+        return folder['id']
 
-        documents = self.client.documents.iter(page_size=500)
-        return [
-            self._citation_for_mendeley_document(document)
+    def _fetch_changes(self, cursor):
+        # Allow for clock skew between the OSF and Mendeley
+        started = datetime.datetime.utcnow() - datetime.timedelta(minutes=5)
+        new_cursor = started.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+        if cursor is None:
+            documents = self.client.documents.iter(page_size=500)
+            deleted_ids = []
+        else:
+            documents = self.client.documents.iter(page_size=500, modified_since=cursor)
+            deleted_ids = [
+                document.id
+                for document in self.client.documents.iter(page_size=500, deleted_since=cursor)
+            ]
+
+        changes = (
+            (document.id, document.json.get('last_modified'), document)
             for document in documents
+        )
+        return new_cursor, changes, deleted_ids
+
+    def _fetch_folder_document_ids(self, folder_id):
+        folder = self.client.folders.get(folder_id)
+        return [
+            document.id
+            for document in folder.documents.iter(page_size=500)
         ]
 
+    def _citation_for_document(self, document):
+        return self._citation_for_mendeley_document(document)
+
     def _citation_for_mendeley_document(self, document):
         """Mendeley document to ``website.citations.models.Citation``
         :param BaseDocument document:
@@ -20,10 +20,10 @@ class MendeleyCitationsProvider(CitationsProvider):
 
     def _folder_to_dict(self, data):
         return dict(
-            name=data.name,
-            list_id=data.json['id'],
-            parent_id=data.json.get('parent_id'),
-            id=data.json.get('id'),
+            name=data['name'],
+            list_id=data['id'],
+            parent_id=data.get('parent_id'),
+            id=data.get('id'),
         )
 
     def _folder_id(self, node_addon):
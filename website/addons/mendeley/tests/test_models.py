@@ -48,14 +48,16 @@ class MendeleyProviderTestCase(OsfTestCase):
         assert_equal(res.get('provider_id'), 'testid')
         assert_equal(res.get('display_name'), 'testdisplay')
 
+    @mock.patch('website.addons.mendeley.model.Mendeley.refresh_oauth_key')
     @mock.patch('website.addons.mendeley.model.Mendeley._get_client')
-    def test_client_not_cached(self, mock_get_client):
-        # The first call to .client returns a new client
+    def test_client_not_cached(self, mock_get_client, mock_refresh):
+        # The first call to .client returns a new client, refreshing the
+        # access token first if it has expired
         mock_account = mock.Mock()
         mock_account.expires_at = datetime.datetime.now()
         self.provider.account = mock_account
         self.provider.client
-        mock_get_client.assert_called
+        mock_refresh.assert_called_once_with()
         assert_true(mock_get_client.called)
 
     @mock.patch('website.addons.mendeley.model.Mendeley._get_client')
@@ -72,9 +74,9 @@ class MendeleyProviderTestCase(OsfTestCase):
         mock_list = mock.Mock()
         mock_list.items = mock_folders
         mock_client.folders.list.return_value = mock_list
+        mock_client.documents.iter.return_value = []
         self.provider._client = mock_client
-        mock_account = mock.Mock()
-        self.provider.account = mock_account
+        self.provider.account = MendeleyAccountFactory()
         res = self.provider.citation_lists(MendeleyCitationsProvider()._extract_folder)
         assert_equal(res[1]['name'], mock_folders[0].name)
         assert_equal(res[1]['id'], mock_folders[0].json['id'])
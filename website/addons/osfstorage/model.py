@@ -264,15 +264,18 @@ class OsfStorageFileNode(StoredObject):
             child.save()
         return child
 
+    def get_download_page(self, version=None):
+        """Key of the analytics counter of downloads of this file."""
+        parts = ['download', self.node._id, self._id]
+        if version is not None:
+            parts.append(version)
+        return ':'.join([format(part) for part in parts])
+
     def get_download_count(self, version=None):
         if self.is_folder:
             return None
 
-        parts = ['download', self.node._id, self._id]
-        if version is not None:
-            parts.append(version)
-        page = ':'.join([format(part) for part in parts])
-        _, count = get_basic_counters(page)
+        _, count = get_basic_counters(self.get_download_page(version))
 
         return count or 0
 
@@ -461,6 +464,11 @@ class OsfStorageGuidFile(GuidFile):
     def unique_identifier(self):
         return self._metadata_cache['extra']['version']
 
+    @property
+    def revision_is_immutable(self):
+        # Stored versions are never rewritten
+        return self.revision is not None
+
     @property
     def file_url(self):
         return os.path.join('osfstorage', 'files', self.path.lstrip('/'))
@@ -40,6 +40,17 @@ class AddonWikiNodeSettings(AddonNodeSettingsBase):
             clone.save()
         return clone, None
 
+    def after_delete(self, node, user):
+        """Send connected editors of every page away from the deleted node."""
+        wiki_utils.batch_broadcast_to_sharejs([
+            {
+                'action': 'delete',
+                'sharejs_uuid': wiki_utils.get_sharejs_uuid(node, wiki_name),
+                'node': node,
+            }
+            for wiki_name in node.wiki_private_uuids
+        ])
+
     def to_json(self, user):
         return {}
 
@@ -47,8 +58,7 @@ class AddonWikiNodeSettings(AddonNodeSettingsBase):
 @write_permissions_revoked.connect
 def subscribe_on_write_permissions_revoked(node):
     # Migrate every page on the node
-    for wiki_name in node.wiki_private_uuids:
-        wiki_utils.migrate_uuid(node, wiki_name)
+    wiki_utils.migrate_uuids(node, node.wiki_private_uuids.keys())
 
 
 def build_wiki_url(node, label, base, end):
@@ -5,5 +5,10 @@ SHAREJS_HOST = 'localhost'
 SHAREJS_PORT = 7007
 SHAREJS_URL = '{}:{}'.format(SHAREJS_HOST, SHAREJS_PORT)
 
+# Connection pooling for the sharejs db and broadcast server
+SHAREJS_DB_POOL_SIZE = 10
+SHAREJS_HTTP_POOL_SIZE = 10
+SHAREJS_BROADCAST_TIMEOUT = 5  # seconds
+
 # TODO: Change to release date for wiki change
 WIKI_CHANGE_DATE = datetime.datetime.utcfromtimestamp(1423760098)
\ No newline at end of file
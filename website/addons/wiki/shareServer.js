@@ -241,6 +241,35 @@ app.post('/delete/:id/:redirect', function (req, res, next) {
     res.send(util.format('%s was deleted and redirected to %s', req.params.id, req.params.redirect));
 });
 
+// Apply several lock/unlock/redirect/delete actions in one request
+app.post('/batch', jsonParser, function (req, res, next) {
+    var messages = req.body || [];
+    messages.forEach(function (message) {
+        switch (message.action) {
+            case 'lock':
+                locked[message.id] = true;
+                wss.broadcast(message.id, JSON.stringify({type: 'lock'}));
+                break;
+            case 'unlock':
+                delete locked[message.id];
+                wss.broadcast(message.id, JSON.stringify({
+                    type: 'unlock',
+                    contributors: message.data // Contributors with write permission
+                }));
+                break;
+            case 'redirect':
+            case 'delete':
+                wss.broadcast(message.id, JSON.stringify({
+                    type: message.action,
+                    redirect: message.redirect
+                }));
+                break;
+        }
+    });
+    console.info('[Batch] %d actions applied', messages.length);
+    res.send(util.format('%d actions applied.', messages.length));
+});
+
 server.listen(settings.port, settings.host, function() {
     console.log('Server running at http://%s:%s', settings.host, settings.port);
 });
\ No newline at end of file
@@ -3,6 +3,7 @@
 # PEP8 asserts
 from copy import deepcopy
 import httplib as http
+import urllib
 
 import mock
 import time
@@ -22,7 +23,8 @@ from website.addons.wiki.views import _serialize_wiki_toc, _get_wiki_web_urls, _
 from website.addons.wiki.model import NodeWikiPage, render_content
 from website.addons.wiki.utils import (
     get_sharejs_uuid, generate_private_uuid, share_db, delete_share_doc,
-    migrate_uuid, format_wiki_version,
+    migrate_uuid, migrate_uuids, format_wiki_version, share_session,
+    batch_broadcast_to_sharejs, broadcast_to_sharejs,
 )
 from website.addons.wiki.tests.config import EXAMPLE_DOCS, EXAMPLE_OPS
 from framework.auth import Auth
@@ -957,6 +959,24 @@ class TestWikiShareJSMongo(OsfTestCase):
         assert_is_none(self.db.docs.find_one({'_id': sharejs_uuid}))
         assert_is_none(self.db.docs_ops.find_one({'name': sharejs_uuid}))
 
+    @mock.patch('website.addons.wiki.utils.batch_broadcast_to_sharejs')
+    def test_migrate_uuids(self, mock_batch):
+        migrate_uuids(self.project, [self.wname])
+        new_sharejs_uuid = get_sharejs_uuid(self.project, self.wname)
+        assert_not_equal(self.sharejs_uuid, new_sharejs_uuid)
+        assert_is_none(self.db.docs.find_one({'_id': self.sharejs_uuid}))
+        assert_equal(
+            EXAMPLE_DOCS[0]['_data'],
+            self.db.docs.find_one({'_id': new_sharejs_uuid})['_data']
+        )
+        # One batched lock and one batched unlock
+        assert_equal(mock_batch.call_count, 2)
+        lock_messages = mock_batch.call_args_list[0][0][0]
+        assert_equal(lock_messages, [{'action': 'lock', 'sharejs_uuid': self.sharejs_uuid}])
+
+    def test_share_db_reuses_client(self):
+        assert_is(share_db().connection, share_db().connection)
+
     @mock.patch('website.addons.wiki.utils.broadcast_to_sharejs')
     def test_migrate_uuid_updates_node(self, mock_sharejs):
         migrate_uuid(self.project, self.wname)
@@ -979,7 +999,6 @@ class TestWikiShareJSMongo(OsfTestCase):
                 {'id': self.user._id, 'permission': 'admin', 'visible': True},
             ],
             auth=Auth(user=self.user),
-            save=True,
         )
         assert_equal(self.private_uuid, self.project.wiki_private_uuids[self.wkey])
         # Removing write permission migrates uuid
@@ -989,7 +1008,6 @@ class TestWikiShareJSMongo(OsfTestCase):
                 {'id': self.user._id, 'permission': 'admin', 'visible': True},
             ],
             auth=Auth(user=self.user),
-            save=True,
         )
         assert_not_equal(self.private_uuid, self.project.wiki_private_uuids[self.wkey])
 
@@ -1081,6 +1099,49 @@ class TestWikiUtils(OsfTestCase):
         assert_not_equal(share_uuid, new_uuid)
         assert_equal(self.project.wiki_private_uuids[wkey], new_uuid)
 
+    def test_share_session_is_reused(self):
+        assert_is(share_session(), share_session())
+
+    @mock.patch('website.addons.wiki.utils.share_session')
+    def test_batch_broadcast_sends_single_request(self, mock_session):
+        generate_private_uuid(self.project, 'foo')
+        generate_private_uuid(self.project, 'bar')
+        batch_broadcast_to_sharejs([
+            {'action': 'lock', 'sharejs_uuid': get_sharejs_uuid(self.project, 'foo')},
+            {
+                'action': 'delete',
+                'sharejs_uuid': get_sharejs_uuid(self.project, 'bar'),
+                'node': self.project,
+            },
+        ])
+        assert_equal(mock_session.return_value.post.call_count, 1)
+        url = mock_session.return_value.post.call_args[0][0]
+        payload = mock_session.return_value.post.call_args[1]['json']
+        assert_true(url.endswith('/batch/'))
+        assert_equal([item['action'] for item in payload], ['lock', 'delete'])
+        # Sent unquoted; only the path-parameter routes need it quoted
+        assert_equal(
+            payload[1]['redirect'],
+            self.project.web_url_for('project_wiki_view', wname='home', _guid=True),
+        )
+        assert_not_in('redirect', payload[0])
+
+    @mock.patch('website.addons.wiki.utils.share_session')
+    def test_broadcast_quotes_redirect_in_path(self, mock_session):
+        generate_private_uuid(self.project, 'foo')
+        sharejs_uuid = get_sharejs_uuid(self.project, 'foo')
+        broadcast_to_sharejs('redirect', sharejs_uuid, node=self.project, wiki_name='foo')
+        url = mock_session.return_value.post.call_args[0][0]
+        redirect = self.project.web_url_for('project_wiki_view', wname='foo', _guid=True)
+        assert_true(url.endswith('/redirect/{0}/{1}'.format(
+            sharejs_uuid, urllib.quote(redirect, safe=''),
+        )))
+
+    @mock.patch('website.addons.wiki.utils.share_session')
+    def test_batch_broadcast_no_messages(self, mock_session):
+        batch_broadcast_to_sharejs([])
+        assert_false(mock_session.return_value.post.called)
+
     def test_format_wiki_version(self):
         assert_is_none(format_wiki_version(None, 5, False))
         assert_is_none(format_wiki_version('', 5, False))
@@ -5,6 +5,7 @@ import uuid
 
 from pymongo import MongoClient
 import requests
+from requests.adapters import HTTPAdapter
 
 from framework.mongo.utils import to_mongo_key
 
@@ -54,17 +55,14 @@ def delete_share_doc(node, wname):
     node.save()
 
 
-def migrate_uuid(node, wname):
-    """Migrates uuid to new namespace."""
-
-    db = share_db()
-    old_sharejs_uuid = get_sharejs_uuid(node, wname)
-
-    broadcast_to_sharejs('lock', old_sharejs_uuid)
+def _write_contributor_ids(node):
+    return [
+        user._id for user in node.contributors
+        if node.has_permission(user, 'write')
+    ]
 
-    generate_private_uuid(node, wname)
-    new_sharejs_uuid = get_sharejs_uuid(node, wname)
 
+def _move_share_doc(db, old_sharejs_uuid, new_sharejs_uuid):
     doc_item = db['docs'].find_one({'_id': old_sharejs_uuid})
     if doc_item:
         doc_item['_id'] = new_sharejs_uuid
@@ -79,17 +77,87 @@ def migrate_uuid(node, wname):
         db['docs_ops'].insert(ops_items)
         db['docs_ops'].remove({'name': old_sharejs_uuid})
 
-    write_contributors = [
-        user._id for user in node.contributors
-        if node.has_permission(user, 'write')
-    ]
-    broadcast_to_sharejs('unlock', old_sharejs_uuid, data=write_contributors)
+
+def migrate_uuid(node, wname):
+    """Migrates uuid to new namespace."""
+
+    db = share_db()
+    old_sharejs_uuid = get_sharejs_uuid(node, wname)
+
+    broadcast_to_sharejs('lock', old_sharejs_uuid)
+
+    generate_private_uuid(node, wname)
+    new_sharejs_uuid = get_sharejs_uuid(node, wname)
+
+    _move_share_doc(db, old_sharejs_uuid, new_sharejs_uuid)
+
+    broadcast_to_sharejs('unlock', old_sharejs_uuid, data=_write_contributor_ids(node))
+
+
+def migrate_uuids(node, wnames):
+    """Migrates the uuids of several pages on a node to new namespaces, locking
+    and unlocking all of them with one batched broadcast each.
+    """
+    wnames = list(wnames)
+    if not wnames:
+        return
+
+    db = share_db()
+    old_sharejs_uuids = [get_sharejs_uuid(node, wname) for wname in wnames]
+
+    batch_broadcast_to_sharejs([
+        {'action': 'lock', 'sharejs_uuid': sharejs_uuid}
+        for sharejs_uuid in old_sharejs_uuids
+    ])
+
+    for wname, old_sharejs_uuid in zip(wnames, old_sharejs_uuids):
+        generate_private_uuid(node, wname)
+        _move_share_doc(db, old_sharejs_uuid, get_sharejs_uuid(node, wname))
+
+    write_contributors = _write_contributor_ids(node)
+    batch_broadcast_to_sharejs([
+        {'action': 'unlock', 'sharejs_uuid': sharejs_uuid, 'data': write_contributors}
+        for sharejs_uuid in old_sharejs_uuids
+    ])
+
+
+# Process-wide ShareJS clients; created lazily so that importing this module
+# does not open connections
+_sharejs_client = None
+_sharejs_session = None
+
+
+def share_client():
+    """Return the pooled Mongo client for the sharejs db, creating it on first
+    use. pymongo clients are thread-safe and maintain their own connection pool.
+    """
+    global _sharejs_client
+    if _sharejs_client is None:
+        _sharejs_client = MongoClient(
+            settings.DB_HOST,
+            settings.DB_PORT,
+            max_pool_size=wiki_settings.SHAREJS_DB_POOL_SIZE,
+        )
+    return _sharejs_client
 
 
 def share_db():
-    """Generate db client for sharejs db"""
-    client = MongoClient(settings.DB_HOST, settings.DB_PORT)
-    return client[wiki_settings.SHAREJS_DB_NAME]
+    """Return the sharejs db from the shared client"""
+    return share_client()[wiki_settings.SHAREJS_DB_NAME]
+
+
+def share_session():
+    """Return the keep-alive HTTP session used for broadcasting to sharejs."""
+    global _sharejs_session
+    if _sharejs_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=wiki_settings.SHAREJS_HTTP_POOL_SIZE,
+        )
+        session.mount('http://', adapter)
+        _sharejs_session = session
+    return _sharejs_session
 
 
 def get_sharejs_content(node, wname):
@@ -100,6 +168,29 @@ def get_sharejs_content(node, wname):
     return doc_item['_data'] if doc_item else ''
 
 
+def _sharejs_url(path):
+    return 'http://{host}:{port}/{path}'.format(
+        host=wiki_settings.SHAREJS_HOST,
+        port=wiki_settings.SHAREJS_PORT,
+        path=path,
+    )
+
+
+def _sharejs_redirect(node, wiki_name):
+    return node.web_url_for('project_wiki_view', wname=wiki_name, _guid=True)
+
+
+def _post_to_sharejs(url, data):
+    try:
+        share_session().post(
+            url,
+            json=data,
+            timeout=wiki_settings.SHAREJS_BROADCAST_TIMEOUT,
+        )
+    except (requests.ConnectionError, requests.Timeout):
+        pass    # Assume sharejs is not online
+
+
 def broadcast_to_sharejs(action, sharejs_uuid, node=None, wiki_name='home', data=None):
     """
     Broadcast an action to all documents connected to a wiki.
@@ -108,24 +199,39 @@ def broadcast_to_sharejs(action, sharejs_uuid, node=None, wiki_name='home', data
     'unlock' requires data to be a list of contributors with write permission
     """
 
-    url = 'http://{host}:{port}/{action}/{id}/'.format(
-        host=wiki_settings.SHAREJS_HOST,
-        port=wiki_settings.SHAREJS_PORT,
-        action=action,
-        id=sharejs_uuid
-    )
+    url = _sharejs_url('{action}/{id}/'.format(action=action, id=sharejs_uuid))
 
     if action == 'redirect' or action == 'delete':
-        redirect_url = urllib.quote(
-            node.web_url_for('project_wiki_view', wname=wiki_name, _guid=True),
-            safe='',
-        )
-        url = os.path.join(url, redirect_url)
+        # Quoted as a single path segment; sharejs decodes it
+        url = os.path.join(url, urllib.quote(_sharejs_redirect(node, wiki_name), safe=''))
 
-    try:
-        requests.post(url, json=data)
-    except requests.ConnectionError:
-        pass    # Assume sharejs is not online
+    _post_to_sharejs(url, data)
+
+
+def batch_broadcast_to_sharejs(messages):
+    """
+    Broadcast several actions to sharejs in a single request. Each message is a
+    dict with the same keys as the arguments of `broadcast_to_sharejs`:
+    'action', 'sharejs_uuid' and optionally 'node', 'wiki_name' and 'data'.
+    """
+
+    payload = []
+    for message in messages:
+        action = message['action']
+        item = {
+            'action': action,
+            'id': message['sharejs_uuid'],
+            'data': message.get('data'),
+        }
+        if action == 'redirect' or action == 'delete':
+            item['redirect'] = _sharejs_redirect(
+                message['node'],
+                message.get('wiki_name', 'home'),
+            )
+        payload.append(item)
+
+    if payload:
+        _post_to_sharejs(_sharejs_url('batch/'), payload)
 
 
 def format_wiki_version(version, num_versions, allow_preview):
@@ -5,15 +5,14 @@ from pyzotero import zotero
 
 from website.addons.base import AddonOAuthNodeSettingsBase
 from website.addons.base import AddonOAuthUserSettingsBase
+from website.addons.citations import library
 from website.addons.citations.utils import serialize_folder
 from website.addons.zotero import serializer
 from website.addons.zotero import settings
 from website.oauth.models import ExternalProvider
 
-# TODO: Don't cap at 200 responses. We can only fetch 100 citations at a time. With lots
-# of citations, requesting the citations may take longer than the UWSGI harakiri time.
-# For now, we load 200 citations max and show a message to the user.
-MAX_CITATION_LOAD = 200
+# Zotero returns at most 100 items per request
+PAGE_SIZE = 100
 
 class Zotero(ExternalProvider):
     name = "Zotero"
@@ -49,9 +48,7 @@ class Zotero(ExternalProvider):
 
     def citation_lists(self, extract_folder):
         """List of CitationList objects, derived from Zotero collections"""
-        client = self.client
-
-        collections = client.collections()
+        collections = library.get_library(self).folders
 
         all_documents = serialize_folder(
             'All Documents',
@@ -76,45 +73,61 @@ class Zotero(ExternalProvider):
         :param str list_id: ID for a Zotero collection. Optional.
         :return CitationList: CitationList for the collection, or for all documents
         """
-        if list_id == 'ROOT':
-            list_id = None
-
-        if list_id:
-            citations = []
-            more = True
-            offset = 0
-            while more and len(citations) <= MAX_CITATION_LOAD:
-                page = self.client.collection_items(list_id, content='csljson', size=100, start=offset)
-                citations = citations + page
-                if len(page) == 0 or len(page) < 100:
-                    more = False
-                else:
-                    offset = offset + len(page)
-            return self._citations_for_zotero_collection(citations)
-        else:
-            return self._citations_for_zotero_user()
+        return library.get_citations(self, list_id)
 
-    def _citations_for_zotero_collection(self, collection):
-        """Get all the citations in a specified collection
+    # Citation library sync; see ``website.addons.citations.library``
 
-        :param  csljson collection: list of csljson documents
-        :return list of citation objects representing said dicts of said documents.
-        """
-        return collection
+    def _fetch_folders(self):
+        return self.client.collections()
+
+    def _folder_key(self, folder):
+        return folder['data'].get('key')
 
-    def _citations_for_zotero_user(self):
-        """Get all the citations from the user """
-        citations = []
-        more = True
+    def _document_id(self, csl):
+        # CSL ids are "<library id>/<item key>"
+        return str(csl['id']).split('/')[-1]
+
+    def _iter_pages(self, fetch, **kwargs):
         offset = 0
-        while more and len(citations) <= MAX_CITATION_LOAD:
-            page = self.client.items(content='csljson', limit=100, start=offset)
-            citations = citations + page
-            if len(page) == 0 or len(page) < 100:
-                more = False
-            else:
-                offset = offset + len(page)
-        return citations
+        while True:
+            page = fetch(content='csljson', limit=PAGE_SIZE, start=offset, **kwargs)
+            for item in page:
+                yield item
+            if len(page) < PAGE_SIZE:
+                return
+            offset += len(page)
+
+    def _fetch_changes(self, cursor):
+        version = self.client.last_modified_version()
+        if cursor is None:
+            items = self._iter_pages(self.client.items)
+            deleted_ids = []
+        else:
+            items = self._iter_pages(self.client.items, since=cursor)
+            # pyzotero has no wrapper for the deleted-objects endpoint
+            self.client.add_parameters(since=cursor)
+            deleted = self.client._retrieve_data(
+                self.client._build_query('/{t}/{u}/deleted')
+            )
+            deleted_ids = deleted.get('items', [])
+
+        # csljson carries no item versions; only changed items are returned
+        changes = (
+            (self._document_id(item), None, item)
+            for item in items
+        )
+        return str(version), changes, deleted_ids
+
+    def _fetch_folder_document_ids(self, folder_id):
+        return [
+            self._document_id(item)
+            for item in self._iter_pages(
+                lambda **kwargs: self.client.collection_items(folder_id, **kwargs)
+            )
+        ]
+
+    def _citation_for_document(self, document):
+        return document
 
 
 class ZoteroUserSettings(AddonOAuthUserSettingsBase):
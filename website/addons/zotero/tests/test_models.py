@@ -47,9 +47,10 @@ class ZoteroProviderTestCase(OsfTestCase):
         ]
 
         mock_client.collections.return_value = mock_folders
+        mock_client.items.return_value = []
+        mock_client.last_modified_version.return_value = 1
         self.provider._client = mock_client
-        mock_account = mock.Mock()
-        self.provider.account = mock_account
+        self.provider.account = ZoteroAccountFactory()
 
         res = self.provider.citation_lists(ZoteroCitationsProvider()._extract_folder)
         assert_equal(
@@ -11,11 +11,13 @@ from werkzeug.contrib.fixers import ProxyFix
 import framework
 from framework.render.core import init_mfr
 from framework.flask import app, add_handlers
+from framework.routing import warm_mako_templates
 from framework.logging import logger
 from framework.mongo import set_up_storage
 from framework.addons.utils import render_addon_capabilities
 from framework.sentry import sentry
 from framework.mongo import handlers as mongo_handlers
+from framework.mongo import loader as mongo_loader
 from framework.tasks import handlers as task_handlers
 from framework.transactions import handlers as transaction_handlers
 
@@ -52,6 +54,7 @@ def attach_handlers(app, settings):
     """Add callback handlers to ``app`` in the correct order."""
     # Add callback handlers to application
     add_handlers(app, mongo_handlers.handlers)
+    add_handlers(app, mongo_loader.handlers)
     add_handlers(app, task_handlers.handlers)
     add_handlers(app, transaction_handlers.handlers)
 
@@ -130,6 +133,9 @@ def init_app(settings_module='website.settings', set_backends=True, routes=True,
             make_url_map(app)
         except AssertionError:  # Route map has already been created
             pass
+        # Load the most used templates before the worker accepts traffic
+        if not app.debug:
+            warm_mako_templates()
 
     if attach_request_handlers:
         attach_handlers(app, settings)
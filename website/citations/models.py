@@ -2,9 +2,12 @@
 
 import datetime
 
+from bson import ObjectId
+from modularodm import Q
 from modularodm import fields
 
 from framework.mongo import StoredObject
+from framework.mongo.utils import unique_on
 
 
 class CitationStyle(StoredObject):
@@ -33,3 +36,50 @@ class CitationStyle(StoredObject):
             'short_title': self.short_title,
             'summary': self.summary,
         }
+
+
+class CitationLibrary(StoredObject):
+    """Folders and folder membership of an external reference manager account
+    (e.g. Mendeley or Zotero), synced incrementally so that citation widgets
+    can be served without listing the whole library from the provider.
+    """
+
+    # The `_id` of the ExternalAccount
+    _id = fields.StringField(primary=True)
+    provider = fields.StringField(required=True)
+
+    # Folders as returned by the provider, in the provider's order
+    folders = fields.DictionaryField(list=True)
+
+    # Folder id => document ids, for folders that have been viewed
+    folder_documents = fields.DictionaryField()
+
+    # Provider-specific position to sync from next, e.g. a modification
+    # timestamp or a library version
+    cursor = fields.StringField()
+
+    # Position to give the next new document
+    next_position = fields.IntegerField(default=0)
+
+    date_synced = fields.DateTimeField()
+    date_refresh_requested = fields.DateTimeField()
+
+    @property
+    def citations(self):
+        return LibraryCitation.find(
+            Q('library', 'eq', self._id)
+        ).sort('position')
+
+
+@unique_on(['library', 'document_id'])
+class LibraryCitation(StoredObject):
+    """A document of a `CitationLibrary`, converted to CSL once per version."""
+
+    _id = fields.StringField(primary=True, default=lambda: str(ObjectId()))
+    library = fields.StringField(required=True, index=True)
+    document_id = fields.StringField(required=True, index=True)
+    # Provider version of the document that `csl` was built from
+    version = fields.StringField()
+    # Sort key; documents keep the order in which they were first synced
+    position = fields.IntegerField()
+    csl = fields.DictionaryField()
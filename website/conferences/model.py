@@ -1,13 +1,26 @@
 # -*- coding: utf-8 -*-
 
 import bson
+import operator
+
 from modularodm import fields, Q
 from modularodm.exceptions import ModularOdmException
 
 from framework.mongo import StoredObject
+from framework.mongo.utils import unique_on
 
+from website.project.model import Node, node_saved
 from website.conferences.exceptions import ConferenceError
 
+# Node fields that change whether or how a node is listed on a meeting page
+SUBMISSION_UPDATE_FIELDS = {
+    'title',
+    'tag_keys',
+    'is_public',
+    'is_deleted',
+    'visible_contributor_ids',
+}
+
 
 class Conference(StoredObject):
     #: Determines the email address for submission and the OSF url
@@ -23,6 +36,8 @@ class Conference(StoredObject):
     admins = fields.ForeignField('user', list=True, required=False, default=None)
     #: Whether to make submitted projects public
     public_projects = fields.BooleanField(required=False, default=True)
+    #: Number of public submissions; maintained by `sync_conference_submissions`
+    num_submissions = fields.IntegerField(default=0)
 
     @classmethod
     def get_by_endpoint(cls, endpoint, active=True):
@@ -39,3 +54,137 @@ class MailRecord(StoredObject):
     _id = fields.StringField(primary=True, default=lambda: str(bson.ObjectId()))
     data = fields.DictionaryField()
     records = fields.AbstractForeignField(list=True, backref='created')
+
+
+@unique_on(['conference', 'node'])
+class ConferenceSubmission(StoredObject):
+    """Precomputed meeting page row for a public node tagged with a
+    conference endpoint.
+    """
+    _id = fields.StringField(primary=True, default=lambda: str(bson.ObjectId()))
+    conference = fields.ForeignField('conference', backref='submissions', index=True)
+    node = fields.ForeignField('node', backref='submitted')
+    date_created = fields.DateTimeField()
+
+    title = fields.StringField()
+    node_url = fields.StringField()
+    author = fields.StringField()
+    author_url = fields.StringField()
+    category = fields.StringField()
+    # Key of the analytics counter of downloads of the submitted file; the
+    # count is read when the page is shown, since downloads don't save the
+    # node
+    download_page = fields.StringField()
+    download_url = fields.StringField()
+
+    def update_from_node(self):
+        node = self.node
+        storage_settings = node.get_addon('osfstorage')
+        records = storage_settings.root_node.children
+        try:
+            record = next(
+                each for each in records
+                if not each.is_deleted,
+            )
+            self.download_page = record.get_download_page()
+            self.download_url = node.web_url_for(
+                'addon_view_or_download_file',
+                path=record.path,
+                provider='osfstorage',
+                action='download',
+                _absolute=True,
+            )
+        except StopIteration:
+            self.download_url = ''
+            self.download_page = None
+
+        self.date_created = node.date_created
+        self.title = node.title
+        self.node_url = node.url
+        self.author = node.visible_contributors[0].family_name
+        self.author_url = node.creator.url
+        self.category = 'talk' if 'talk' in node.system_tags else 'poster'
+
+    def to_json(self, idx, download_count=0):
+        return {
+            'id': idx,
+            'title': self.title,
+            'nodeUrl': self.node_url,
+            'author': self.author,
+            'authorUrl': self.author_url,
+            'category': self.category,
+            'download': download_count,
+            'downloadUrl': self.download_url,
+        }
+
+
+def _adjust_submission_count(conference, delta):
+    # Atomic, so that concurrent submissions are all counted; a count that
+    # drifts below zero is corrected by `refresh_conference_submissions`
+    Conference._storage[0].store.update(
+        {'_id': conference._id},
+        {'$inc': {'num_submissions': delta}},
+    )
+
+
+def sync_conference_submissions(node):
+    """Add, refresh or remove the meeting page rows for a node.
+
+    :param Node node: Node whose tags, privacy or metadata changed
+    """
+    current = {
+        submission.conference._id: submission
+        for submission in node.conferencesubmission__submitted
+    }
+    if not current and not node.tag_keys:
+        return
+
+    if node.is_public and not node.is_deleted and node.tag_keys:
+        # Endpoints are matched case-insensitively, as in
+        # `refresh_conference_submissions`
+        conferences = Conference.find(reduce(operator.or_, [
+            Q('endpoint', 'iexact', tag_key)
+            for tag_key in node.tag_keys
+        ]))
+    else:
+        conferences = []
+
+    for conference in conferences:
+        submission = current.pop(conference._id, None)
+        if submission is None:
+            submission = ConferenceSubmission(conference=conference, node=node)
+            _adjust_submission_count(conference, 1)
+        submission.update_from_node()
+        submission.save()
+
+    for submission in current.values():
+        conference = submission.conference
+        ConferenceSubmission.remove_one(submission)
+        _adjust_submission_count(conference, -1)
+
+
+def refresh_conference_submissions(conference):
+    """Rebuild all meeting page rows and the submission count for a conference.
+
+    :param Conference conference:
+    """
+    ConferenceSubmission.remove(Q('conference', 'eq', conference._id))
+    nodes = Node.find(
+        Q('tag_keys', 'eq', conference.endpoint.lower()) &
+        Q('is_public', 'eq', True) &
+        Q('is_deleted', 'eq', False)
+    )
+    count = 0
+    for node in nodes:
+        submission = ConferenceSubmission(conference=conference, node=node)
+        submission.update_from_node()
+        submission.save()
+        count += 1
+    conference.num_submissions = count
+    conference.save()
+
+
+@node_saved.connect
+def update_conference_submissions(node, saved_fields):
+    if SUBMISSION_UPDATE_FIELDS.intersection(saved_fields):
+        sync_conference_submissions(node)
@@ -4,23 +4,26 @@ import json
 import httplib
 import logging
 
+from flask import request
 from modularodm import Q
 from modularodm.exceptions import ModularOdmException
 
 from framework.exceptions import HTTPError
+from framework.analytics import get_total_counters
 from framework.flask import redirect
 from framework.transactions.context import TokuTransaction
 from framework.transactions.handlers import no_auto_transaction
 
 from website import settings
-from website.models import Node
 from website.util import web_url_for
 from website.mails import send_mail
 from website.mails import CONFERENCE_SUBMITTED, CONFERENCE_INACTIVE, CONFERENCE_FAILED
 
 from website.conferences import utils
 from website.conferences.message import ConferenceMessage, ConferenceError
-from website.conferences.model import Conference
+from website.conferences.model import (
+    Conference, ConferenceSubmission, sync_conference_submissions,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -95,6 +98,8 @@ def add_poster_by_email(conference, message):
         utils.record_message(message, created)
 
     utils.upload_attachments(user, node, message.attachments)
+    # Pick up the uploaded file's download link on the meeting page
+    sync_conference_submissions(node)
 
     download_url = node.web_url_for(
         'addon_view_or_download_file',
@@ -125,58 +130,44 @@ def add_poster_by_email(conference, message):
     )
 
 
-def _render_conference_node(node, idx):
-    storage_settings = node.get_addon('osfstorage')
-    records = storage_settings.root_node.children
-    try:
-        record = next(
-            each for each in records
-            if not each.is_deleted,
-        )
-        download_count = record.get_download_count()
-
-        download_url = node.web_url_for(
-            'addon_view_or_download_file',
-            path=record.path,
-            provider='osfstorage',
-            action='download',
-            _absolute=True,
-        )
-    except StopIteration:
-        download_url = ''
-        download_count = 0
-
-    author = node.visible_contributors[0]
-
-    return {
-        'id': idx,
-        'title': node.title,
-        'nodeUrl': node.url,
-        'author': author.family_name,
-        'authorUrl': node.creator.url,
-        'category': 'talk' if 'talk' in node.system_tags else 'poster',
-        'download': download_count,
-        'downloadUrl': download_url,
-    }
-
-
 def conference_data(meeting):
+    """Return meeting page rows, optionally paginated with the ``page``
+    (zero-based) and ``size`` query parameters.
+
+    :param str meeting: Endpoint name for a conference.
+    """
     try:
-        Conference.find_one(Q('endpoint', 'iexact', meeting))
+        conf = Conference.find_one(Q('endpoint', 'iexact', meeting))
     except ModularOdmException:
         raise HTTPError(httplib.NOT_FOUND)
 
-    nodes = Node.find(
-        Q('tags', 'iexact', meeting) &
-        Q('is_public', 'eq', True) &
-        Q('is_deleted', 'eq', False)
-    )
-
-    ret = [
-        _render_conference_node(each, idx)
-        for idx, each in enumerate(nodes)
+    submissions = ConferenceSubmission.find(
+        Q('conference', 'eq', conf._id)
+    ).sort('date_created')
+
+    page = request.args.get('page')
+    if page is None:
+        offset = 0
+    else:
+        try:
+            page = int(page)
+            size = int(request.args.get('size', settings.CONFERENCE_PAGE_SIZE))
+        except ValueError:
+            raise HTTPError(httplib.BAD_REQUEST)
+        if page < 0 or size < 1:
+            raise HTTPError(httplib.BAD_REQUEST)
+        offset = page * size
+        submissions = submissions.offset(offset).limit(size)
+
+    submissions = list(submissions)
+    download_counts = get_total_counters([
+        each.download_page for each in submissions
+        if each.download_page
+    ])
+    return [
+        each.to_json(offset + idx, download_counts.get(each.download_page, 0))
+        for idx, each in enumerate(submissions)
     ]
-    return ret
 
 
 def redirect_to_meetings(**kwargs):
@@ -207,21 +198,12 @@ def conference_results(meeting):
 def conference_view(**kwargs):
 
     meetings = []
-    for conf in Conference.find():
-        query = (
-            Q('tags', 'iexact', conf.endpoint)
-            & Q('is_public', 'eq', True)
-            & Q('is_deleted', 'eq', False)
-        )
-        projects = Node.find(query)
-        submissions = projects.count()
-        if submissions < settings.CONFERNCE_MIN_COUNT:
-            continue
+    for conf in Conference.find(Q('num_submissions', 'gte', settings.CONFERNCE_MIN_COUNT)):
         meetings.append({
             'name': conf.name,
             'active': conf.active,
             'url': web_url_for('conference_results', meeting=conf.endpoint),
-            'submissions': submissions,
+            'submissions': conf.num_submissions,
         })
     meetings.sort(key=lambda meeting: meeting['submissions'], reverse=True)
 
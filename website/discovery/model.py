@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from modularodm import fields
+
+from framework.mongo import StoredObject
+
+
+class ActivitySnapshot(StoredObject):
+    """Precomputed data for the public activity page, refreshed periodically
+    by `website.discovery.utils.update_activity_snapshot`.
+    """
+    ACTIVITY = 'activity'
+
+    _id = fields.StringField(primary=True)
+    date_generated = fields.DateTimeField(default=datetime.datetime.utcnow)
+
+    recent_public_projects = fields.StringField(list=True)
+    recent_public_registrations = fields.StringField(list=True)
+    popular_public_projects = fields.StringField(list=True)
+    popular_public_registrations = fields.StringField(list=True)
+    # Maps node id => {'hits': <int>, 'visits': <int>}
+    hits = fields.DictionaryField()
+
+    @property
+    def age(self):
+        return datetime.datetime.utcnow() - self.date_generated
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import logging
+
+import requests
+from modularodm import Q
+
+from framework.analytics.piwik import PiwikClient
+
+from website import settings
+from website.project import Node
+from website.discovery.model import ActivitySnapshot
+
+
+logger = logging.getLogger(__name__)
+
+MAX_NODES = 10
+
+
+def fetch_popular_nodes():
+    """Fetch last week's most viewed public projects and registrations from
+    Piwik. Requests time out after ``settings.PIWIK_TIMEOUT`` seconds.
+
+    :return: Tuple of (project ids, registration ids, hits)
+    :raises: `requests.RequestException` or `ValueError` if Piwik is
+        unavailable or returns an invalid response
+    """
+    # get the date for exactly one week ago
+    target_date = datetime.date.today() - datetime.timedelta(weeks=1)
+
+    client = PiwikClient(
+        url=settings.PIWIK_HOST,
+        auth_token=settings.PIWIK_ADMIN_TOKEN,
+        site_id=settings.PIWIK_SITE_ID,
+        period='week',
+        date=target_date.strftime('%Y-%m-%d'),
+        timeout=settings.PIWIK_TIMEOUT,
+    )
+
+    popular_project_ids = [
+        x for x in client.custom_variables if x.label == 'Project ID'
+    ][0].values
+
+    popular_public_projects = []
+    popular_public_registrations = []
+    for nid in popular_project_ids:
+        node = Node.load(nid.value)
+        if node is None or not node.is_public or node.is_deleted:
+            continue
+        if not node.is_registration:
+            if len(popular_public_projects) < MAX_NODES:
+                popular_public_projects.append(node._id)
+        elif len(popular_public_registrations) < MAX_NODES:
+            popular_public_registrations.append(node._id)
+        if len(popular_public_projects) >= MAX_NODES and len(popular_public_registrations) >= MAX_NODES:
+            break
+
+    hits = {
+        x.value: {
+            'hits': x.actions,
+            'visits': x.visits
+        } for x in popular_project_ids
+        if x.value in popular_public_projects or x.value in popular_public_registrations
+    }
+    return popular_public_projects, popular_public_registrations, hits
+
+
+def update_activity_snapshot():
+    """Recompute and save the public activity page snapshot. If Piwik cannot be
+    reached, the popular lists from the previous snapshot are kept.
+
+    :return: The saved `ActivitySnapshot`
+    """
+    snapshot = ActivitySnapshot.load(ActivitySnapshot.ACTIVITY)
+    if snapshot is None:
+        snapshot = ActivitySnapshot(_id=ActivitySnapshot.ACTIVITY)
+
+    if settings.PIWIK_HOST:
+        try:
+            projects, registrations, hits = fetch_popular_nodes()
+        except (requests.RequestException, ValueError, IndexError) as error:
+            logger.error('Could not fetch popular nodes from Piwik: {0!r}'.format(error))
+        else:
+            snapshot.popular_public_projects = projects
+            snapshot.popular_public_registrations = registrations
+            snapshot.hits = hits
+
+    recent_query = (
+        Q('category', 'eq', 'project') &
+        Q('is_public', 'eq', True) &
+        Q('is_deleted', 'eq', False)
+    )
+
+    snapshot.recent_public_projects = Node.find(
+        recent_query &
+        Q('is_registration', 'eq', False)
+    ).sort(
+        '-date_created'
+    ).limit(MAX_NODES).get_keys()
+
+    snapshot.recent_public_registrations = Node.find(
+        recent_query &
+        Q('is_registration', 'eq', True)
+    ).sort(
+        '-registered_date'
+    ).limit(MAX_NODES).get_keys()
+
+    snapshot.date_generated = datetime.datetime.utcnow()
+    snapshot.save()
+    return snapshot
+
+
+def get_activity_snapshot():
+    """Return the current snapshot, building it if none exists yet."""
+    snapshot = ActivitySnapshot.load(ActivitySnapshot.ACTIVITY)
+    if snapshot is None:
+        snapshot = update_activity_snapshot()
+    return snapshot
+
+
+def load_public_nodes(node_ids):
+    """Load nodes in the given order with a single query, dropping any that
+    have been made private or deleted since the snapshot was taken.
+    """
+    if not node_ids:
+        return []
+    nodes = {
+        node._id: node
+        for node in Node.find(
+            Q('_id', 'in', list(node_ids)) &
+            Q('is_public', 'eq', True) &
+            Q('is_deleted', 'eq', False)
+        )
+    }
+    return [nodes[node_id] for node_id in node_ids if node_id in nodes]
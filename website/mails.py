@@ -19,6 +19,7 @@ Usage: ::
 
 """
 import os
+import time
 import logging
 
 from mako.lookup import TemplateLookup, Template
@@ -31,7 +32,8 @@ logger = logging.getLogger(__name__)
 EMAIL_TEMPLATES_DIR = os.path.join(settings.TEMPLATES_PATH, 'emails')
 
 _tpl_lookup = TemplateLookup(
-    directories=[EMAIL_TEMPLATES_DIR]
+    directories=[EMAIL_TEMPLATES_DIR],
+    module_directory=os.path.join(settings.MAKO_MODULE_PATH, 'emails'),
 )
 
 TXT_EXT = '.txt.mako'
@@ -69,6 +71,25 @@ def render_message(tpl_name, **context):
     return tpl.render(**context)
 
 
+def precompile_templates():
+    """Compile every email template to the module directory.
+
+    :return: List of (template name, seconds to compile, error or None)
+    """
+    report = []
+    for filename in sorted(os.listdir(EMAIL_TEMPLATES_DIR)):
+        if not filename.endswith('.mako'):
+            continue
+        start = time.time()
+        error = None
+        try:
+            _tpl_lookup.get_template(filename)
+        except Exception as exc:
+            error = exc
+        report.append((filename, time.time() - start, error))
+    return report
+
+
 def send_mail(to_addr, mail, mimetype='plain', from_addr=None, mailer=None,
             username=None, password=None, mail_server=None, callback=None, **context):
     """Send an email from the OSF.
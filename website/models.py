@@ -13,8 +13,17 @@ from website.project.model import (
 )
 from website.oauth.models import ExternalAccount
 from website.identifiers.model import Identifier
-from website.citations.models import CitationStyle
-from website.conferences.model import Conference, MailRecord
+from website.project.view_cache import ProjectViewCache
+from website.project.co_contributors import CoContributorGraph, CoContributorNode
+from website.project.smart_folders import SmartFolderCounts, SmartFolderNode
+from website.project.forking import ForkJob
+from website.project.registering import RegistrationJob
+from website.profile.public_nodes import PublicNodeListing
+# Connect the receivers that maintain smart folder counts
+from website.project import tasks as project_tasks  # noqa
+from website.citations.models import CitationStyle, CitationLibrary, LibraryCitation
+from website.conferences.model import Conference, ConferenceSubmission, MailRecord
+from website.discovery.model import ActivitySnapshot
 from website.notifications.model import NotificationDigest
 from website.notifications.model import NotificationSubscription
 
@@ -22,9 +31,12 @@ from website.notifications.model import NotificationSubscription
 MODELS = (
     User, ApiKey, Node, NodeLog,
     Tag, WatchConfig, Session, Guid, MetaSchema, Pointer,
-    MailRecord, Comment, PrivateLink, MetaData, Conference,
+    MailRecord, Comment, PrivateLink, MetaData, Conference, ConferenceSubmission,
     NotificationSubscription, NotificationDigest, CitationStyle,
-    CitationStyle, ExternalAccount, Identifier,
+    CitationStyle, ExternalAccount, Identifier, ActivitySnapshot,
+    CitationLibrary, LibraryCitation, ProjectViewCache,
+    CoContributorGraph, CoContributorNode, PublicNodeListing, ForkJob,
+    RegistrationJob, SmartFolderCounts, SmartFolderNode,
 )
 
 GUID_MODELS = (User, Node, Comment, MetaData)
@@ -106,6 +106,10 @@ class ExternalProvider(object):
     # Default to OAuth v2.0.
     _oauth_version = OAUTH2
 
+    # OAuth2 token endpoint used to refresh access tokens; providers whose
+    # tokens expire should set this.
+    auto_refresh_url = None
+
     def __init__(self):
         super(ExternalProvider, self).__init__()
 
@@ -351,3 +355,47 @@ class ExternalProvider(object):
         :return dict:
         """
         pass
+
+    @property
+    def can_refresh(self):
+        return bool(
+            self._oauth_version == OAUTH2 and
+            self.auto_refresh_url and
+            self.account and
+            self.account.refresh_token
+        )
+
+    def oauth_key_expires_within(self, seconds=0):
+        """Whether the account's access token expires within ``seconds``."""
+        if self.account is None or self.account.expires_at is None:
+            return False
+        # ``expires_at`` is stored in local time; see ``_default_handle_callback``
+        remaining = self.account.expires_at - datetime.datetime.now()
+        return remaining.total_seconds() <= seconds
+
+    def refresh_oauth_key(self, force=False):
+        """Refresh the account's access token if it has expired, or always if
+        ``force`` is set. Request handlers should call this without ``force``
+        and leave refreshing ahead of expiry to
+        ``scripts/refresh_oauth_tokens.py``.
+
+        :return bool: Whether the token was refreshed
+        """
+        if not self.can_refresh:
+            return False
+        if not force and not self.oauth_key_expires_within(0):
+            return False
+
+        token = OAuth2Session(self.client_id).refresh_token(
+            self.auto_refresh_url,
+            refresh_token=self.account.refresh_token,
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+        )
+        info = self._default_handle_callback(token)
+
+        self.account.oauth_key = info['key']
+        self.account.refresh_token = info.get('refresh_token', self.account.refresh_token)
+        self.account.expires_at = info.get('expires_at')
+        self.account.save()
+        return True
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Listings of the public projects and components shown on user profiles.
+
+Each user's listing holds the ids of their public, non-deleted projects and
+components, and a version that is bumped whenever either list changes. The
+listing is recomputed in the background when a node's visibility, deletion
+state or contributors change, so profile requests neither query every node
+the user contributes to nor render nodes outside the requested page.
+"""
+from pymongo.errors import DuplicateKeyError
+from modularodm import Q
+from modularodm import fields
+
+from framework.mongo import StoredObject
+
+
+class PublicNodeListing(StoredObject):
+
+    # Primary key of the user
+    _id = fields.StringField(primary=True)
+    version = fields.IntegerField(default=0)
+    projects = fields.StringField(list=True)
+    components = fields.StringField(list=True)
+
+
+# Node fields that decide whether a node is listed
+LISTING_FIELDS = {
+    'is_public',
+    'is_deleted',
+    'contributors',
+    'category',
+}
+
+
+def _collection():
+    return PublicNodeListing._storage[0].store
+
+
+def compute_listing(user):
+    public = (
+        Q('is_public', 'eq', True) &
+        Q('is_registration', 'eq', False) &
+        Q('is_deleted', 'eq', False)
+    )
+    contributed = user.node__contributed
+    return {
+        'projects': contributed.find(
+            Q('category', 'eq', 'project') & public
+        ).get_keys(),
+        'components': contributed.find(
+            Q('category', 'ne', 'project') & public
+        ).get_keys(),
+    }
+
+
+def refresh_listing(user):
+    """Recompute a user's listing, bumping its version if it changed."""
+    listing = compute_listing(user)
+    try:
+        _collection().insert(dict(listing, _id=user._id, version=1))
+    except DuplicateKeyError:
+        _collection().update(
+            {
+                '_id': user._id,
+                '$or': [
+                    {'projects': {'$ne': listing['projects']}},
+                    {'components': {'$ne': listing['components']}},
+                ],
+            },
+            {
+                '$set': listing,
+                '$inc': {'version': 1},
+            },
+        )
+    return _collection().find_one({'_id': user._id})
+
+
+def get_listing(user):
+    """Return the user's listing as a dictionary with `version`, `projects`
+    and `components` keys, computing it if it has not been stored yet.
+    """
+    record = _collection().find_one({'_id': user._id})
+    if record is None:
+        return refresh_listing(user)
+    return record
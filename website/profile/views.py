@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import json
+import math
+import hashlib
 import logging
 import operator
 import httplib
@@ -8,12 +11,13 @@ import os
 
 from dateutil.parser import parse as parse_date
 
-from flask import request
+from flask import request, make_response
 from modularodm.exceptions import ValidationError, NoResultsFound
 from modularodm import Q
 
 from framework import sentry
 from framework.auth import utils as auth_utils
+from framework.mongo.loader import load_many
 from framework.auth.decorators import collect_auth
 from framework.auth.decorators import must_be_logged_in
 from framework.auth.exceptions import ChangePasswordError
@@ -26,8 +30,10 @@ from website import mails
 from website import mailchimp_utils
 from website import settings
 from website.models import User
+from website.models import Node
 from website.models import ApiKey
 from website.profile import utils as profile_utils
+from website.profile import public_nodes
 from website.util import web_url_for, paths
 from website.util.sanitize import escape_html
 from website.util.sanitize import strip_html
@@ -37,32 +43,65 @@ from website.views import _render_nodes
 logger = logging.getLogger(__name__)
 
 
-def get_public_projects(uid=None, user=None):
+def _get_page_args():
+    """Return the requested ``(page, size)``; ``size`` is None if every node
+    was requested.
+    """
+    try:
+        page = int(request.args.get('page', 0))
+        size = request.args.get('size')
+        size = int(size) if size is not None else None
+    except ValueError:
+        raise HTTPError(http.BAD_REQUEST)
+    if page < 0 or (size is not None and size < 1):
+        raise HTTPError(http.BAD_REQUEST)
+    return page, size
+
+
+def _get_public_nodes(uid, user, kind):
+    """Render a page of a user's public projects or components, or an empty
+    304 response if the client already has it.
+
+    :param-query page: Page number, starting from 0
+    :param-query size: Nodes per page; every node is returned if not given
+    """
     user = user or User.load(uid)
-    return _render_nodes(
-        list(user.node__contributed.find(
-            (
-                Q('category', 'eq', 'project') &
-                Q('is_public', 'eq', True) &
-                Q('is_registration', 'eq', False) &
-                Q('is_deleted', 'eq', False)
-            )
-        ))
-    )
+    if user is None:
+        raise HTTPError(http.NOT_FOUND)
+    page, size = _get_page_args()
+    listing = public_nodes.get_listing(user)
+    node_ids = listing[kind]
+    if size is not None:
+        node_ids = node_ids[page * size:(page + 1) * size]
+    nodes = [node for node in load_many(Node, node_ids) if node is not None]
+
+    # Log additions and title changes alter `date_modified` without changing
+    # the listing, so include it in the tag
+    etag = hashlib.md5(json.dumps([
+        listing['version'],
+        [(node._id, node.date_modified.isoformat()) for node in nodes],
+    ])).hexdigest()
+    headers = {
+        'ETag': '"{0}"'.format(etag),
+        'Cache-Control': 'no-cache',
+    }
+    if request.if_none_match.contains(etag):
+        return make_response('', http.NOT_MODIFIED, headers)
+
+    ret = _render_nodes(nodes)
+    ret['total'] = len(listing[kind])
+    if size is not None:
+        ret['page'] = page
+        ret['pages'] = int(math.ceil(ret['total'] / float(size)))
+    return ret, http.OK, headers
+
+
+def get_public_projects(uid=None, user=None):
+    return _get_public_nodes(uid, user, 'projects')
 
 
 def get_public_components(uid=None, user=None):
-    user = user or User.load(uid)
-    return _render_nodes(
-        list(user.node__contributed.find(
-            (
-                Q('category', 'ne', 'project') &
-                Q('is_public', 'eq', True) &
-                Q('is_registration', 'eq', False) &
-                Q('is_deleted', 'eq', False)
-            )
-        ))
-    )
+    return _get_public_nodes(uid, user, 'components')
 
 
 @must_be_logged_in
@@ -84,6 +84,9 @@ def new_dashboard(user):
 
     node.save()
 
+    user.dashboard_id = node._id
+    user.save()
+
     return node
 
 
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""Weighted co-contributor graph used to suggest contributors a user has the
+most projects in common with.
+
+Each user has a row mapping the ids of the active users they share nodes with
+to the number of nodes they share. Rows are updated from the difference
+between each node's contributors and the contributors last applied to the
+graph, so every way of changing contributors (adding, removing, merging,
+forking, registering) is covered. Only rows that have been built are updated;
+a user's row is built from the recorded contributors of their nodes the first
+time it is read. A user's row is rebuilt, and their entries on their
+neighbors' rows added or removed, when the user is activated or deactivated.
+"""
+import collections
+
+from pymongo.errors import DuplicateKeyError
+from modularodm import fields
+
+from framework.mongo import StoredObject
+from framework.mongo import loader
+
+
+class CoContributorGraph(StoredObject):
+
+    # Primary key of the user
+    _id = fields.StringField(primary=True)
+    counts = fields.DictionaryField()
+    # Format: {
+    #   <user id>: <number of nodes in common>,
+    # }
+
+
+class CoContributorNode(StoredObject):
+
+    # Primary key of the node
+    _id = fields.StringField(primary=True)
+    # Contributors last applied to the graph
+    contributors = fields.StringField(list=True, index=True)
+
+
+def _graph():
+    return CoContributorGraph._storage[0].store
+
+
+def _nodes():
+    return CoContributorNode._storage[0].store
+
+
+def get_counts(user_id):
+    """Return the co-contributor counts of a user, or None if their row has
+    not been built.
+    """
+    record = _graph().find_one({'_id': user_id})
+    if record is None:
+        return None
+    return record.get('counts') or {}
+
+
+def _active_ids(user_ids):
+    from framework.auth import User
+
+    return {
+        user._id
+        for user in loader.load_many(User, list(user_ids))
+        if user is not None and user.is_active
+    }
+
+
+def _apply(deltas):
+    """Apply ``{user_id: {other_id: delta}}`` to the rows that have been
+    built, dropping entries that reach zero.
+    """
+    for user_id, row in deltas.items():
+        row = {other_id: delta for other_id, delta in row.items() if delta}
+        if not row:
+            continue
+        _graph().update(
+            {'_id': user_id},
+            {'$inc': {'counts.{0}'.format(other_id): delta for other_id, delta in row.items()}},
+        )
+        for other_id, delta in row.items():
+            if delta < 0:
+                key = 'counts.{0}'.format(other_id)
+                _graph().update(
+                    {'_id': user_id, key: {'$lte': 0}},
+                    {'$unset': {key: True}},
+                )
+
+
+def compute_deltas(old, new, active):
+    """Return the changes to the graph when a node's contributors change from
+    ``old`` to ``new``. Only users in ``active`` are added to rows.
+    """
+    old, new = set(old), set(new)
+    added, removed = new - old, old - new
+    deltas = collections.defaultdict(collections.Counter)
+    for user_id in new:
+        # A new contributor has gained everyone; the others have gained the
+        # new contributors
+        others = new if user_id in added else added
+        for other_id in others - {user_id}:
+            if other_id in active:
+                deltas[user_id][other_id] += 1
+    for user_id in old:
+        others = old if user_id in removed else removed
+        for other_id in others - {user_id}:
+            if other_id in active:
+                deltas[user_id][other_id] -= 1
+    return deltas
+
+
+def update_node(node_id, contributor_ids):
+    """Bring the graph up to date with a node's current contributors."""
+    contributor_ids = sorted(set(contributor_ids))
+    while True:
+        record = _nodes().find_one({'_id': node_id})
+        old = record['contributors'] if record else []
+        if set(old) == set(contributor_ids):
+            return
+        try:
+            result = _nodes().update(
+                {'_id': node_id, 'contributors': old},
+                {'$set': {'contributors': contributor_ids}},
+                upsert=record is None,
+            )
+        except DuplicateKeyError:
+            # Another worker recorded the node first
+            continue
+        if result.get('n'):
+            break
+    active = _active_ids(set(old) | set(contributor_ids))
+    _apply(compute_deltas(old, contributor_ids, active))
+
+
+def _record_nodes(nodes):
+    """Apply the nodes that have not been recorded to the graph."""
+    nodes = list(nodes)
+    recorded = {
+        record['_id']
+        for record in _nodes().find(
+            {'_id': {'$in': [node._id for node in nodes]}},
+            {'_id': True},
+        )
+    }
+    for node in nodes:
+        if node._id not in recorded:
+            update_node(node._id, node.contributors._to_primary_keys())
+
+
+def rebuild_user(user):
+    """Recompute a user's row from the recorded contributors of the nodes they
+    contribute to, and add or remove them on their neighbors' rows according
+    to whether they are active. Nodes that have not been recorded are applied
+    first, so that a later change to them is not counted twice.
+    """
+    _record_nodes(user.node__contributed)
+    counts = collections.Counter(
+        contrib_id
+        for record in _nodes().find({'contributors': user._id}, {'contributors': True})
+        for contrib_id in record['contributors']
+        if contrib_id != user._id
+    )
+    active = _active_ids(counts)
+    counts = {
+        contrib_id: count
+        for contrib_id, count in counts.items()
+        if contrib_id in active
+    }
+    previous = get_counts(user._id) or {}
+    _graph().update(
+        {'_id': user._id},
+        {'$set': {'counts': counts}},
+        upsert=True,
+    )
+    key = 'counts.{0}'.format(user._id)
+    if user.is_active:
+        for contrib_id, count in counts.items():
+            _graph().update({'_id': contrib_id}, {'$set': {key: count}})
+    for contrib_id in set(previous) | set(counts):
+        if not user.is_active or contrib_id not in counts:
+            _graph().update({'_id': contrib_id}, {'$unset': {key: True}})
+    return counts
+
+
+def get_or_build_counts(user):
+    counts = get_counts(user._id)
+    if counts is None:
+        counts = rebuild_user(user)
+    return counts
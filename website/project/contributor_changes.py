@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Contributor changes applied to many nodes at once.
+
+The changes to every node are computed and validated before any node is
+written. Each changed node then has its contributors, permissions and
+visible contributors updated with one log per kind of change and a single
+save. Addon hooks and signals for the changes (invitations, subscriptions,
+revoked tokens, derived listings) are run afterwards by a task.
+
+Example: add two users to a project and its components:
+::
+
+    deltas = compute_deltas(
+        [project] + components,
+        add=[
+            {'user': user, 'permissions': ['read'], 'visible': True},
+            {'user': other, 'permissions': ['read', 'write'], 'visible': False},
+        ],
+    )
+    apply_deltas(deltas, auth)
+"""
+import logging
+
+from framework.auth import Auth, User
+from framework.auth import signals as auth_signals
+
+from website.project.model import (
+    Node, NodeLog, contributor_added, write_permissions_revoked,
+)
+from website.util.permissions import DEFAULT_CONTRIBUTOR_PERMISSIONS
+
+
+logger = logging.getLogger(__name__)
+
+# Length of the list of users recently added by a user
+MAX_RECENT_LENGTH = 15
+
+
+class ContributorDelta(object):
+    """Changes to the contributors of one node."""
+
+    def __init__(self, node):
+        self.node = node
+        # Dictionaries of `user`, `permissions` and `visible`
+        self.added = []
+        self.removed = []
+        # Changed permissions and visibility of remaining contributors, by
+        # user id
+        self.permissions = {}
+        self.visible = {}
+        # New order of the remaining contributors' ids, if it changed
+        self.order = None
+
+    def __nonzero__(self):
+        return bool(
+            self.added or self.removed or self.permissions or self.visible
+            or self.order
+        )
+
+    @property
+    def revokes_write(self):
+        return bool(self.removed) or any(
+            'write' not in permissions
+            for permissions in self.permissions.values()
+        )
+
+
+def compute_delta(node, add=None, remove=None, permissions=None, visible=None,
+                  order=None):
+    """Compute the changes to the contributors of ``node``. Users already
+    added or removed, and permissions, visibility and order that would not
+    change, are skipped.
+
+    :param list add: Dictionaries of `user`, `permissions` and `visible`
+    :param list remove: Users to remove
+    :param dict permissions: Permissions of contributors by user id
+    :param dict visible: Visibility of contributors by user id
+    :param list order: Ids of all remaining contributors in their new order
+    :raises: ValueError if no registered admin contributor would remain, or
+        if `order` does not list every remaining contributor
+    """
+    delta = ContributorDelta(node)
+    contributor_ids = set(node.contributors._to_primary_keys())
+    remove_ids = {user._id for user in remove or []}
+    for contrib in add or []:
+        # If user is merged into another account, use master account
+        user = contrib['user'].merged_by if contrib['user'].is_merged else contrib['user']
+        if user._id in contributor_ids or user._id in remove_ids:
+            continue
+        contributor_ids.add(user._id)
+        delta.added.append({
+            'user': user,
+            'permissions': contrib.get('permissions') or DEFAULT_CONTRIBUTOR_PERMISSIONS,
+            'visible': contrib.get('visible', True),
+        })
+    added_ids = {contrib['user']._id for contrib in delta.added}
+    delta.removed = [
+        removed for removed in remove or []
+        if removed._id in contributor_ids
+    ]
+    for user_id, user_permissions in (permissions or {}).items():
+        if user_id not in contributor_ids or user_id in remove_ids or user_id in added_ids:
+            continue
+        if set(user_permissions) != set(node.permissions.get(user_id, [])):
+            delta.permissions[user_id] = user_permissions
+    for user_id, is_visible in (visible or {}).items():
+        if user_id not in contributor_ids or user_id in remove_ids or user_id in added_ids:
+            continue
+        if is_visible != (user_id in node.visible_contributor_ids):
+            delta.visible[user_id] = is_visible
+
+    remaining = [
+        contributor for contributor in node.contributors
+        if contributor._id not in remove_ids
+    ] + [contrib['user'] for contrib in delta.added]
+    if order is not None:
+        remaining_ids = [contributor._id for contributor in remaining]
+        if sorted(order) != sorted(remaining_ids):
+            raise ValueError('Order must list every remaining contributor')
+        if list(order) != remaining_ids:
+            delta.order = list(order)
+    new_permissions = dict(node.permissions)
+    new_permissions.update(delta.permissions)
+    new_permissions.update({
+        contrib['user']._id: contrib['permissions']
+        for contrib in delta.added
+    })
+    admins = [
+        contributor for contributor in remaining
+        if 'admin' in new_permissions.get(contributor._id, [])
+        and contributor.is_registered
+    ]
+    if not admins:
+        raise ValueError(
+            'Must have at least one registered admin contributor'
+        )
+    return delta
+
+
+def compute_deltas(nodes, **changes):
+    """Compute the changes to the contributors of each node; see
+    `compute_delta`.
+    """
+    return [compute_delta(node, **changes) for node in nodes]
+
+
+def _add_log(node, action, contributors, auth, parent_key='project'):
+    node.add_log(
+        action=action,
+        params={
+            parent_key: node.parent_id,
+            'node': node._primary_key,
+            'contributors': contributors,
+        },
+        auth=auth,
+        save=False,
+    )
+
+
+def apply_delta(delta, auth):
+    """Write the changes to one node; return users whose records changed."""
+    node = delta.node
+    changed_users = []
+    for contrib in delta.added:
+        user = contrib['user']
+        node.contributors.append(user)
+        node.set_permissions(user, list(contrib['permissions']))
+        if contrib['visible']:
+            node.visible_contributor_ids.append(user._id)
+    for user in delta.removed:
+        # Remove unclaimed record if necessary
+        if node._primary_key in user.unclaimed_records:
+            del user.unclaimed_records[node._primary_key]
+            changed_users.append(user)
+        node.contributors.remove(user._id)
+        node.permissions.pop(user._id, None)
+        if user._id in node.visible_contributor_ids:
+            node.visible_contributor_ids.remove(user._id)
+    for user_id, permissions in delta.permissions.items():
+        node.permissions[user_id] = permissions
+    for user_id, is_visible in delta.visible.items():
+        if is_visible:
+            node.visible_contributor_ids.append(user_id)
+        else:
+            node.visible_contributor_ids.remove(user_id)
+    if delta.order:
+        contributors = {user._id: user for user in node.contributors}
+        node.contributors = [contributors[user_id] for user_id in delta.order]
+    node.update_visible_ids()
+
+    if delta.order:
+        _add_log(node, NodeLog.CONTRIB_REORDERED, delta.order, auth)
+    if delta.added:
+        _add_log(node, NodeLog.CONTRIB_ADDED, [contrib['user']._id for contrib in delta.added], auth)
+    if delta.removed:
+        _add_log(node, NodeLog.CONTRIB_REMOVED, [user._id for user in delta.removed], auth)
+    if delta.permissions:
+        _add_log(node, NodeLog.PERMISSIONS_UPDATED, delta.permissions, auth)
+    for is_visible, action in (
+            (True, NodeLog.MADE_CONTRIBUTOR_VISIBLE),
+            (False, NodeLog.MADE_CONTRIBUTOR_INVISIBLE)):
+        user_ids = [
+            user_id for user_id, visible in delta.visible.items()
+            if visible == is_visible
+        ]
+        if user_ids:
+            _add_log(node, action, user_ids, auth, parent_key='parent')
+
+    node.save()
+    return changed_users
+
+
+def apply_deltas(deltas, auth):
+    """Write the changes to each node, and queue the addon hooks and signals
+    for them.
+    """
+    from website.project.tasks import run_contributor_hooks
+
+    changes = []
+    changed_users = {}
+    added = []
+    for delta in deltas:
+        if not delta:
+            continue
+        for user in apply_delta(delta, auth):
+            changed_users[user._id] = user
+        for contrib in delta.added:
+            if contrib['user'] not in added:
+                added.append(contrib['user'])
+        changes.append({
+            'node': delta.node._id,
+            'added': [contrib['user']._id for contrib in delta.added],
+            'removed': [user._id for user in delta.removed],
+            'revoked': delta.revokes_write,
+        })
+    for user in changed_users.values():
+        user.save()
+
+    # Add contributors to recently added list for user
+    if added and auth.user is not None:
+        recently_added = auth.user.recently_added
+        for user in added:
+            if user in recently_added:
+                recently_added.remove(user)
+            recently_added.insert(0, user)
+        while len(recently_added) > MAX_RECENT_LENGTH:
+            recently_added.pop()
+        auth.user.save()
+
+    if changes:
+        run_contributor_hooks(changes, auth.user._id if auth.user else None)
+    return changes
+
+
+def run_hooks(changes, user):
+    """Run the addon hooks and send the signals for applied changes."""
+    auth = Auth(user)
+    for change in changes:
+        node = Node.load(change['node'])
+        for user_id in change['removed']:
+            removed = User.load(user_id)
+            for addon in node.get_addons():
+                message = addon.after_remove_contributor(node, removed, auth)
+                if message:
+                    logger.info(message)
+            auth_signals.contributor_removed.send(removed, node=node)
+        for user_id in change['added']:
+            contributor_added.send(node, contributor=User.load(user_id), auth=auth)
+        if change['revoked']:
+            write_permissions_revoked.send(node)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Forking of projects in the background.
+
+Forking copies every node of the tree and every addon's files, which is too
+slow for a request on large projects. A fork request creates a `ForkJob` and
+queues the fork; the page polls the job for progress and goes to the fork once
+it is complete.
+
+Forked nodes are saved as deleted while the job runs and are made visible
+together when it completes, so users never see a partial fork; the nodes of a
+failed fork stay deleted. The job does not run in a transaction, so that its
+progress can be read while it runs.
+"""
+import logging
+import datetime
+
+from modularodm import fields
+
+from framework.auth import Auth, User
+from framework.mongo import ObjectId
+from framework.mongo import StoredObject
+from framework.exceptions import PermissionsError
+
+from website.project import view_cache
+from website.project import smart_folders
+from website.project.model import Node
+
+
+logger = logging.getLogger(__name__)
+
+
+class ForkJob(StoredObject):
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
+
+    _id = fields.StringField(primary=True, default=lambda: str(ObjectId()))
+    # Primary keys of the forked node, the user forking it and the fork
+    node = fields.StringField(required=True)
+    user = fields.StringField(required=True)
+    fork = fields.StringField()
+    title = fields.StringField()
+    status = fields.StringField(default=PENDING)
+    # Nodes forked, and addon after fork callbacks run and to run
+    nodes = fields.IntegerField(default=0)
+    addons_done = fields.IntegerField(default=0)
+    addons_total = fields.IntegerField(default=0)
+    # Status messages of addons, shown once the fork is complete
+    messages = fields.StringField(list=True)
+    date_created = fields.DateTimeField(auto_now_add=datetime.datetime.utcnow)
+    date_modified = fields.DateTimeField(auto_now=datetime.datetime.utcnow)
+
+    def to_json(self):
+        return {
+            'id': self._id,
+            'status': self.status,
+            'nodes': self.nodes,
+            'addonsDone': self.addons_done,
+            'addonsTotal': self.addons_total,
+            'messages': self.messages,
+        }
+
+
+def start_fork(node, auth, title='Fork of '):
+    """Check that the user may fork ``node`` and queue the fork.
+
+    :raises: PermissionsError if the user may not read the node
+    :return: The `ForkJob` of the fork
+    """
+    from website.project.tasks import fork_node_job
+
+    if not (node.is_public or node.has_permission(auth.user, 'read')):
+        raise PermissionsError('{0!r} does not have permission to fork node {1!r}'.format(auth.user, node._id))
+    job = ForkJob(node=node._id, user=auth.user._id, title=title)
+    job.save()
+    fork_node_job(job._id)
+    return job
+
+
+def reveal(pairs):
+    """Make the forks of the nodes that were not deleted visible in a single
+    update.
+    """
+    revealed = [
+        (original, forked) for original, forked in pairs
+        if not original.is_deleted
+    ]
+    ids = [forked._id for original, forked in revealed]
+    Node._storage[0].store.update(
+        {'_id': {'$in': ids}},
+        {'$set': {'is_deleted': False}},
+        multi=True,
+    )
+    Node._clear_caches()
+    # Revealed nodes were not saved, so count them and bump the cached pages
+    # of the forks and of the originals, which show the number of forks, here
+    for original, forked in revealed:
+        smart_folders.update_node(Node.load(forked._id))
+        view_cache.invalidate(original._id, forked._id)
+
+
+def run_job(job):
+    node = Node.load(job.node)
+    user = User.load(job.user)
+    job.status = ForkJob.RUNNING
+    job.save()
+
+    def progress(done, total):
+        job.addons_done = done
+        job.addons_total = total
+        job.save()
+
+    try:
+        pairs = []
+        forked = node._fork_tree(Auth(user), job.title, True, pairs)
+        job.nodes = len(pairs)
+        job.fork = forked._id
+        job.save()
+        job.messages = Node._fork_addons(pairs, user, progress=progress)
+        reveal(pairs)
+    except Exception:
+        logger.exception('Fork job {0} failed'.format(job._id))
+        job.status = ForkJob.FAILED
+        job.save()
+        return
+    job.status = ForkJob.COMPLETE
+    job.save()
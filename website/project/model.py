@@ -2,10 +2,10 @@
 import os
 import re
 import uuid
-import urllib
 import logging
 import datetime
 import urlparse
+import unicodedata
 from collections import OrderedDict
 import warnings
 
@@ -30,7 +30,8 @@ from framework.exceptions import PermissionsError
 from framework.guid.model import GuidStoredObject
 from framework.auth.utils import privacy_info_handle
 from framework.analytics import tasks as piwik_tasks
-from framework.mongo.utils import to_mongo, to_mongo_key, unique_on
+from framework.mongo.utils import to_mongo_key, unique_on
+from framework.mongo.loader import load_many
 from framework.analytics import (
     get_basic_counters, increment_user_activity_counters
 )
@@ -42,6 +43,7 @@ from website import settings
 from website.util import web_url_for
 from website.util import api_url_for
 from website.exceptions import NodeStateError
+from website.project import view_cache
 from website.citations.utils import datetime_to_csl
 from website.identifiers.model import IdentifierMixin
 from website.util.permissions import expand_permissions
@@ -77,6 +79,7 @@ signals = blinker.Namespace()
 contributor_added = signals.signal('contributor-added')
 unreg_contributor_added = signals.signal('unreg-contributor-added')
 write_permissions_revoked = signals.signal('write-permissions-revoked')
+node_saved = signals.signal('node-saved')
 
 
 class MetaSchema(StoredObject):
@@ -459,6 +462,9 @@ class Pointer(StoredObject):
     def fork_node(self, *args, **kwargs):
         return self._clone()
 
+    def _fork_tree(self, *args, **kwargs):
+        return self._clone()
+
     def register_node(self, *args, **kwargs):
         return self._clone()
 
@@ -495,6 +501,33 @@ def get_pointer_parent(pointer):
     return parent_refs[0]
 
 
+def title_words(title):
+    """Split a title into lowercased words with accents stripped. Letters of
+    any script are kept, so that non-Latin titles can be searched.
+    """
+    if not isinstance(title, unicode):
+        title = title.decode('utf-8', 'ignore')
+    title = u''.join(
+        char for char in unicodedata.normalize('NFKD', title.lower())
+        if not unicodedata.combining(char)
+    )
+    return [
+        word[:settings.TITLE_TOKEN_MAX_LENGTH]
+        for word in re.findall(r'[^\W_]+', title, re.UNICODE)
+    ]
+
+
+def title_tokens(title):
+    """Return the prefixes of every word of a title, which are indexed so
+    that searching by the start of each word does not scan every node.
+    """
+    return sorted({
+        word[:length]
+        for word in title_words(title or '')
+        for length in range(1, len(word) + 1)
+    })
+
+
 def validate_category(value):
     """Validator for Node#category. Makes sure that the value is one of the
     categories defined in CATEGORY_MAP.
@@ -566,6 +599,9 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         'category',
     ]
 
+    # Node fields shown on the project pages of its components
+    PARENT_VIEW_FIELDS = {'title', 'category', 'is_public'}
+
     _id = fields.StringField(primary=True)
 
     date_created = fields.DateTimeField(auto_now_add=datetime.datetime.utcnow, index=True)
@@ -621,10 +657,27 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
     logs = fields.ForeignField('nodelog', list=True, backref='logged')
     tags = fields.ForeignField('tag', list=True, backref='tagged')
 
+    # Activity summary of `logs`, maintained by `add_log`. `log_count` is None
+    # until the summary has been computed; see `scripts/migrate_log_summary.py`
+    log_count = fields.IntegerField()
+    last_log_date = fields.DateTimeField()
+    # Primary key of the user who made the most recent log
+    last_log_user = fields.StringField()
+    # Number of logs made by each user, by user primary key
+    user_log_counts = fields.DictionaryField()
+
+    # Lowercased tag ids; indexed for case-insensitive tag lookups
+    tag_keys = fields.StringField(list=True, index=True)
+
+    # Prefixes of the normalized words of the title; see `title_tokens`
+    title_tokens = fields.StringField(list=True, index=True)
+
     # Tags for internal use
     system_tags = fields.StringField(list=True)
 
     nodes = fields.AbstractForeignField(list=True, backref='parent')
+    # Folders only: maps the id of each node pointed at to its pointer's id
+    pointer_targets = fields.DictionaryField()
     forked_from = fields.ForeignField('node', backref='forked', index=True)
     registered_from = fields.ForeignField('node', backref='registrations', index=True)
 
@@ -772,6 +825,13 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         return list(self.node__forked.find(Q('is_deleted', 'eq', False) &
                                            Q('is_registration', 'ne', True)))
 
+    @property
+    def registrations(self):
+        """List of registrations of this node; registrations still being made
+        are saved as deleted and are excluded
+        """
+        return list(self.node__registrations.find(Q('is_deleted', 'eq', False)))
+
     def add_permission(self, user, permission, save=False):
         """Grant permission to a user.
 
@@ -875,10 +935,7 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
 
     @property
     def visible_contributors(self):
-        return [
-            User.load(_id)
-            for _id in self.visible_contributor_ids
-        ]
+        return load_many(User, self.visible_contributor_ids)
 
     @property
     def parents(self):
@@ -901,7 +958,7 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
     @property
     def admin_contributors(self):
         return sorted(
-            [User.load(_id) for _id in self.admin_contributor_ids],
+            load_many(User, self.admin_contributor_ids),
             key=lambda user: user.family_name,
         )
 
@@ -1027,6 +1084,14 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         else:
             suppress_log = False
 
+        tag_keys = sorted({tag.lower() for tag in self.tags._to_primary_keys()})
+        if tag_keys != list(self.tag_keys):
+            self.tag_keys = tag_keys
+
+        tokens = title_tokens(self.title)
+        if tokens != list(self.title_tokens):
+            self.title_tokens = tokens
+
         saved_fields = super(Node, self).save(*args, **kwargs)
 
         if first_save and is_original and not suppress_log:
@@ -1064,6 +1129,10 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
                 need_update = False
         if self.is_folder:
             need_update = False
+        # Deleted nodes were removed from search when they were deleted, and
+        # nodes created deleted were never added
+        if self.is_deleted and (first_save or 'is_deleted' not in saved_fields):
+            need_update = False
         if need_update:
             self.update_search()
 
@@ -1071,9 +1140,29 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         if settings.PIWIK_HOST and update_piwik:
             piwik_tasks.update_node(self._id, saved_fields)
 
+        if saved_fields:
+            view_cache.invalidate(*self._view_cache_dependents(saved_fields))
+            node_saved.send(self, saved_fields=saved_fields)
+
         # Return expected value for StoredObject::save
         return saved_fields
 
+    def _view_cache_dependents(self, saved_fields):
+        """Primary keys of the nodes whose cached project page shows any of
+        ``saved_fields``.
+        """
+        node_ids = [self._id]
+        # Originals show how many forks, registrations and templated copies
+        # they have
+        for field in ('forked_from', 'registered_from', 'template_node'):
+            related = getattr(self, field)
+            if field in saved_fields and related is not None:
+                node_ids.append(related._id)
+        # Components show the title and visibility of their parent
+        if self.PARENT_VIEW_FIELDS.intersection(saved_fields):
+            node_ids.extend(child._id for child in self.nodes_primary)
+        return node_ids
+
     ######################################
     # Methods that return a new instance #
     ######################################
@@ -1205,6 +1294,9 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         pointer = Pointer(node=node)
         pointer.save()
         self.nodes.append(pointer)
+        if self.is_folder:
+            self.pointer_targets[node._id] = pointer._id
+        view_cache.invalidate(node._id)
 
         # Add log
         self.add_log(
@@ -1241,6 +1333,9 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         # Remove `Pointer` object; will also remove self from `nodes` list of
         # parent node
         Pointer.remove_one(pointer)
+        if self.is_folder:
+            self.pointer_targets.pop(pointer.node._id, None)
+        view_cache.invalidate(pointer.node._id)
 
         # Add log
         self.add_log(
@@ -1340,6 +1435,8 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         :param Node pointed_node_id: The node id of the node being pointed at.
         :return: pointer_id
         """
+        if self.is_folder:
+            return self.pointer_targets.get(pointed_node_id)
         for pointer in self.nodes_pointer:
             node_id = pointer.node._id
             if node_id == pointed_node_id:
@@ -1389,6 +1486,8 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
             raise ValueError('Could not fork node')
 
         self.nodes[index] = forked
+        if self.is_folder:
+            self.pointer_targets.pop(node._id, None)
 
         # Add log
         self.add_log(
@@ -1431,10 +1530,59 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         '''The most recent datetime when this node was modified, based on
         the logs.
         '''
-        try:
-            return self.logs[-1].date
-        except IndexError:
+        self._ensure_log_summary()
+        return self.last_log_date
+
+    @property
+    def last_modified_by_id(self):
+        self._ensure_log_summary()
+        return self.last_log_user
+
+    @property
+    def last_modified_by(self):
+        """The user who made the most recent log, if any."""
+        user_id = self.last_modified_by_id
+        if user_id is None:
             return None
+        return User.load(user_id)
+
+    @property
+    def total_log_count(self):
+        self._ensure_log_summary()
+        return self.log_count
+
+    def get_user_log_count(self, user):
+        """Number of this node's logs made by ``user``."""
+        self._ensure_log_summary()
+        if user is None:
+            return 0
+        return self.user_log_counts.get(user._primary_key, 0)
+
+    def _ensure_log_summary(self):
+        # Nodes that have not been backfilled yet compute their summary on
+        # first use; it is saved with the next save of the node
+        if self.log_count is None:
+            self.compute_log_summary()
+
+    def compute_log_summary(self):
+        """Recompute the activity summary from all of the node's logs."""
+        self.log_count = 0
+        self.last_log_date = None
+        self.last_log_user = None
+        self.user_log_counts = {}
+        for log in load_many(NodeLog, self.logs._to_primary_keys()):
+            if log is not None:
+                self._update_log_summary(log)
+
+    def _update_log_summary(self, log):
+        user_id = log.to_storage().get('user')
+        self.log_count = (self.log_count or 0) + 1
+        self.last_log_date = log.date
+        self.last_log_user = user_id
+        if user_id is not None:
+            counts = dict(self.user_log_counts or {})
+            counts[user_id] = counts.get(user_id, 0) + 1
+            self.user_log_counts = counts
 
     def set_title(self, title, auth, save=False):
         """Set the title of this Node and log it.
@@ -1493,6 +1641,16 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
             logger.exception(e)
             log_exception()
 
+    @staticmethod
+    def bulk_update_search(nodes):
+        """Update the search entries of ``nodes`` in a single request."""
+        from website import search
+        try:
+            search.search.update_nodes(nodes)
+        except search.exceptions.SearchUnavailableError as e:
+            logger.exception(e)
+            log_exception()
+
     def delete_search_entry(self):
         from website import search
         try:
@@ -1573,6 +1731,19 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         :param str title: Optional text to prepend to forked title
         :return: Forked node
         """
+        pairs = []
+        forked = self._fork_tree(auth, title, False, pairs)
+        for message in self._fork_addons(pairs, auth.user):
+            status.push_status_message(message)
+        return forked
+
+    def _fork_tree(self, auth, title, hidden, pairs):
+        """Fork this node and its children, appending ``(original, forked)``
+        pairs to ``pairs``; addons are forked by `_fork_addons`.
+
+        :param bool hidden: Save forked nodes as deleted; see
+            `website.project.forking`
+        """
         user = auth.user
 
         # Non-contributors can't fork private nodes
@@ -1597,7 +1768,7 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         for node_contained in original.nodes:
             forked_node = None
             try:  # Catch the potential PermissionsError above
-                forked_node = node_contained.fork_node(auth=auth, title='')
+                forked_node = node_contained._fork_tree(auth, '', hidden, pairs)
             except PermissionsError:
                 pass  # If this exception is thrown omit the node from the result set
             if forked_node is not None:
@@ -1610,6 +1781,8 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         forked.forked_from = original
         forked.creator = user
         forked.piwik_site_id = None
+        if hidden:
+            forked.is_deleted = True
 
         # Forks default to private status
         forked.is_public = False
@@ -1633,100 +1806,53 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         )
 
         forked.save()
-        # After fork callback
-        for addon in original.get_addons():
-            _, message = addon.after_fork(original, forked, user)
-            if message:
-                status.push_status_message(message)
+        pairs.append((original, forked))
 
         return forked
 
+    @staticmethod
+    def _fork_addons(pairs, user, progress=None):
+        """Run the after fork callbacks of the ``(original, forked)`` pairs,
+        one addon at a time, and return their messages.
+
+        :param progress: Optional callback, called with the numbers of
+            callbacks run and to run
+        """
+        callbacks = OrderedDict()
+        for original, forked in pairs:
+            for addon in original.get_addons():
+                callbacks.setdefault(addon.config.short_name, []).append(
+                    (addon, original, forked)
+                )
+        total = sum(len(batch) for batch in callbacks.values())
+        done = 0
+        messages = []
+        for batch in callbacks.values():
+            for addon, original, forked in batch:
+                _, message = addon.after_fork(original, forked, user)
+                if message:
+                    messages.append(message)
+                done += 1
+                if progress:
+                    progress(done, total)
+        return messages
+
     def register_node(self, schema, auth, template, data):
-        """Make a frozen copy of a node.
+        """Make a frozen copy of a node. Registrations requested by users are
+        made in the background; see `website.project.registering`.
 
         :param schema: Schema object
         :param auth: All the auth information including user, API key.
         :template: Template name
         :data: Form data
         """
-        # NOTE: Admins can register child nodes even if they don't have write access them
-        if not self.can_edit(auth=auth) and not self.is_admin_parent(user=auth.user):
-            raise PermissionsError(
-                'User {} does not have permission '
-                'to register this node'.format(auth.user._id)
-            )
-        if self.is_folder:
-            raise NodeStateError("Folders may not be registered")
+        from website.project import registering
 
-        template = urllib.unquote_plus(template)
-        template = to_mongo(template)
-
-        when = datetime.datetime.utcnow()
-
-        original = self.load(self._primary_key)
-
-        # Note: Cloning a node copies its `wiki_pages_current` and
-        # `wiki_pages_versions` fields, but does not clone the underlying
-        # database objects to which these dictionaries refer. This means that
-        # the cloned node must pass itself to its wiki objects to build the
-        # correct URLs to that content.
-        if original.is_deleted:
-            raise NodeStateError('Cannot register deleted node.')
-
-        registered = original.clone()
-
-        registered.is_registration = True
-        registered.registered_date = when
-        registered.registered_user = auth.user
-        registered.registered_schema = schema
-        registered.registered_from = original
-        if not registered.registered_meta:
-            registered.registered_meta = {}
-        registered.registered_meta[template] = data
-
-        registered.contributors = self.contributors
-        registered.forked_from = self.forked_from
-        registered.creator = self.creator
-        registered.logs = self.logs
-        registered.tags = self.tags
-        registered.piwik_site_id = None
-
-        registered.save()
-
-        # After register callback
-        for addon in original.get_addons():
-            _, message = addon.after_register(original, registered, auth.user)
-            if message:
-                status.push_status_message(message)
-
-        registered.nodes = []
-
-        for node_contained in original.nodes:
-            if not node_contained.is_deleted:
-                registered_node = node_contained.register_node(
-                    schema, auth, template, data
-                )
-                if registered_node is not None:
-                    registered.nodes.append(registered_node)
-
-        original.add_log(
-            action=NodeLog.PROJECT_REGISTERED,
-            params={
-                'parent_node': original.parent_id,
-                'node': original._primary_key,
-                'registration': registered._primary_key,
-            },
-            auth=auth,
-            log_date=when,
-            save=False,
-        )
-        original.save()
-
-        registered.save()
-        for node in registered.nodes:
-            node.update_search()
-
-        return registered
+        job = registering.create_job(self, schema, auth, template, data)
+        registering.run_stages(job)
+        for message in job.messages:
+            status.push_status_message(message)
+        return self.load(job.registration)
 
     def remove_tag(self, tag, auth, save=True):
         if tag in self.tags:
@@ -1778,7 +1904,9 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         if log_date:
             log.date = log_date
         log.save()
+        self._ensure_log_summary()
         self.logs.append(log)
+        self._update_log_summary(log)
         if save:
             self.save()
         if user:
@@ -1928,6 +2056,8 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         """
         ret = AddonModelMixin.add_addon(self, addon_name, auth=auth,
                                         *args, **kwargs)
+        if ret:
+            view_cache.invalidate(self._id)
         if ret and log:
             config = settings.ADDONS_AVAILABLE_DICT[addon_name]
             self.add_log(
@@ -1955,6 +2085,7 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
         """
         ret = super(Node, self).delete_addon(addon_name, auth, _force)
         if ret:
+            view_cache.invalidate(self._id)
             config = settings.ADDONS_AVAILABLE_DICT[addon_name]
             self.add_log(
                 action=NodeLog.ADDON_REMOVED,
@@ -1970,6 +2101,10 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
             # TODO: save here or outside the conditional? @mambocab
         return ret
 
+    def set_identifier_value(self, category, value):
+        super(Node, self).set_identifier_value(category, value)
+        view_cache.invalidate(self._id)
+
     def callback(self, callback, recursive=False, *args, **kwargs):
         """Invoke callbacks of attached add-ons and collect messages.
 
@@ -2066,126 +2201,66 @@ class Node(GuidStoredObject, AddonModelMixin, IdentifierMixin):
 
         return True
 
-    def remove_contributors(self, contributors, auth=None, log=True, save=False):
-
-        results = []
-        removed = []
+    def remove_contributors(self, contributors, auth):
+        """Remove contributors with one log and a single save; see
+        `website.project.contributor_changes`.
 
-        for contrib in contributors:
-            outcome = self.remove_contributor(
-                contributor=contrib, auth=auth, log=False,
-            )
-            results.append(outcome)
-            removed.append(contrib._id)
-        if log:
-            self.add_log(
-                action=NodeLog.CONTRIB_REMOVED,
-                params={
-                    'project': self.parent_id,
-                    'node': self._primary_key,
-                    'contributors': removed,
-                },
-                auth=auth,
-                save=False,
-            )
-
-        if save:
-            self.save()
+        :param list contributors: Users to remove
+        :param Auth auth: Consolidated authentication information
+        :returns: False if no registered admin contributor would remain, else
+            True
+        """
+        from website.project import contributor_changes
 
-        if False in results:
+        try:
+            delta = contributor_changes.compute_delta(self, remove=contributors)
+        except ValueError:
             return False
-
+        contributor_changes.apply_deltas([delta], auth)
         return True
 
-    def manage_contributors(self, user_dicts, auth, save=False):
-        """Reorder and remove contributors.
+    def manage_contributors(self, user_dicts, auth):
+        """Reorder and remove contributors, and update their permissions and
+        visibility, with one log per kind of change and a single save; see
+        `website.project.contributor_changes`.
 
         :param list user_dicts: Ordered list of contributors represented as
             dictionaries of the form:
             {'id': <id>, 'permission': <One of 'read', 'write', 'admin'>, 'visible': bool}
         :param Auth auth: Consolidated authentication information
-        :param bool save: Save changes
         :raises: ValueError if any users in `users` not in contributors or if
             no admin contributors remaining
         """
-        with TokuTransaction():
-            users = []
-            user_ids = []
-            permissions_changed = {}
-            to_retain = []
-            to_remove = []
-            for user_dict in user_dicts:
-                user = User.load(user_dict['id'])
-                if user is None:
-                    raise ValueError('User not found')
-                if user not in self.contributors:
-                    raise ValueError(
-                        'User {0} not in contributors'.format(user.fullname)
-                    )
-                permissions = expand_permissions(user_dict['permission'])
-                if set(permissions) != set(self.get_permissions(user)):
-                    self.set_permissions(user, permissions, save=False)
-                    permissions_changed[user._id] = permissions
-                self.set_visible(user, user_dict['visible'], auth=auth)
-                users.append(user)
-                user_ids.append(user_dict['id'])
-
-            for user in self.contributors:
-                if user._id in user_ids:
-                    to_retain.append(user)
-                else:
-                    to_remove.append(user)
-
-            # TODO: Move to validator or helper @jmcarp
-            admins = [
-                user for user in users
-                if self.has_permission(user, 'admin')
-                and user.is_registered
-            ]
-            if users is None or not admins:
+        from website.project import contributor_changes
+
+        order = []
+        permissions = {}
+        visible = {}
+        for user_dict in user_dicts:
+            user = User.load(user_dict['id'])
+            if user is None:
+                raise ValueError('User not found')
+            if user not in self.contributors:
                 raise ValueError(
-                    'Must have at least one registered admin contributor'
-                )
-
-            if to_retain != users:
-                self.add_log(
-                    action=NodeLog.CONTRIB_REORDERED,
-                    params={
-                        'project': self.parent_id,
-                        'node': self._id,
-                        'contributors': [
-                            user._id
-                            for user in users
-                        ],
-                    },
-                    auth=auth,
-                    save=False,
+                    'User {0} not in contributors'.format(user.fullname)
                 )
-
-            if to_remove:
-                self.remove_contributors(to_remove, auth=auth, save=False)
-
-            self.contributors = users
-
-            if permissions_changed:
-                self.add_log(
-                    action=NodeLog.PERMISSIONS_UPDATED,
-                    params={
-                        'project': self.parent_id,
-                        'node': self._id,
-                        'contributors': permissions_changed,
-                    },
-                    auth=auth,
-                    save=False,
-                )
-            # Update list of visible IDs
-            self.update_visible_ids()
-            if save:
-                self.save()
+            order.append(user._id)
+            permissions[user._id] = expand_permissions(user_dict['permission'])
+            visible[user._id] = user_dict['visible']
+        remove = [
+            contributor for contributor in self.contributors
+            if contributor._id not in order
+        ]
 
         with TokuTransaction():
-            if to_remove or permissions_changed and ['read'] in permissions_changed.values():
-                write_permissions_revoked.send(self)
+            delta = contributor_changes.compute_delta(
+                self,
+                remove=remove,
+                permissions=permissions,
+                visible=visible,
+                order=order,
+            )
+            contributor_changes.apply_deltas([delta], auth)
 
     def add_contributor(self, contributor, permissions=None, visible=True,
                         auth=None, log=True, save=False):
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""Registration of projects in the background.
+
+A registration request checks permissions and snapshots the tree of nodes to
+register into a `RegistrationJob`, then queues the job. The job runs in
+stages, and records its progress after each node, so that a failed stage can
+be retried without registering any node twice:
+
+- `clone`: freeze each node of the snapshot, children before parents
+- `archive`: run the after register callbacks of each addon on every node
+- `finalize`: log the registration on each original node, and make the
+  registrations visible
+- `index`: update the search entries of the registrations in one request
+
+As with forks (see `website.project.forking`), registrations are saved as
+deleted until they are complete.
+"""
+import urllib
+import logging
+import datetime
+from collections import OrderedDict
+
+from modularodm import fields
+
+from framework.auth import Auth, User
+from framework.mongo import ObjectId
+from framework.mongo import StoredObject
+from framework.mongo.utils import to_mongo
+from framework.exceptions import PermissionsError
+
+from website.exceptions import NodeStateError
+from website.project import view_cache
+from website.project import smart_folders
+from website.project.model import Node, NodeLog, MetaSchema, Pointer
+
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrationJob(StoredObject):
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
+
+    STAGES = ('clone', 'archive', 'finalize', 'index')
+
+    _id = fields.StringField(primary=True, default=lambda: str(ObjectId()))
+    # Primary keys of the registered node, the user registering it, the
+    # schema and the registration
+    node = fields.StringField(required=True)
+    user = fields.StringField(required=True)
+    schema = fields.StringField()
+    registration = fields.StringField()
+    template = fields.StringField()
+    data = fields.StringField()
+    registered_date = fields.DateTimeField()
+
+    status = fields.StringField(default=PENDING)
+    # Stage in progress, or that failed
+    stage = fields.StringField(default=STAGES[0])
+
+    # Snapshot of the tree: primary keys of the nodes to register, children
+    # first; the nodes and pointers in each node; and the pointers
+    order = fields.StringField(list=True)
+    children = fields.DictionaryField()
+    pointers = fields.StringField(list=True)
+
+    # Progress: registrations by original node, the after register callbacks
+    # run, as `<node id>:<addon>`, and the original nodes logged
+    registered = fields.DictionaryField()
+    archived = fields.StringField(list=True)
+    addons_total = fields.IntegerField(default=0)
+    logged = fields.StringField(list=True)
+
+    # Status messages of addons, shown once the registration is complete
+    messages = fields.StringField(list=True)
+    date_created = fields.DateTimeField(auto_now_add=datetime.datetime.utcnow)
+    date_modified = fields.DateTimeField(auto_now=datetime.datetime.utcnow)
+
+    def to_json(self):
+        return {
+            'id': self._id,
+            'status': self.status,
+            'stage': self.stage,
+            'nodes': len(self.order),
+            'nodesDone': len(self.registered),
+            'addonsDone': len(self.archived),
+            'addonsTotal': self.addons_total,
+        }
+
+
+def _snapshot(node, auth, job):
+    # NOTE: Admins can register child nodes even if they don't have write access them
+    if not node.can_edit(auth=auth) and not node.is_admin_parent(user=auth.user):
+        raise PermissionsError(
+            'User {} does not have permission '
+            'to register this node'.format(auth.user._id)
+        )
+    if node.is_folder:
+        raise NodeStateError("Folders may not be registered")
+    if node.is_deleted:
+        raise NodeStateError('Cannot register deleted node.')
+    children = []
+    for node_contained in node.nodes:
+        if node_contained.is_deleted:
+            continue
+        children.append(node_contained._id)
+        if node_contained.primary:
+            _snapshot(node_contained, auth, job)
+        else:
+            job.pointers.append(node_contained._id)
+    job.children[node._id] = children
+    job.order.append(node._id)
+
+
+def create_job(node, schema, auth, template, data):
+    """Check that the user may register ``node`` and snapshot its tree.
+
+    :raises: PermissionsError if the user may not register a node of the tree
+    :raises: NodeStateError if the node is a folder or is deleted
+    :return: The saved `RegistrationJob`
+    """
+    job = RegistrationJob(
+        node=node._id,
+        user=auth.user._id,
+        schema=schema._id if schema else None,
+        template=to_mongo(urllib.unquote_plus(template)),
+        data=data,
+        registered_date=datetime.datetime.utcnow(),
+    )
+    _snapshot(node, auth, job)
+    job.save()
+    return job
+
+
+def start_registration(node, schema, auth, template, data):
+    """Snapshot the tree of ``node`` and queue its registration."""
+    from website.project.tasks import register_node_job
+
+    job = create_job(node, schema, auth, template, data)
+    register_node_job(job._id)
+    return job
+
+
+def retry(job):
+    """Queue a failed job again, from the stage that failed."""
+    from website.project.tasks import register_node_job
+
+    job.status = RegistrationJob.PENDING
+    job.save()
+    register_node_job(job._id)
+
+
+def clone(job, auth):
+    schema = MetaSchema.load(job.schema) if job.schema else None
+    for node_id in job.order:
+        if node_id in job.registered:
+            continue
+        original = Node.load(node_id)
+
+        # Note: Cloning a node copies its `wiki_pages_current` and
+        # `wiki_pages_versions` fields, but does not clone the underlying
+        # database objects to which these dictionaries refer. This means that
+        # the cloned node must pass itself to its wiki objects to build the
+        # correct URLs to that content.
+        registered = original.clone()
+
+        registered.is_registration = True
+        registered.registered_date = job.registered_date
+        registered.registered_user = auth.user
+        registered.registered_schema = schema
+        registered.registered_from = original
+        if not registered.registered_meta:
+            registered.registered_meta = {}
+        registered.registered_meta[job.template] = job.data
+
+        registered.contributors = original.contributors
+        registered.forked_from = original.forked_from
+        registered.creator = original.creator
+        registered.logs = original.logs
+        registered.tags = original.tags
+        registered.piwik_site_id = None
+        # Hidden until the registration is complete
+        registered.is_deleted = True
+
+        # Children are registered first; pointers are copied
+        registered.nodes = []
+        for child_id in job.children[node_id]:
+            if child_id in job.pointers:
+                child = Pointer.load(child_id)._clone()
+            else:
+                child = Node.load(job.registered[child_id])
+            if child is not None:
+                registered.nodes.append(child)
+
+        registered.save()
+        job.registered[node_id] = registered._id
+        job.save()
+    job.registration = job.registered[job.node]
+
+
+def archive(job, auth):
+    callbacks = OrderedDict()
+    for node_id in job.order:
+        original = Node.load(node_id)
+        registered = Node.load(job.registered[node_id])
+        for addon in original.get_addons():
+            callbacks.setdefault(addon.config.short_name, []).append(
+                (addon, original, registered)
+            )
+    job.addons_total = sum(len(batch) for batch in callbacks.values())
+    job.save()
+    for short_name, batch in callbacks.items():
+        for addon, original, registered in batch:
+            key = '{0}:{1}'.format(original._id, short_name)
+            if key in job.archived:
+                continue
+            _, message = addon.after_register(original, registered, auth.user)
+            if message:
+                job.messages.append(message)
+            job.archived.append(key)
+            job.save()
+
+
+def finalize(job, auth):
+    for node_id in job.order:
+        if node_id in job.logged:
+            continue
+        original = Node.load(node_id)
+        original.add_log(
+            action=NodeLog.PROJECT_REGISTERED,
+            params={
+                'parent_node': original.parent_id,
+                'node': original._primary_key,
+                'registration': job.registered[node_id],
+            },
+            auth=auth,
+            log_date=job.registered_date,
+            save=False,
+        )
+        original.save()
+        job.logged.append(node_id)
+        job.save()
+    registration_ids = job.registered.values()
+    Node._storage[0].store.update(
+        {'_id': {'$in': registration_ids}},
+        {'$set': {'is_deleted': False}},
+        multi=True,
+    )
+    # Keep loaded registrations in step with the database
+    for node_id, registration_id in job.registered.items():
+        registration = Node.load(registration_id)
+        registration.is_deleted = False
+        # Revealed registrations were not saved, so count them and bump the
+        # cached pages of the registrations and of the originals, which show
+        # the number of registrations, here
+        smart_folders.update_node(registration)
+        view_cache.invalidate(node_id, registration_id)
+
+
+def index(job, auth):
+    Node.bulk_update_search([
+        Node.load(registration_id)
+        for registration_id in job.registered.values()
+    ])
+
+
+STAGE_FUNCTIONS = {
+    'clone': clone,
+    'archive': archive,
+    'finalize': finalize,
+    'index': index,
+}
+
+
+def run_stages(job):
+    """Run the job from its current stage; errors are raised."""
+    auth = Auth(User.load(job.user))
+    job.status = RegistrationJob.RUNNING
+    job.save()
+    start = RegistrationJob.STAGES.index(job.stage)
+    for stage in RegistrationJob.STAGES[start:]:
+        job.stage = stage
+        job.save()
+        STAGE_FUNCTIONS[stage](job, auth)
+    job.status = RegistrationJob.COMPLETE
+    job.save()
+
+
+def run_job(job):
+    """Run the job from its current stage, marking it as failed on errors."""
+    try:
+        run_stages(job)
+    except Exception:
+        logger.exception('Registration job {0} failed in stage {1}'.format(job._id, job.stage))
+        job.status = RegistrationJob.FAILED
+        job.save()
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""Per-user counts of the top-level projects and registrations shown in the
+dashboard's smart folders.
+
+A node is counted for a user who contributes to it if it is not deleted, and
+it is either a project with no parent, or a component whose parent is not a
+project counted for the user. The users each node was last counted for are
+recorded with the node. When a node changes, counts are incremented and
+decremented by the difference, so only users whose counts change are written
+and no backref queries are run. Only counts that have been built are updated;
+a user's counts are built from the records of their nodes on first read.
+"""
+import collections
+
+from pymongo.errors import DuplicateKeyError
+from modularodm import fields
+
+from framework.mongo import StoredObject
+
+
+PROJECTS = 'projects'
+REGISTRATIONS = 'registrations'
+
+
+class SmartFolderCounts(StoredObject):
+
+    # Primary key of the user
+    _id = fields.StringField(primary=True)
+    projects = fields.IntegerField(default=0)
+    registrations = fields.IntegerField(default=0)
+
+
+class SmartFolderNode(StoredObject):
+
+    # Primary key of the node
+    _id = fields.StringField(primary=True)
+    # Smart folder the node was last counted in, and the users it was
+    # counted for
+    folder = fields.StringField()
+    users = fields.StringField(list=True, index=True)
+
+
+def _counts():
+    return SmartFolderCounts._storage[0].store
+
+
+def _nodes():
+    return SmartFolderNode._storage[0].store
+
+
+def _folder(node):
+    if node.is_deleted or node.is_folder:
+        return None
+    return REGISTRATIONS if node.is_registration else PROJECTS
+
+
+def counted_users(node):
+    """Return ``(folder, user_ids)``: the smart folder ``node`` is counted in,
+    or None, and the ids of the users it is counted for.
+    """
+    folder = _folder(node)
+    if folder is None:
+        return None, set()
+    user_ids = set(node.contributors._to_primary_keys())
+    parent = node.node__parent[0] if node.node__parent else None
+    if node.category == 'project':
+        if parent is not None:
+            return None, set()
+        return folder, user_ids
+    # Components of a project counted for a user are shown under the project
+    if parent is not None and parent.category == 'project':
+        parent_folder, parent_ids = counted_users(parent)
+        if parent_folder == folder:
+            user_ids -= parent_ids
+    return folder, user_ids
+
+
+def compute_deltas(old_folder, old_ids, folder, user_ids):
+    """Return the changes to counts, as ``{folder: {user_id: delta}}``, when a
+    node counted in ``old_folder`` for ``old_ids`` is now counted in
+    ``folder`` for ``user_ids``.
+    """
+    deltas = collections.defaultdict(collections.Counter)
+    for user_id in old_ids:
+        deltas[old_folder][user_id] -= 1
+    for user_id in user_ids:
+        deltas[folder][user_id] += 1
+    return {
+        folder: {user_id: delta for user_id, delta in row.items() if delta}
+        for folder, row in deltas.items()
+    }
+
+
+def _apply(deltas):
+    """Apply ``{folder: {user_id: delta}}`` to the counts that have been
+    built, with one update per folder and delta.
+    """
+    for folder, row in deltas.items():
+        by_delta = collections.defaultdict(list)
+        for user_id, delta in row.items():
+            by_delta[delta].append(user_id)
+        for delta, user_ids in by_delta.items():
+            _counts().update(
+                {'_id': {'$in': user_ids}},
+                {'$inc': {folder: delta}},
+                multi=True,
+            )
+
+
+def update_node(node):
+    """Bring the counts up to date with a node's current state."""
+    folder, user_ids = counted_users(node)
+    user_ids = sorted(user_ids)
+    while True:
+        record = _nodes().find_one({'_id': node._id})
+        old_folder = record.get('folder') if record else None
+        old_ids = record.get('users', []) if record else []
+        if old_folder == folder and set(old_ids) == set(user_ids):
+            return
+        try:
+            result = _nodes().update(
+                {'_id': node._id, 'folder': old_folder, 'users': old_ids},
+                {'$set': {'folder': folder, 'users': user_ids}},
+                upsert=record is None,
+            )
+        except DuplicateKeyError:
+            # Another worker recorded the node first
+            continue
+        if result.get('n'):
+            break
+    _apply(compute_deltas(old_folder, old_ids, folder, user_ids))
+
+
+def update_tree(node):
+    """Update the counts of a node, and of its components, which are counted
+    according to whether the node is.
+    """
+    update_node(node)
+    if node.category != 'project':
+        return
+    for child in node.nodes:
+        if child.primary and child.category != 'project':
+            update_node(child)
+
+
+def _record_nodes(nodes):
+    """Bring the nodes that have not been recorded up to date."""
+    nodes = list(nodes)
+    recorded = {
+        record['_id']
+        for record in _nodes().find(
+            {'_id': {'$in': [node._id for node in nodes]}},
+            {'_id': True},
+        )
+    }
+    for node in nodes:
+        if node._id not in recorded:
+            update_node(node)
+
+
+def rebuild_user(user):
+    """Recompute a user's counts from the records of the nodes they are
+    counted for. Nodes that have not been recorded are brought up to date
+    first, so that a later change to them is not counted twice.
+    """
+    _record_nodes(user.node__contributed)
+    counts = {PROJECTS: 0, REGISTRATIONS: 0}
+    for record in _nodes().find({'users': user._id}, {'folder': True}):
+        counts[record['folder']] += 1
+    _counts().update({'_id': user._id}, {'$set': counts}, upsert=True)
+    return counts
+
+
+def get_counts(user):
+    """Return the user's smart folder counts, building them if they have not
+    been built yet.
+    """
+    record = _counts().find_one({'_id': user._id})
+    if record is None:
+        return rebuild_user(user)
+    return {
+        PROJECTS: record.get(PROJECTS, 0),
+        REGISTRATIONS: record.get(REGISTRATIONS, 0),
+    }
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Background upkeep of per-user data derived from the nodes users contribute
+to: the counts shown in the dashboard's smart folders, the co-contributor
+graph used for contributor suggestions, and public profile listings;
+background forking and registration of nodes; and the addon hooks and signals
+of contributor changes made in bulk.
+
+Smart folder counts are kept up to date from the changes to each node; see
+`website.project.smart_folders`.
+"""
+from framework.tasks import app
+from framework.auth.core import User
+from framework.auth import signals as auth_signals
+from framework.tasks.handlers import queued_task
+from framework.transactions.context import transaction
+
+from website.profile import public_nodes
+from website.project import forking
+from website.project import contributor_changes
+from website.project import registering
+from website.project import smart_folders
+from website.project import co_contributors
+from website.project.model import Node, node_saved
+
+
+# Node fields that decide whether and where a node is counted
+SMART_FOLDER_FIELDS = {
+    'contributors',
+    'category',
+    'nodes',
+    'is_deleted',
+    'is_folder',
+    'is_registration',
+}
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def update_smart_folder_counts(node_id):
+    node = Node.load(node_id)
+    if node is None:
+        return
+    smart_folders.update_tree(node)
+
+
+@node_saved.connect
+def update_node_smart_folder_counts(node, saved_fields):
+    if node.is_folder or not SMART_FOLDER_FIELDS.intersection(saved_fields):
+        return
+    update_smart_folder_counts(node._id)
+
+
+@auth_signals.contributor_removed.connect
+def update_removed_contributor_listing(contributor, node):
+    update_public_node_listing(contributor._id)
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def update_co_contributor_graph(node_id):
+    node = Node.load(node_id)
+    if node is None:
+        return
+    co_contributors.update_node(node._id, node.contributors._to_primary_keys())
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def rebuild_co_contributor_row(user_id):
+    user = User.load(user_id)
+    if user is None:
+        return
+    co_contributors.rebuild_user(user)
+
+
+@node_saved.connect
+def update_node_co_contributors(node, saved_fields):
+    if 'contributors' in saved_fields:
+        update_co_contributor_graph(node._id)
+
+
+@auth_signals.user_status_changed.connect
+def update_user_co_contributors(user):
+    rebuild_co_contributor_row(user._id)
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def update_public_node_listing(user_id):
+    user = User.load(user_id)
+    if user is None:
+        return
+    public_nodes.refresh_listing(user)
+
+
+@node_saved.connect
+def update_contributor_listings(node, saved_fields):
+    if node.is_folder or not public_nodes.LISTING_FIELDS.intersection(saved_fields):
+        return
+    for user_id in node.contributors._to_primary_keys():
+        update_public_node_listing(user_id)
+
+
+@queued_task
+@app.task(ignore_result=True)
+def fork_node_job(job_id):
+    # Not run in a transaction, so that progress is visible while it runs;
+    # see `website.project.forking`
+    job = forking.ForkJob.load(job_id)
+    if job is None:
+        return
+    forking.run_job(job)
+
+
+@queued_task
+@app.task(ignore_result=True)
+def register_node_job(job_id):
+    # Not run in a transaction, so that progress is visible while it runs
+    # and completed stages are kept if a later one fails; see
+    # `website.project.registering`
+    job = registering.RegistrationJob.load(job_id)
+    if job is None:
+        return
+    registering.run_job(job)
+
+
+@queued_task
+@app.task(ignore_result=True)
+@transaction()
+def run_contributor_hooks(changes, user_id):
+    user = User.load(user_id) if user_id else None
+    contributor_changes.run_hooks(changes, user)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Shared cache of the user-independent part of the project page view model.
+
+Each entry has a version stamp that is bumped whenever something shown on the
+page changes: saving the node, forking, registering or templating it, pointing
+to it, watching it, or changing its add-ons. A cached payload is served only
+while it was built at the current version, so workers never serve data older
+than the last change. Entries also expire after
+`settings.PROJECT_VIEW_CACHE_TTL` seconds, to bound the damage of a change that
+does not bump the version.
+"""
+import json
+import datetime
+
+import pymongo
+from pymongo.errors import DuplicateKeyError
+from modularodm import fields
+
+from framework.mongo import StoredObject
+
+from website import settings
+from website.util import metrics
+
+
+class ProjectViewCache(StoredObject):
+
+    __indices__ = [
+        {
+            'key_or_list': [('date_built', pymongo.ASCENDING)],
+            'expireAfterSeconds': settings.PROJECT_VIEW_CACHE_TTL,
+        }
+    ]
+
+    # Primary key of the node
+    _id = fields.StringField(primary=True)
+    version = fields.IntegerField(default=0)
+    # Version the payload was built at
+    data_version = fields.IntegerField()
+    # JSON-encoded payload
+    data = fields.StringField()
+    date_built = fields.DateTimeField()
+
+
+def _collection():
+    return ProjectViewCache._storage[0].store
+
+
+def invalidate(*node_ids):
+    """Bump the version stamp of each node's cached view model."""
+    for node_id in node_ids:
+        if node_id is None:
+            continue
+        _collection().update(
+            {'_id': node_id},
+            {'$inc': {'version': 1}},
+            upsert=True,
+        )
+
+
+def get(node_id):
+    """Return ``(version, payload)`` for a node; ``payload`` is None unless
+    a payload built at the current version is cached.
+    """
+    record = _collection().find_one({'_id': node_id})
+    if record is None:
+        metrics.increment('project_view_cache.miss')
+        return 0, None
+    version = record.get('version', 0)
+    if record.get('data_version') != version or record.get('data') is None:
+        metrics.increment('project_view_cache.miss')
+        return version, None
+    metrics.increment('project_view_cache.hit')
+    return version, json.loads(record['data'])
+
+
+def store(node_id, version, payload):
+    """Cache a payload built at ``version``. Does nothing if the version has
+    been bumped since, so that a concurrent change is never overwritten.
+    """
+    try:
+        _collection().update(
+            {'_id': node_id, 'version': version},
+            {
+                '$set': {
+                    'data': json.dumps(payload),
+                    'data_version': version,
+                    'date_built': datetime.datetime.utcnow(),
+                },
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # Version was bumped after the payload was built
+        pass
+
+
+def get_or_build(node_id, build):
+    """Return the cached payload for a node, calling ``build()`` and caching
+    its result on a miss.
+    """
+    version, payload = get(node_id)
+    if payload is None:
+        payload = build()
+        store(node_id, version, payload)
+    return payload
@@ -6,6 +6,8 @@ import pytz
 from flask import request
 from modularodm import Q
 
+from framework.auth import User
+from framework.mongo import loader
 from framework.exceptions import HTTPError
 from framework.auth.decorators import must_be_logged_in
 from framework.auth.utils import privacy_info_handle
@@ -102,10 +104,11 @@ def serialize_comment(comment, auth, anonymous=False):
 
 
 def serialize_comments(record, auth, anonymous=False):
-
+    comments = list(getattr(record, 'commented', []))
+    loader.load_many(User, loader.foreign_keys(comments, 'user'))
     return [
         serialize_comment(comment, auth, anonymous)
-        for comment in getattr(record, 'commented', [])
+        for comment in comments
     ]
 
 
@@ -12,6 +12,7 @@ from framework import status
 from framework.auth import cas
 from framework.flask import redirect  # VOL-aware redirect
 from framework.sessions import session
+from framework.mongo.loader import load_many
 from framework.auth import User, get_user
 from framework.exceptions import HTTPError
 from framework.auth.signals import user_registered
@@ -26,6 +27,8 @@ from website import security
 from website import settings
 from website.models import Node
 from website.profile import utils
+from website.project import co_contributors
+from website.project import contributor_changes
 from website.project.model import has_anonymous_link
 from website.util import web_url_for, is_json_request
 from website.project.model import unreg_contributor_added
@@ -41,10 +44,10 @@ def get_node_contributors_abbrev(auth, node, **kwargs):
 
     max_count = kwargs.get('max_count', 3)
     if 'user_ids' in kwargs:
-        users = [
-            User.load(user_id) for user_id in kwargs['user_ids']
+        users = load_many(User, [
+            user_id for user_id in kwargs['user_ids']
             if user_id in node.visible_contributor_ids
-        ]
+        ])
     else:
         users = node.visible_contributors
 
@@ -102,8 +105,9 @@ def get_contributors(auth, node, **kwargs):
     # Limit is either an int or None:
     # if int, contribs list is sliced to specified length
     # if None, contribs list is not sliced
+    visible_contributors = node.visible_contributors
     contribs = utils.serialize_contributors(
-        node.visible_contributors[0:limit],
+        visible_contributors[0:limit],
         node=node,
     )
 
@@ -111,7 +115,7 @@ def get_contributors(auth, node, **kwargs):
     if limit:
         return {
             'contributors': contribs,
-            'more': max(0, len(node.visible_contributors) - limit)
+            'more': max(0, len(visible_contributors) - limit)
         }
     else:
         return {'contributors': contribs}
@@ -146,19 +150,21 @@ def get_most_in_common_contributors(auth, node, **kwargs):
     except (TypeError, ValueError):
         n_contribs = settings.MAX_MOST_IN_COMMON_LENGTH
 
-    contrib_counts = Counter(contrib_id
-        for node in auth.user.node__contributed
-        for contrib_id in node.contributors._to_primary_keys()
-        if contrib_id not in node_contrib_ids)
+    # Only active users are kept in the co-contributor graph
+    contrib_counts = Counter({
+        contrib_id: count
+        for contrib_id, count in co_contributors.get_or_build_counts(auth.user).items()
+        if contrib_id not in node_contrib_ids
+    })
 
-    active_contribs = itertools.ifilter(
-        lambda c: User.load(c[0]).is_active,
-        contrib_counts.most_common()
-    )
-
-    limited = itertools.islice(active_contribs, n_contribs)
+    limited = contrib_counts.most_common(n_contribs)
+    users = load_many(User, [_id for _id, count in limited])
 
-    contrib_objs = [(User.load(_id), count) for _id, count in limited]
+    contrib_objs = [
+        (user, count)
+        for user, (_id, count) in zip(users, limited)
+        if user is not None
+    ]
 
     contribs = [
         utils.add_contributor_json(most_contrib, auth.user)
@@ -234,9 +240,7 @@ def project_removecontributor(auth, node, **kwargs):
         if auth.user != contributor:
             raise HTTPError(http.FORBIDDEN)
 
-    outcome = node.remove_contributor(
-        contributor=contributor, auth=auth,
-    )
+    outcome = node.remove_contributors([contributor], auth=auth)
 
     if outcome:
         if auth.user == contributor:
@@ -330,24 +334,33 @@ def project_contributors_post(auth, node, **kwargs):
     if user_dicts is None or node_ids is None:
         raise HTTPError(http.BAD_REQUEST)
 
-    # Prepare input data for `Node::add_contributors`
+    # Prepare input data; unregistered users are only emailed about `node`
     contribs = deserialize_contributors(node, user_dicts, auth=auth)
-    node.add_contributors(contributors=contribs, auth=auth)
-    node.save()
-
-    # Disconnect listener to avoid multiple invite emails
-    unreg_contributor_added.disconnect(finalize_invitation)
-
+    child_ids = []
     for child_id in node_ids:
-        child = Node.load(child_id)
-        # Only email unreg users once
-        child_contribs = deserialize_contributors(
-            child, user_dicts, auth=auth
-        )
-        child.add_contributors(contributors=child_contribs, auth=auth)
-        child.save()
-    # Reconnect listener
-    unreg_contributor_added.connect(finalize_invitation)
+        if child_id != node._id and child_id not in child_ids:
+            child_ids.append(child_id)
+    children = [child for child in load_many(Node, child_ids) if child is not None]
+
+    # Record the invitations of unregistered users to the children
+    invited = {}
+    for child in children:
+        for contrib_dict, contrib in zip(user_dicts, contribs):
+            contributor = contrib['user']
+            if (not contributor.is_registered
+                    and child._primary_key not in contributor.unclaimed_records):
+                contributor.add_unclaimed_record(node=child, referrer=auth.user,
+                    given_name=contrib_dict['fullname'],
+                    email=contrib_dict.get('email'))
+                invited[contributor._id] = contributor
+    for contributor in invited.values():
+        contributor.save()
+
+    try:
+        deltas = contributor_changes.compute_deltas([node] + children, add=contribs)
+    except ValueError as error:
+        raise HTTPError(http.BAD_REQUEST, data={'message_long': error.message})
+    contributor_changes.apply_deltas(deltas, auth)
     return {'status': 'success'}, 201
 
 
@@ -370,7 +383,7 @@ def project_manage_contributors(auth, node, **kwargs):
 
     # Update permissions and order
     try:
-        node.manage_contributors(contributors, auth=auth, save=True)
+        node.manage_contributors(contributors, auth=auth)
     except ValueError as error:
         raise HTTPError(http.BAD_REQUEST, data={'message_long': error.message})
 
@@ -11,6 +11,7 @@ from framework.transactions.handlers import no_auto_transaction
 
 
 from website.views import serialize_log
+from website.views import serialize_logs
 from website.project.model import NodeLog
 from website.project.model import has_anonymous_link
 from website.project.decorators import must_be_valid_project
@@ -45,10 +46,11 @@ def _get_logs(node, count, auth, link=None, page=0):
     total = logs_set.count()
     start = page * count
     stop = start + count
-    logs = [
-        serialize_log(log, auth=auth, anonymous=has_anonymous_link(node, auth))
-        for log in logs_set[start:stop]
-    ]
+    logs = serialize_logs(
+        logs_set[start:stop],
+        auth=auth,
+        anonymous=has_anonymous_link(node, auth),
+    )
     pages = math.ceil(total / float(count))
     return logs, total, pages
 
@@ -2,7 +2,6 @@
 import logging
 import httplib as http
 import math
-from itertools import islice
 
 from flask import request
 from modularodm import Q
@@ -21,6 +20,8 @@ from website.util import paths
 from website.util import rubeus
 from website.exceptions import NodeStateError
 from website.project import clean_template_name, new_node, new_private_link
+from website.project import forking
+from website.project import view_cache
 from website.project.decorators import (
     must_be_contributor_or_public,
     must_be_contributor,
@@ -30,7 +31,7 @@ from website.project.decorators import (
 )
 from website.util.permissions import ADMIN, READ, WRITE
 from website.util.rubeus import collect_addon_js
-from website.project.model import has_anonymous_link, get_pointer_parent, NodeUpdateError
+from website.project.model import has_anonymous_link, get_pointer_parent, NodeUpdateError, title_words
 from website.project.forms import NewNodeForm
 from website.models import Node, Pointer, WatchConfig, PrivateLink
 from website import settings
@@ -252,13 +253,34 @@ def node_fork_page(auth, node, **kwargs):
             redirect_url=node.url
         )
     try:
-        fork = node.fork_node(auth)
+        job = forking.start_fork(node, auth)
     except PermissionsError:
         raise HTTPError(
             http.FORBIDDEN,
             redirect_url=node.url
         )
-    return fork.url
+    return {
+        'statusUrl': node.api_url_for('node_fork_status', job_id=job._id),
+    }, http.ACCEPTED
+
+
+@must_be_logged_in
+@must_be_valid_project
+def node_fork_status(auth, node, job_id, **kwargs):
+    job = forking.ForkJob.load(job_id)
+    if job is None or job.node != node._id:
+        raise HTTPError(http.NOT_FOUND)
+    if job.user != auth.user._id:
+        raise HTTPError(http.FORBIDDEN)
+    ret = job.to_json()
+    if job.status == forking.ForkJob.COMPLETE:
+        ret['url'] = Node.load(job.fork).url
+        # Show addon messages once, on the fork's page
+        for message in job.messages:
+            status.push_status_message(message)
+        job.messages = []
+        job.save()
+    return ret
 
 
 @must_be_valid_project
@@ -495,6 +517,7 @@ def watch_post(auth, node, **kwargs):
         user.watch(watch_config)
     except ValueError:  # Node is already being watched
         raise HTTPError(http.BAD_REQUEST)
+    view_cache.invalidate(node._id)
 
     user.save()
 
@@ -516,6 +539,7 @@ def unwatch_post(auth, node, **kwargs):
         user.unwatch(watch_config)
     except ValueError:  # Node isn't being watched
         raise HTTPError(http.BAD_REQUEST)
+    view_cache.invalidate(node._id)
 
     return {
         'status': 'success',
@@ -542,6 +566,7 @@ def togglewatch_post(auth, node, **kwargs):
             user.watch(watch_config)
     except ValueError:
         raise HTTPError(http.BAD_REQUEST)
+    view_cache.invalidate(node._id)
 
     user.save()
 
@@ -674,32 +699,15 @@ def _should_show_wiki_widget(node, user):
         return has_wiki
 
 
-def _view_project(node, auth, primary=False):
-    """Build a JSON object containing everything needed to render
-    project.view.mako.
+def _view_project_shared(node):
+    """Build the parts of the project page view model that are the same for
+    every user. Cached in `website.project.view_cache` until the node or
+    anything else shown here changes.
     """
-    user = auth.user
-
     parent = node.parent_node
-    if user:
-        dashboard = find_dashboard(user)
-        dashboard_id = dashboard._id
-        in_dashboard = dashboard.pointing_at(node._primary_key) is not None
-    else:
-        in_dashboard = False
-        dashboard_id = ''
-    view_only_link = auth.private_key or request.args.get('view_only', '').strip('/')
-    anonymous = has_anonymous_link(node, auth)
     widgets, configs, js, css = _render_addon(node)
-    redirect_url = node.url + '?view_only=None'
-
-    # Before page load callback; skip if not primary call
-    if primary:
-        for addon in node.get_addons():
-            messages = addon.before_page_load(node, user) or []
-            for message in messages:
-                status.push_status_message(message, dismissible=False)
-    data = {
+    date_modified = node.date_modified
+    return {
         'node': {
             'id': node._primary_key,
             'title': node.title,
@@ -710,13 +718,12 @@ def _view_project(node, auth, primary=False):
             'url': node.url,
             'api_url': node.api_url,
             'absolute_url': node.absolute_url,
-            'redirect_url': redirect_url,
+            'redirect_url': node.url + '?view_only=None',
             'display_absolute_url': node.display_absolute_url,
             'update_url': node.api_url_for('update_node'),
-            'in_dashboard': in_dashboard,
             'is_public': node.is_public,
             'date_created': iso8601format(node.date_created),
-            'date_modified': iso8601format(node.logs[-1].date) if node.logs else '',
+            'date_modified': iso8601format(date_modified) if date_modified else '',
             'tags': [tag._primary_key for tag in node.tags],
             'children': bool(node.nodes),
             'is_registration': node.is_registration,
@@ -729,7 +736,7 @@ def _view_project(node, auth, primary=False):
                 }
                 for meta in node.registered_meta or []
             ],
-            'registration_count': len(node.node__registrations),
+            'registration_count': len(node.registrations),
             'is_fork': node.is_fork,
             'forked_from_id': node.forked_from._primary_key if node.is_fork else '',
             'forked_from_display_absolute_url': node.forked_from.display_absolute_url if node.is_fork else '',
@@ -737,14 +744,9 @@ def _view_project(node, auth, primary=False):
             'fork_count': len(node.forks),
             'templated_count': len(node.templated_list),
             'watched_count': len(node.watchconfig__watched),
-            'private_links': [x.to_json() for x in node.private_links_active],
-            'link': view_only_link,
-            'anonymous': anonymous,
             'points': len(node.get_points(deleted=False, folders=False)),
             'piwik_site_id': node.piwik_site_id,
             'comment_level': node.comment_level,
-            'has_comments': bool(getattr(node, 'commented', [])),
-            'has_children': bool(getattr(node, 'commented', False)),
             'identifiers': {
                 'doi': node.get_identifier_value('doi'),
                 'ark': node.get_identifier_value('ark'),
@@ -760,9 +762,53 @@ def _view_project(node, auth, primary=False):
             'absolute_url': parent.absolute_url if parent else '',
             'registrations_url': parent.web_url_for('node_registrations') if parent else '',
             'is_public': parent.is_public if parent else '',
-            'is_contributor': parent.is_contributor(user) if parent else '',
-            'can_view': parent.can_view(auth) if parent else False
         },
+        'addons_enabled': node.get_addon_names(),
+        'addons': configs,
+        'addon_widgets': widgets,
+        'addon_widget_js': js,
+        'addon_widget_css': css,
+    }
+
+
+def _view_project(node, auth, primary=False):
+    """Build a JSON object containing everything needed to render
+    project.view.mako.
+    """
+    user = auth.user
+
+    parent = node.parent_node
+    if user:
+        dashboard = find_dashboard(user)
+        dashboard_id = dashboard._id
+        in_dashboard = dashboard.pointing_at(node._primary_key) is not None
+    else:
+        in_dashboard = False
+        dashboard_id = ''
+    view_only_link = auth.private_key or request.args.get('view_only', '').strip('/')
+    anonymous = has_anonymous_link(node, auth)
+
+    # Before page load callback; skip if not primary call
+    if primary:
+        for addon in node.get_addons():
+            messages = addon.before_page_load(node, user) or []
+            for message in messages:
+                status.push_status_message(message, dismissible=False)
+
+    data = view_cache.get_or_build(node._id, lambda: _view_project_shared(node))
+    data['node'].update({
+        'in_dashboard': in_dashboard,
+        'private_links': [x.to_json() for x in node.private_links_active],
+        'link': view_only_link,
+        'anonymous': anonymous,
+        'has_comments': bool(getattr(node, 'commented', [])),
+        'has_children': bool(getattr(node, 'commented', False)),
+    })
+    data['parent_node'].update({
+        'is_contributor': parent.is_contributor(user) if parent else '',
+        'can_view': parent.can_view(auth) if parent else False
+    })
+    data.update({
         'user': {
             'is_contributor': node.is_contributor(user),
             'is_admin_parent': parent.is_admin_parent(user) if parent else False,
@@ -780,14 +826,8 @@ def _view_project(node, auth, primary=False):
             'dashboard_id': dashboard_id,
         },
         'badges': _get_badge(user),
-        # TODO: Namespace with nested dicts
-        'addons_enabled': node.get_addon_names(),
-        'addons': configs,
-        'addon_widgets': widgets,
-        'addon_widget_js': js,
-        'addon_widget_css': css,
         'node_categories': Node.CATEGORY_MAP,
-    }
+    })
     return data
 
 
@@ -850,17 +890,8 @@ def get_editable_children(auth, node, **kwargs):
 def _get_user_activity(node, auth, rescale_ratio):
 
     # Counters
-    total_count = len(node.logs)
-
-    # Note: It's typically much faster to find logs of a given node
-    # attached to a given user using node.logs.find(...) than by
-    # loading the logs into Python and checking each one. However,
-    # using deep caching might be even faster down the road.
-
-    if auth.user:
-        ua_count = node.logs.find(Q('user', 'eq', auth.user)).count()
-    else:
-        ua_count = 0
+    total_count = node.total_log_count
+    ua_count = node.get_user_log_count(auth.user)
 
     non_ua_count = total_count - ua_count  # base length of blue bar
 
@@ -918,7 +949,7 @@ def _get_summary(node, auth, rescale_ratio, primary=True, link_id=None):
         if rescale_ratio:
             ua_count, ua, non_ua = _get_user_activity(node, auth, rescale_ratio)
             summary.update({
-                'nlogs': len(node.logs),
+                'nlogs': node.total_log_count,
                 'ua_count': ua_count,
                 'ua': ua,
                 'non_ua': non_ua,
@@ -987,8 +1018,7 @@ def get_forks(auth, node, **kwargs):
 
 @must_be_contributor_or_public
 def get_registrations(auth, node, **kwargs):
-    registrations = node.node__registrations
-    return _render_nodes(registrations, auth)
+    return _render_nodes(node.registrations, auth)
 
 
 @must_be_valid_project
@@ -1054,22 +1084,31 @@ def _serialize_node_search(node):
 
 @must_be_logged_in
 def search_node(auth, **kwargs):
-    """
-
+    """Search the titles of nodes the user can point to. Each word of the
+    query matches the start of a word in the title.
     """
     # Get arguments
     node = Node.load(request.json.get('nodeId'))
     include_public = request.json.get('includePublic')
-    size = float(request.json.get('size', '5').strip())
-    page = request.json.get('page', 0)
-    query = request.json.get('query', '').strip()
+    try:
+        size = int(request.json.get('size', 5))
+        page = int(request.json.get('page', 0))
+    except (TypeError, ValueError):
+        raise HTTPError(http.BAD_REQUEST)
+    if size < 1 or page < 0:
+        raise HTTPError(http.BAD_REQUEST)
+    words = title_words(request.json.get('query', '').strip())
 
-    start = (page * size)
-    if not query:
+    start = page * size
+    if not words:
         return {'nodes': []}
 
-    # Build ODM query
-    title_query = Q('title', 'icontains', query)
+    # Build ODM query; each word is looked up in the title token index
+    title_query = reduce(
+        lambda acc, word: acc & Q('title_tokens', 'eq', word),
+        words[1:],
+        Q('title_tokens', 'eq', words[0]),
+    )
     not_deleted_query = Q('is_deleted', 'eq', False)
     visibility_query = Q('contributors', 'eq', auth.user)
     no_folders_query = Q('is_folder', 'eq', False)
@@ -1087,14 +1126,16 @@ def search_node(auth, **kwargs):
 
     nodes = Node.find(odm_query)
     count = nodes.count()
-    pages = math.ceil(count / size)
+    pages = math.ceil(count / float(size))
+
+    results = [
+        each for each in nodes.offset(start).limit(size)
+        if each.contributors
+    ]
+    rubeus.prefetch_node_users(results)
 
     return {
-        'nodes': [
-            _serialize_node_search(each)
-            for each in islice(nodes, start, start + size)
-            if each.contributors
-        ],
+        'nodes': [_serialize_node_search(each) for each in results],
         'total': count,
         'pages': pages,
         'page': page
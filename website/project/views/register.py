@@ -7,11 +7,15 @@ from flask import redirect
 from modularodm import Q
 from modularodm.exceptions import NoResultsFound
 
-from framework.exceptions import HTTPError
+from framework import status
+from framework.auth.decorators import must_be_logged_in
+from framework.exceptions import HTTPError, PermissionsError
 from framework.mongo.utils import to_mongo
 from framework.forms.utils import process_payload, unprocess_payload
 
 from website import settings
+from website.exceptions import NodeStateError
+from website.project import registering
 from website.project.decorators import (
     must_be_valid_project, must_be_contributor_or_public,
     must_have_permission, must_not_be_registration
@@ -21,6 +25,7 @@ from website.identifiers.metadata import datacite_metadata_for_node
 from website.project.metadata.schemas import OSF_META_SCHEMAS
 from website.util.permissions import ADMIN
 from website.models import MetaSchema
+from website.models import Node
 from website.models import NodeLog
 from website import language
 
@@ -151,14 +156,70 @@ def node_register_template_page_post(auth, node, **kwargs):
     schema = MetaSchema.find(
         Q('name', 'eq', template)
     ).sort('-schema_version')[0]
-    register = node.register_node(
-        schema, auth, template, json.dumps(clean_data),
-    )
+    try:
+        job = registering.start_registration(
+            node, schema, auth, template, json.dumps(clean_data),
+        )
+    except PermissionsError:
+        raise HTTPError(http.FORBIDDEN)
+    except NodeStateError as e:
+        raise HTTPError(
+            http.BAD_REQUEST,
+            data={
+                'message_short': 'Error',
+                'message_long': 'Could not register: ' + e.message
+            },
+        )
+
+    return {
+        'status': 'pending',
+        'statusUrl': node.api_url_for('node_registration_status', job_id=job._id),
+    }, http.ACCEPTED
+
+
+def _get_registration_job(auth, node, job_id):
+    job = registering.RegistrationJob.load(job_id)
+    if job is None or job.node != node._id:
+        raise HTTPError(http.NOT_FOUND)
+    if job.user != auth.user._id:
+        raise HTTPError(http.FORBIDDEN)
+    return job
 
+
+@must_be_logged_in
+@must_be_valid_project
+def node_registration_status(auth, node, job_id, **kwargs):
+    job = _get_registration_job(auth, node, job_id)
+    ret = job.to_json()
+    if job.status == registering.RegistrationJob.COMPLETE:
+        ret['url'] = Node.load(job.registration).url
+        # Show addon messages once, on the registration's page
+        for message in job.messages:
+            status.push_status_message(message)
+        job.messages = []
+        job.save()
+    else:
+        ret['retryUrl'] = node.api_url_for('node_registration_retry', job_id=job._id)
+    return ret
+
+
+@must_be_logged_in
+@must_be_valid_project
+def node_registration_retry(auth, node, job_id, **kwargs):
+    job = _get_registration_job(auth, node, job_id)
+    if job.status != registering.RegistrationJob.FAILED:
+        raise HTTPError(
+            http.BAD_REQUEST,
+            data={
+                'message_short': 'Error',
+                'message_long': 'Only failed registrations can be retried.'
+            },
+        )
+    registering.retry(job)
     return {
-        'status': 'success',
-        'result': register.url,
-    }, http.CREATED
+        'status': 'pending',
+        'statusUrl': node.api_url_for('node_registration_status', job_id=job._id),
+    }, http.ACCEPTED
 
 
 def _build_ezid_metadata(node):
@@ -1173,6 +1173,12 @@ def make_url_map(app):
                 '/project/<pid>/node/<nid>/fork/',
             ], 'post', project_views.node.node_fork_page, json_renderer,
         ),
+        Rule(
+            [
+                '/project/<pid>/fork/<job_id>/',
+                '/project/<pid>/node/<nid>/fork/<job_id>/',
+            ], 'get', project_views.node.node_fork_status, json_renderer,
+        ),
         Rule(
             [
                 '/project/<pid>/pointer/fork/',
@@ -1201,6 +1207,16 @@ def make_url_map(app):
             '/project/<pid>/node/<nid>/register/<template>/',
         ], 'post', project_views.register.node_register_template_page_post, json_renderer),
 
+        Rule([
+            '/project/<pid>/registration_jobs/<job_id>/',
+            '/project/<pid>/node/<nid>/registration_jobs/<job_id>/',
+        ], 'get', project_views.register.node_registration_status, json_renderer),
+
+        Rule([
+            '/project/<pid>/registration_jobs/<job_id>/retry/',
+            '/project/<pid>/node/<nid>/registration_jobs/<job_id>/retry/',
+        ], 'post', project_views.register.node_registration_retry, json_renderer),
+
         Rule(
             [
                 '/project/<pid>/identifiers/',
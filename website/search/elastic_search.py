@@ -201,8 +201,11 @@ def load_parent(parent_id):
     return parent_info
 
 
-@requires_search
-def update_node(node, index=INDEX):
+def serialize_node(node):
+    """Return the category, document id and document of a node; the document
+    is None if the node should not be indexed. Return None for orphaned
+    components.
+    """
     from website.addons.wiki.model import NodeWikiPage
 
     component_categories = [k for k in Node.CATEGORY_MAP.keys() if not k == 'project']
@@ -219,49 +222,80 @@ def update_node(node, index=INDEX):
             category = 'registration' if node.is_registration else category
         except IndexError:
             # Skip orphaned components
-            return
+            return None
     if node.is_deleted or not node.is_public:
+        return category, elastic_document_id, None
+
+    try:
+        normalized_title = six.u(node.title)
+    except TypeError:
+        normalized_title = node.title
+    normalized_title = unicodedata.normalize('NFKD', normalized_title).encode('ascii', 'ignore')
+
+    elastic_document = {
+        'id': elastic_document_id,
+        'contributors': [
+            {
+                'fullname': x.fullname,
+                'url': x.profile_url if x.is_active else None
+            }
+            for x in node.visible_contributors
+            if x is not None
+        ],
+        'title': node.title,
+        'normalized_title': normalized_title,
+        'category': category,
+        'public': node.is_public,
+        'tags': [tag._id for tag in node.tags if tag],
+        'description': node.description,
+        'url': node.url,
+        'is_registration': node.is_registration,
+        'registered_date': node.registered_date,
+        'wikis': {},
+        'parent_id': parent_id,
+        'date_created': node.date_created,
+        'boost': int(not node.is_registration) + 1,  # This is for making registered projects less relevant
+    }
+    for wiki in [
+        NodeWikiPage.load(x)
+        for x in node.wiki_pages_current.values()
+    ]:
+        elastic_document['wikis'][wiki.page_name] = wiki.raw_text(node)
+
+    return category, elastic_document_id, elastic_document
+
+
+@requires_search
+def update_node(node, index=INDEX):
+    serialized = serialize_node(node)
+    if serialized is None:
+        return
+    category, elastic_document_id, elastic_document = serialized
+    if elastic_document is None:
         delete_doc(elastic_document_id, node)
     else:
-        try:
-            normalized_title = six.u(node.title)
-        except TypeError:
-            normalized_title = node.title
-        normalized_title = unicodedata.normalize('NFKD', normalized_title).encode('ascii', 'ignore')
-
-        elastic_document = {
-            'id': elastic_document_id,
-            'contributors': [
-                {
-                    'fullname': x.fullname,
-                    'url': x.profile_url if x.is_active else None
-                }
-                for x in node.visible_contributors
-                if x is not None
-            ],
-            'title': node.title,
-            'normalized_title': normalized_title,
-            'category': category,
-            'public': node.is_public,
-            'tags': [tag._id for tag in node.tags if tag],
-            'description': node.description,
-            'url': node.url,
-            'is_registration': node.is_registration,
-            'registered_date': node.registered_date,
-            'wikis': {},
-            'parent_id': parent_id,
-            'date_created': node.date_created,
-            'boost': int(not node.is_registration) + 1,  # This is for making registered projects less relevant
-        }
-        for wiki in [
-            NodeWikiPage.load(x)
-            for x in node.wiki_pages_current.values()
-        ]:
-            elastic_document['wikis'][wiki.page_name] = wiki.raw_text(node)
-
         es.index(index=index, doc_type=category, id=elastic_document_id, body=elastic_document, refresh=True)
 
 
+@requires_search
+def update_nodes(nodes, index=INDEX):
+    """Index or remove many nodes with a single bulk request."""
+    actions = []
+    for node in nodes:
+        serialized = serialize_node(node)
+        if serialized is None:
+            continue
+        category, elastic_document_id, elastic_document = serialized
+        if elastic_document is None:
+            doc_type = 'registration' if node.is_registration else node.project_or_component
+            actions.append({'delete': {'_index': index, '_type': doc_type, '_id': elastic_document_id}})
+        else:
+            actions.append({'index': {'_index': index, '_type': category, '_id': elastic_document_id}})
+            actions.append(elastic_document)
+    if actions:
+        es.bulk(body=actions, refresh=True)
+
+
 @requires_search
 def update_user(user, index=INDEX):
     if not user.is_active:
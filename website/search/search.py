@@ -27,6 +27,10 @@ def search(query, index=settings.ELASTIC_INDEX, doc_type=None):
 def update_node(node, index=settings.ELASTIC_INDEX):
     search_engine.update_node(node, index=index)
 
+@requires_search
+def update_nodes(nodes, index=settings.ELASTIC_INDEX):
+    search_engine.update_nodes(nodes, index=index)
+
 @requires_search
 def delete_node(node, index=settings.ELASTIC_INDEX):
     doc_type = node.project_or_component
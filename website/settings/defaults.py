@@ -26,6 +26,19 @@ ROOT = os.path.join(BASE_PATH, '..')
 # Hours before email confirmation tokens expire
 EMAIL_TOKEN_EXPIRATION = 24
 CITATION_STYLES_PATH = os.path.join(BASE_PATH, 'static', 'vendor', 'bower_components', 'styles')
+# Seconds before a synced Mendeley/Zotero citation library is refreshed in the
+# background, and documents to sync inline when a library is first viewed
+CITATION_LIBRARY_REFRESH_INTERVAL = 5 * 60
+CITATION_LIBRARY_INLINE_SYNC_LIMIT = 500
+
+# OAuth tokens expiring within this many seconds are refreshed ahead of time by
+# `scripts/refresh_oauth_tokens.py`, using at most OAUTH_REFRESH_WORKERS threads.
+# Each refresh waits a random delay of up to OAUTH_REFRESH_JITTER seconds and is
+# retried OAUTH_REFRESH_RETRIES times, with exponential backoff, on failure.
+OAUTH_REFRESH_WINDOW = 20 * 60
+OAUTH_REFRESH_WORKERS = 8
+OAUTH_REFRESH_JITTER = 2
+OAUTH_REFRESH_RETRIES = 3
 
 LOAD_BALANCER = False
 PROXY_ADDRS = []
@@ -105,6 +118,28 @@ USE_GNUPG = True
 # File rendering timeout (in ms)
 MFR_TIMEOUT = 30000
 
+# Threads used to fetch addon file trees for the Files page, and the number of
+# seconds to wait for a provider before showing it as unavailable; 0 or 1
+# fetches them in order on the request thread
+RUBEUS_ADDON_WORKERS = 0
+RUBEUS_ADDON_TIMEOUT = 10
+
+# Directory for compiled Mako template modules; build with `invoke precompile_templates`
+MAKO_MODULE_PATH = '/tmp/mako_modules'
+# Templates (relative to TEMPLATES_PATH) loaded when the app starts
+MAKO_WARM_TEMPLATES = [
+    'base.mako',
+    'project/project.mako',
+    'project/project_base.mako',
+    'dashboard.mako',
+    'profile.mako',
+    'error.mako',
+]
+
+# Number of threads used to render a page's embedded templates concurrently;
+# 0 or 1 renders them in order on the request thread
+EMBED_RENDER_WORKERS = 0
+
 # TODO: Override in local.py in production
 DB_HOST = 'localhost'
 DB_PORT = os_env.get('OSF_DB_PORT', 27017)
@@ -120,6 +155,10 @@ SESSION_HISTORY_IGNORE_RULES = [
     lambda url: url.startswith('/api/'),
 ]
 
+# Seconds before a cached project page view model is rebuilt even if nothing
+# has bumped its version; see `website/project/view_cache.py`
+PROJECT_VIEW_CACHE_TTL = 60 * 60
+
 # TODO: Configuration should not change between deploys - this should be dynamic.
 CANONICAL_DOMAIN = 'openscienceframework.org'
 COOKIE_DOMAIN = '.openscienceframework.org' # Beaker
@@ -135,6 +174,7 @@ GRAVATAR_SIZE_DISCUSSION = 20
 
 # Conference options
 CONFERNCE_MIN_COUNT = 5
+CONFERENCE_PAGE_SIZE = 100
 
 WIKI_WHITELIST = {
     'tags': [
@@ -176,6 +216,8 @@ CELERY_IMPORTS = (
     'framework.render.tasks',
     'framework.analytics.tasks',
     'website.mailchimp_utils',
+    'website.project.tasks',
+    'website.addons.citations.library',
     'scripts.send_digest'
 )
 
@@ -205,6 +247,8 @@ SYSTEM_ADDED_ADDONS = {
 PIWIK_HOST = None
 PIWIK_ADMIN_TOKEN = None
 PIWIK_SITE_ID = None
+# Seconds to wait for Piwik when building the public activity page snapshot
+PIWIK_TIMEOUT = 10
 
 SENTRY_DSN = None
 SENTRY_DSN_JS = None
@@ -218,6 +262,11 @@ ALL_MY_PROJECTS_ID = '-amp'
 ALL_MY_REGISTRATIONS_ID = '-amr'
 ALL_MY_PROJECTS_NAME = 'All my projects'
 ALL_MY_REGISTRATIONS_NAME = 'All my registrations'
+# Largest page of smart folder rows returned at once
+SMART_FOLDER_MAX_PAGE_SIZE = 500
+
+# Longest word prefix indexed for node title search
+TITLE_TOKEN_MAX_LENGTH = 20
 
 # FOR EMERGENCIES ONLY: Setting this to True will disable forks, registrations,
 # and uploads in order to save disk space.
@@ -237,6 +286,12 @@ DEFAULT_HMAC_SECRET = 'changeme'
 DEFAULT_HMAC_ALGORITHM = hashlib.sha256
 WATERBUTLER_URL = 'http://localhost:7777'
 WATERBUTLER_ADDRS = ['127.0.0.1']
+# File metadata fetched from WaterButler is cached per worker; entries for
+# mutable revisions expire after WATERBUTLER_METADATA_TTL seconds
+WATERBUTLER_METADATA_TTL = 60
+WATERBUTLER_METADATA_CACHE_SIZE = 10000
+WATERBUTLER_METADATA_TIMEOUT = 30
+WATERBUTLER_POOL_SIZE = 10
 
 # Test identifier namespaces
 DOI_NAMESPACE = 'doi:10.5072/FK2'
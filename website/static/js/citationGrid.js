@@ -285,20 +285,6 @@ CitationGrid.prototype.initTreebeard = function() {
         },
         treebeardOptions
     );
-    var preprocess = options.lazyLoadPreprocess;
-    options.lazyLoadPreprocess = function(data){
-        data = preprocess(data);
-        // TODO remove special case for Zotero
-        if (self.provider === 'Zotero') {
-            if (data.length >= 200) {
-        data.push({
-                    name: 'Only 200 citations may be displayed',
-                    kind: 'message'
-                });
-            }
-        }
-        return data;
-    };
     self.treebeard = new Treebeard(options);
 };
 
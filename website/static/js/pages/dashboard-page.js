@@ -77,10 +77,7 @@ var ensureUserTimezone = function(savedTimezone, savedLocale, id) {
 $(document).ready(function() {
     $('#projectOrganizerScope').tooltip({selector: '[data-toggle=tooltip]'});
 
-    var request = $.ajax({
-        url:  '/api/v1/dashboard/'
-    });
-    request.done(function(data) {
+    var initDashboard = function(data) {
         var po = new ProjectOrganizer({
             placement : 'dashboard',
             divID: 'project-grid',
@@ -89,10 +86,21 @@ $(document).ready(function() {
         });
 
         ensureUserTimezone(data.timezone, data.locale, data.id);
+    };
+
+    // The dashboard is rendered into the page; only fetch it if it is missing
+    if (window.contextVars.dashboard) {
+        initDashboard(window.contextVars.dashboard);
+        return;
+    }
+    var dashboardUrl = '/api/v1/dashboard/';
+    var request = $.ajax({
+        url: dashboardUrl
     });
+    request.done(initDashboard);
     request.fail(function(xhr, textStatus, error) {
         Raven.captureMessage('Failed to populate user dashboard', {
-            url: url,
+            url: dashboardUrl,
             textStatus: textStatus,
             error: error
         });
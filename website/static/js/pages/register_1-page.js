@@ -27,12 +27,7 @@ function registerNode(data) {
         contentType: 'application/json',
         dataType: 'json'
     }).done(function(response) {
-        if (response.status === 'success') {
-            window.location.href = response.result;
-        }
-        else if (response.status === 'error') {
-            registration_failed();
-        }
+        waitForRegistration(response.statusUrl);
     }).fail(function() {
         registration_failed();
     });
@@ -42,6 +37,35 @@ function registerNode(data) {
 
 }
 
+/**
+    * Poll a registration job until it is complete, then go to the
+    * registration. Failed jobs can be retried from the stage that failed.
+    */
+function waitForRegistration(statusUrl) {
+    $.getJSON(statusUrl).done(function(job) {
+        if (job.status === 'complete') {
+            window.location.href = job.url;
+        } else if (job.status === 'failed') {
+            $osf.unblock();
+            bootbox.confirm('Registration failed. Try again?', function(result) {
+                if (result) {
+                    $osf.block();
+                    $osf.postJSON(job.retryUrl, {}).done(function(response) {
+                        waitForRegistration(response.statusUrl);
+                    }).fail(registration_failed);
+                }
+            });
+        } else {
+            $('.blockUI.blockMsg').text(
+                'Registered ' + job.nodesDone + ' of ' + job.nodes + ' components'
+            );
+            window.setTimeout(function() {
+                waitForRegistration(statusUrl);
+            }, 1000);
+        }
+    }).fail(registration_failed);
+}
+
 $(document).ready(function() {
 
     // Don't submit form on enter; must use $.delegate rather than $.on
@@ -41,7 +41,7 @@ NodeActions.forkNode = function() {
             ctx.node.urls.api + 'fork/',
             {}
         ).done(function(response) {
-            window.location = response;
+            NodeActions.waitForFork(response.statusUrl);
         }).fail(function(response) {
             $osf.unblock();
             if (response.status === 403) {
@@ -54,6 +54,33 @@ NodeActions.forkNode = function() {
     });
 };
 
+/**
+ * Poll a fork job until it is complete, then go to the fork.
+ */
+NodeActions.waitForFork = function(statusUrl) {
+    var failed = function() {
+        $osf.unblock();
+        $osf.growl('Error:', 'Forking failed');
+        Raven.captureMessage('Error occurred during forking');
+    };
+    $.getJSON(statusUrl).done(function(job) {
+        if (job.status === 'complete') {
+            window.location = job.url;
+        } else if (job.status === 'failed') {
+            failed();
+        } else {
+            if (job.addonsTotal) {
+                $('.blockUI.blockMsg').text(
+                    'Copying files: ' + job.addonsDone + ' of ' + job.addonsTotal
+                );
+            }
+            window.setTimeout(function() {
+                NodeActions.waitForFork(statusUrl);
+            }, 1000);
+        }
+    }).fail(failed);
+};
+
 NodeActions.forkPointer = function(pointerId) {
     bootbox.confirm({
         title: 'Fork this project?',
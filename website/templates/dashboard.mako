@@ -98,11 +98,13 @@
 
 <%def name="javascript_bottom()">
 
+<% import json %>
 <script>
     window.contextVars = $.extend(true, {}, window.contextVars, {
         currentUser: {
             'id': '${user_id}'
-        }
+        },
+        dashboard: ${json.dumps(dashboard).replace('</', '<\\/')}
     });
 </script>
 <script src=${"/static/public/js/dashboard-page.js" | webpack_asset}></script>
@@ -19,6 +19,7 @@
         </div>
         <div class="col-sm-8 col-md-9" role="main">
             <h1 class="page-header">Public Activity</h1>
+            <p class="text-muted">Updated ${date_generated.strftime('%Y-%m-%d %H:%M')} UTC</p>
             <section id='newPublicProjects'>
                 <h3>Newest Public Projects</h3>
                 <ul class='project-list list-group'>
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""In-process metrics: counters and gauges, kept per worker.
+"""
+import threading
+import collections
+
+
+_lock = threading.Lock()
+counters = collections.Counter()
+gauges = {}
+
+
+def increment(name, value=1):
+    with _lock:
+        counters[name] += value
+
+
+def set_gauge(name, value):
+    """Record the latest value of a level, e.g. a remaining quota."""
+    with _lock:
+        gauges[name] = value
+
+
+def reset():
+    with _lock:
+        counters.clear()
+        gauges.clear()
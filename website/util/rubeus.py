@@ -2,14 +2,20 @@
 """Contains helper functions for generating correctly
 formatted hgrid list/folders.
 """
+import time
+import logging
 import datetime
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
 import hurry.filesize
-from modularodm import Q
 
 from framework.auth.decorators import Auth
+from framework.mongo import loader
 
+from website import settings
 from website.util import paths
+from website.util import metrics
 from website.util import sanitize
 from website.settings import (
     ALL_MY_PROJECTS_ID, ALL_MY_REGISTRATIONS_ID, ALL_MY_PROJECTS_NAME,
@@ -17,6 +23,9 @@ from website.settings import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 FOLDER = 'folder'
 FILE = 'file'
 KIND = 'kind'
@@ -65,6 +74,101 @@ def to_project_root(node, auth, **data):
     return NodeProjectCollector(node, auth, **data).get_root()
 
 
+def to_project_summaries(nodes, auth):
+    """Converts nodes into lightweight rubeus rows for the smart folders.
+    Unlike `to_project_root`, children are neither loaded nor checked for
+    permissions; they are fully serialized when the client expands a row.
+
+    :param list nodes: Nodes the user contributes to
+    :param Auth auth: the user authorization object
+    :returns: list of rubeus-formatted dicts
+
+    """
+    prefetch_node_users(nodes)
+    return [_serialize_node_summary(node, auth) for node in nodes]
+
+
+def prefetch_node_users(nodes):
+    """Batch load the contributors of each node and the user who last
+    modified it before the nodes are serialized.
+    """
+    from framework.auth import User
+
+    for node in nodes:
+        if node is not None:
+            loader.prime(User, node.contributors._to_primary_keys())
+            loader.prime(User, [node.last_modified_by_id])
+    loader.flush(User)
+
+
+def _serialize_contributors(node):
+    contributors = []
+    for contributor in node.contributors:
+        if contributor._id in node.visible_contributor_ids:
+            contributor_name = [
+                contributor.family_name,
+                contributor.given_name,
+                contributor.fullname,
+            ]
+            contributors.append({
+                'name': next(name for name in contributor_name if name),
+                'url': contributor.url,
+            })
+    return contributors
+
+
+def _serialize_modified_by(node):
+    user = node.last_modified_by
+    if user is not None:
+        return user.family_name or user.given_name
+    return ''
+
+
+def _serialize_node_summary(node, auth):
+    is_project = node.category == 'project'
+    return {
+        'name': sanitize.safe_unescape_html(node.title),
+        'kind': FOLDER,
+        'category': node.category,
+        'permissions': {
+            'edit': node.can_edit(auth=auth) and not node.is_registration,
+            'view': True,
+            'copyable': True,
+            'movable': False,
+            'acceptsFolders': False,
+            'acceptsMoves': False,
+            'acceptsCopies': is_project,
+            'acceptsComponents': False,
+        },
+        'urls': {
+            'upload': None,
+            'fetch': node.url,
+        },
+        'type': 'project' if is_project else 'component',
+        'children': [],
+        'expand': False,
+        'isProject': is_project,
+        'isPointer': False,
+        'isComponent': not is_project,
+        'isFolder': False,
+        'isDashboard': False,
+        'isFile': False,
+        'isSummary': True,
+        'dateModified': node.date_modified.isoformat(),
+        'modifiedDelta': max(1, delta_date(node.date_modified)),
+        'modifiedBy': _serialize_modified_by(node),
+        'parentIsFolder': False,
+        'contributors': _serialize_contributors(node),
+        'node_id': node._id,
+        'isSmartFolder': False,
+        'apiURL': node.api_url,
+        'isRegistration': node.is_registration,
+        # Upper bound: deleted and private children are counted until the
+        # row is expanded
+        'childrenCount': len(node.nodes._to_primary_keys()),
+    }
+
+
 def build_addon_root(node_settings, name, permissions=None,
                      urls=None, extra=None, buttons=None, user=None,
                      **kwargs):
@@ -132,6 +236,26 @@ def build_addon_root(node_settings, name, permissions=None,
     return ret
 
 
+def build_unavailable_addon_root(node_settings, auth):
+    """Builds the placeholder root shown when an addon's provider does not
+    respond before the deadline.
+    """
+    return build_addon_root(
+        node_settings,
+        'Provider unavailable',
+        permissions={
+            'view': node_settings.owner.can_view(auth),
+            'edit': False,
+        },
+        urls={
+            'upload': None,
+            'fetch': None,
+        },
+        children=[],
+        unavailable=True,
+    )
+
+
 def build_addon_button(text, action, title=""):
     """Builds am action button to be rendered in HGrid
 
@@ -168,6 +292,7 @@ class NodeProjectCollector(object):
 
     def _collect_components(self, node, visited):
         rv = []
+        prefetch_node_users(node.nodes)
         for child in reversed(node.nodes):  # (child.resolve()._id not in visited or node.is_folder) and
             if child is not None and not child.is_deleted and child.resolve().can_view(auth=self.auth) and node.can_view(self.auth):
                 # visited.append(child.resolve()._id)
@@ -175,49 +300,13 @@ class NodeProjectCollector(object):
         return rv
 
     def collect_all_projects_smart_folder(self):
-        contributed = self.auth.user.node__contributed
-        all_my_projects = contributed.find(
-            Q('category', 'eq', 'project') &
-            Q('is_deleted', 'eq', False) &
-            Q('is_registration', 'eq', False) &
-            Q('is_folder', 'eq', False) &
-            # parent is not in the nodes list
-            Q('__backrefs.parent.node.nodes', 'eq', None)
-        )
-        comps = contributed.find(
-            # components only
-            Q('category', 'ne', 'project') &
-            # parent is not in the nodes list
-            Q('__backrefs.parent.node.nodes', 'nin', all_my_projects.get_keys()) &
-            # exclude deleted nodes
-            Q('is_deleted', 'eq', False) &
-            # exclude registrations
-            Q('is_registration', 'eq', False)
-        )
-        children_count = all_my_projects.count() + comps.count()
+        from website.project import smart_folders
+        children_count = smart_folders.get_counts(self.auth.user)[smart_folders.PROJECTS]
         return self.make_smart_folder(ALL_MY_PROJECTS_NAME, ALL_MY_PROJECTS_ID, children_count)
 
     def collect_all_registrations_smart_folder(self):
-        contributed = self.auth.user.node__contributed
-        all_my_registrations = contributed.find(
-            Q('category', 'eq', 'project') &
-            Q('is_deleted', 'eq', False) &
-            Q('is_registration', 'eq', True) &
-            Q('is_folder', 'eq', False) &
-            # parent is not in the nodes list
-            Q('__backrefs.parent.node.nodes', 'eq', None)
-        )
-        comps = contributed.find(
-            # components only
-            Q('category', 'ne', 'project') &
-            # parent is not in the nodes list
-            Q('__backrefs.parent.node.nodes', 'nin', all_my_registrations.get_keys()) &
-            # exclude deleted nodes
-            Q('is_deleted', 'eq', False) &
-            # exclude registrations
-            Q('is_registration', 'eq', True)
-        )
-        children_count = all_my_registrations.count() + comps.count()
+        from website.project import smart_folders
+        children_count = smart_folders.get_counts(self.auth.user)[smart_folders.REGISTRATIONS]
         return self.make_smart_folder(ALL_MY_REGISTRATIONS_NAME, ALL_MY_REGISTRATIONS_ID, children_count)
 
     def make_smart_folder(self, title, node_id, children_count=0):
@@ -277,23 +366,8 @@ class NodeProjectCollector(object):
         children = []
         modified_delta = delta_date(node.date_modified)
         date_modified = node.date_modified.isoformat()
-        contributors = []
-        for contributor in node.contributors:
-            if contributor._id in node.visible_contributor_ids:
-                contributor_name = [
-                    contributor.family_name,
-                    contributor.given_name,
-                    contributor.fullname,
-                ]
-                contributors.append({
-                    'name': next(name for name in contributor_name if name),
-                    'url': contributor.url,
-                })
-        try:
-            user = node.logs[-1].user
-            modified_by = user.family_name or user.given_name
-        except AttributeError:
-            modified_by = ''
+        contributors = _serialize_contributors(node)
+        modified_by = _serialize_modified_by(node)
         child_nodes = node.nodes
         readable_children = []
         for child in child_nodes:
@@ -415,6 +489,8 @@ class NodeFileCollector(object):
         self.extra = kwargs
         self.can_view = node.can_view(auth)
         self.can_edit = node.can_edit(auth) and not node.is_registration
+        # (serialized node, addon settings) pairs awaiting addon roots
+        self._pending = None
 
     def to_hgrid(self):
         """Return the Rubeus.JS representation of the node's file data, including
@@ -432,16 +508,27 @@ class NodeFileCollector(object):
         return rv
 
     def _serialize_node(self, node, visited=None):
-        """Returns the rubeus representation of a node folder.
+        """Returns the rubeus representation of a node folder. Addon roots for
+        the node and all of its components are fetched together once the
+        outermost node has been serialized.
         """
+        is_root = self._pending is None
+        if is_root:
+            self._pending = []
+        try:
+            ret = self._serialize_node_folder(node, visited)
+            if is_root:
+                self._resolve_pending()
+        finally:
+            if is_root:
+                self._pending = None
+        return ret
+
+    def _serialize_node_folder(self, node, visited=None):
         visited = visited or []
         visited.append(node.resolve()._id)
         can_view = node.can_view(auth=self.auth)
-        if can_view:
-            children = self._collect_addons(node) + self._collect_components(node, visited)
-        else:
-            children = []
-        return {
+        ret = {
             # TODO: Remove safe_unescape_html when mako html safe comes in
             'name': u'{0}: {1}'.format(node.project_or_component.capitalize(), sanitize.safe_unescape_html(node.title))
             if can_view
@@ -455,22 +542,108 @@ class NodeFileCollector(object):
                 'upload': None,
                 'fetch': None,
             },
-            'children': children,
+            'children': [],
             'isPointer': not node.primary,
             'isSmartFolder': False,
             'nodeType': node.project_or_component,
             'nodeID': node.resolve()._id,
         }
+        if can_view:
+            self._pending.append((ret, self._hgrid_addons(node)))
+            ret['children'] = self._collect_components(node, visited)
+        return ret
+
+    def _resolve_pending(self):
+        """Fetch every pending addon root and place them ahead of each node's
+        components.
+        """
+        addons = [addon for _, node_addons in self._pending for addon in node_addons]
+        results = iter(self._fetch_addon_roots(addons))
+        for serialized, node_addons in self._pending:
+            roots = []
+            for _ in node_addons:
+                roots.extend(next(results))
+            serialized['children'] = roots + serialized['children']
+
+    def _hgrid_addons(self, node):
+        return [
+            addon for addon in node.get_addons()
+            if addon.config.has_hgrid_files
+        ]
 
     def _collect_addons(self, node):
         rv = []
-        for addon in node.get_addons():
-            if addon.config.has_hgrid_files:
-                # WARNING: get_hgrid_data can return None if the addon is added but has no credentials.
-                temp = addon.config.get_hgrid_data(addon, self.auth, **self.extra)
-                rv.extend(sort_by_name(temp) or [])
+        for roots in self._fetch_addon_roots(self._hgrid_addons(node)):
+            rv.extend(roots)
         return rv
 
+    def _get_addon_roots(self, addon, **kwargs):
+        kwargs = dict(self.extra, **kwargs)
+        # WARNING: get_hgrid_data can return None if the addon is added but has no credentials.
+        temp = addon.config.get_hgrid_data(addon, self.auth, **kwargs)
+        return sort_by_name(temp) or []
+
+    def _fetch_addon_roots(self, addons):
+        """Build the hgrid roots of each addon. When ``settings.RUBEUS_ADDON_WORKERS``
+        allows, the provider requests of addons that define ``prefetch_hgrid_data``
+        are made concurrently in a bounded thread pool. The pool only runs those
+        requests; database access stays on the request thread. Providers that do
+        not respond within ``settings.RUBEUS_ADDON_TIMEOUT`` seconds are
+        replaced by a "provider unavailable" placeholder.
+
+        :return: List of lists of roots, one list per addon
+        """
+        fetches = {}
+        if settings.RUBEUS_ADDON_WORKERS > 1:
+            for idx, addon in enumerate(addons):
+                prefetch = addon.config.prefetch_hgrid_data
+                fetch = prefetch(addon, self.auth, **self.extra) if prefetch else None
+                if fetch is not None:
+                    fetches[idx] = (addon, fetch)
+        fetched = self._run_fetches(fetches)
+
+        results = []
+        for idx, addon in enumerate(addons):
+            if idx not in fetches:
+                results.append(self._get_addon_roots(addon))
+            elif idx in fetched:
+                results.append(self._get_addon_roots(addon, prefetched=fetched[idx]))
+            else:
+                results.append([build_unavailable_addon_root(addon, self.auth)])
+        return results
+
+    def _run_fetches(self, fetches):
+        """Call each addon's fetch function in the thread pool.
+
+        :param dict fetches: ``(addon, fetch function)`` pairs by key
+        :return: Results by key, omitting providers that timed out
+        """
+        workers = min(settings.RUBEUS_ADDON_WORKERS, len(fetches))
+        if workers < 2:
+            return {key: fetch() for key, (_, fetch) in fetches.items()}
+
+        pool = ThreadPool(workers)
+        try:
+            deadline = time.time() + settings.RUBEUS_ADDON_TIMEOUT
+            pending = [
+                (key, addon, pool.apply_async(fetch))
+                for key, (addon, fetch) in fetches.items()
+            ]
+            results = {}
+            for key, addon, result in pending:
+                try:
+                    results[key] = result.get(timeout=max(deadline - time.time(), 0))
+                except multiprocessing.TimeoutError:
+                    logger.warning('Timed out fetching {0} files for node {1}'.format(
+                        addon.config.short_name,
+                        addon.owner._id,
+                    ))
+                    metrics.increment('rubeus.hgrid.{0}.timeout'.format(addon.config.short_name))
+            return results
+        finally:
+            # Don't wait on providers that missed the deadline
+            pool.terminate()
+
 
 # TODO: these might belong in addons module
 def collect_addon_assets(node):
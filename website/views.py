@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import json
+import base64
 import logging
 import itertools
 import math
@@ -12,6 +14,7 @@ from framework import sentry
 from framework.auth.core import User
 from framework.flask import redirect  # VOL-aware redirect
 from framework.routing import proxy_url
+from framework.mongo import loader
 from framework.exceptions import HTTPError
 from framework.auth.forms import SignInForm
 from framework.forms import utils as form_utils
@@ -22,6 +25,7 @@ from framework.auth.forms import ForgotPasswordForm
 from framework.auth.decorators import collect_auth
 from framework.auth.decorators import must_be_logged_in
 
+from website import settings
 from website.models import Guid
 from website.models import Node
 from website.util import rubeus
@@ -45,7 +49,7 @@ def _rescale_ratio(auth, nodes):
     if not nodes:
         return 0
     counts = [
-        len(node.logs)
+        node.total_log_count
         for node in nodes
         if node.can_view(auth)
     ]
@@ -107,29 +111,42 @@ def index(auth):
 
 
 def find_dashboard(user):
-    dashboard_folder = user.node__contributed.find(
-        Q('is_dashboard', 'eq', True)
-    )
-
-    if dashboard_folder.count() == 0:
-        new_dashboard(user)
-        dashboard_folder = user.node__contributed.find(
+    """Return the user's dashboard, creating it if the user has none yet."""
+    dashboard = Node.load(user.dashboard_id) if user.dashboard_id else None
+    if dashboard is None or not dashboard.is_dashboard:
+        dashboards = user.node__contributed.find(
             Q('is_dashboard', 'eq', True)
         )
-    return dashboard_folder[0]
+        dashboard = next(iter(dashboards), None)
+        if dashboard is None:
+            return new_dashboard(user)
+        user.dashboard_id = dashboard._id
+        user.save()
+    return dashboard
+
+
+def serialize_dashboard(dashboard, auth, **kwargs):
+    """Serialize the root of the user's dashboard for the project organizer,
+    along with the user settings the dashboard page checks on load.
+    """
+    user = auth.user
+    return {
+        'data': [rubeus.to_project_root(dashboard, auth, **kwargs)],
+        'timezone': user.timezone,
+        'locale': user.locale,
+        'id': user._id,
+    }
 
 
 @must_be_logged_in
 def get_dashboard(auth, nid=None, **kwargs):
     user = auth.user
     if nid is None:
-        node = find_dashboard(user)
-        dashboard_projects = [rubeus.to_project_root(node, auth, **kwargs)]
-        return_value = {'data': dashboard_projects}
+        return serialize_dashboard(find_dashboard(user), auth, **kwargs)
     elif nid == ALL_MY_PROJECTS_ID:
-        return_value = {'data': get_all_projects_smart_folder(**kwargs)}
+        return_value = get_all_projects_smart_folder(**kwargs)
     elif nid == ALL_MY_REGISTRATIONS_ID:
-        return_value = {'data': get_all_registrations_smart_folder(**kwargs)}
+        return_value = get_all_registrations_smart_folder(**kwargs)
     else:
         node = Node.load(nid)
         dashboard_projects = rubeus.to_project_hgrid(node, auth, **kwargs)
@@ -141,35 +158,76 @@ def get_dashboard(auth, nid=None, **kwargs):
     return return_value
 
 
-@must_be_logged_in
-def get_all_projects_smart_folder(auth, **kwargs):
-    # TODO: Unit tests
-    user = auth.user
+def encode_smart_folder_cursor(node):
+    return base64.urlsafe_b64encode(json.dumps([node.title, node._id]))
 
-    contributed = user.node__contributed
-    nodes = contributed.find(
+
+def decode_smart_folder_cursor(cursor):
+    """Return the ``(title, id)`` of the last node of the previous page."""
+    try:
+        title, node_id = json.loads(base64.urlsafe_b64decode(str(cursor)))
+    except (TypeError, ValueError):
+        raise HTTPError(http.BAD_REQUEST, data=dict(
+            message_long='Invalid value for "cursor".'
+        ))
+    return title, node_id
+
+
+def get_smart_folder_page(user, auth, is_registration):
+    """Get a page of the user's top-level nodes, as lightweight rows sorted by
+    title in descending order.
+
+    :param-query limit: Maximum number of rows to return. All rows are
+        returned if not given.
+    :param-query cursor: `next_cursor` of the previous page
+    """
+    query = (
         Q('is_deleted', 'eq', False) &
-        Q('is_registration', 'eq', False) &
+        Q('is_registration', 'eq', is_registration) &
         Q('is_folder', 'eq', False)
-    ).sort('-title')
+    )
+    contributed = user.node__contributed
+    keys = contributed.find(query).get_keys()
+    # Exclude components whose parent is also listed
+    query &= Q('__backrefs.parent.node.nodes', 'nin', keys)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        title, node_id = decode_smart_folder_cursor(cursor)
+        query &= (
+            Q('title', 'lt', title) |
+            (Q('title', 'eq', title) & Q('_id', 'lt', node_id))
+        )
+    nodes = contributed.find(query).sort('-title', '-_id')
+
+    limit = request.args.get('limit')
+    if limit is None:
+        return {'data': rubeus.to_project_summaries(list(nodes), auth), 'next_cursor': None}
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise HTTPError(http.BAD_REQUEST, data=dict(
+            message_long='Invalid value for "limit".'
+        ))
+    limit = max(1, min(limit, settings.SMART_FOLDER_MAX_PAGE_SIZE))
+    # Fetch one extra row to tell whether there is a next page
+    page = list(nodes.limit(limit + 1))
+    next_cursor = encode_smart_folder_cursor(page[limit - 1]) if len(page) > limit else None
+    return {
+        'data': rubeus.to_project_summaries(page[:limit], auth),
+        'next_cursor': next_cursor,
+    }
 
-    keys = nodes.get_keys()
-    return [rubeus.to_project_root(node, auth, **kwargs) for node in nodes if node.parent_id not in keys]
 
 @must_be_logged_in
-def get_all_registrations_smart_folder(auth, **kwargs):
-    # TODO: Unit tests
-    user = auth.user
-    contributed = user.node__contributed
+def get_all_projects_smart_folder(auth, **kwargs):
+    return get_smart_folder_page(auth.user, auth, is_registration=False)
 
-    nodes = contributed.find(
-        Q('is_deleted', 'eq', False) &
-        Q('is_registration', 'eq', True) &
-        Q('is_folder', 'eq', False)
-    ).sort('-title')
 
-    keys = nodes.get_keys()
-    return [rubeus.to_project_root(node, auth, **kwargs) for node in nodes if node.parent_id not in keys]
+@must_be_logged_in
+def get_all_registrations_smart_folder(auth, **kwargs):
+    return get_smart_folder_page(auth.user, auth, is_registration=True)
+
 
 @must_be_logged_in
 def get_dashboard_nodes(auth):
@@ -226,6 +284,9 @@ def dashboard(auth):
     dashboard_id = dashboard_folder._id
     return {'addons_enabled': user.get_addon_names(),
             'dashboard_id': dashboard_id,
+            # Rendered into the page so the project organizer starts without
+            # fetching the dashboard again
+            'dashboard': serialize_dashboard(dashboard_folder, auth),
             }
 
 
@@ -255,16 +316,35 @@ def watched_logs_get(**kwargs):
 
     total = sum(1 for x in user.get_recent_log_ids())
     paginated_logs, pages = paginate(user.get_recent_log_ids(), total, page, size)
-    logs = (model.NodeLog.load(id) for id in paginated_logs)
+    logs = [log for log in loader.load_many(model.NodeLog, paginated_logs) if log]
 
     return {
-        "logs": [serialize_log(log) for log in logs],
+        "logs": serialize_logs(logs),
         "total": total,
         "pages": pages,
         "page": page
     }
 
 
+def prefetch_log_references(logs):
+    """Batch load the users and nodes referenced by ``logs``."""
+    loader.prime(User, loader.foreign_keys(logs, 'user'))
+    for log in logs:
+        loader.prime(User, log.params.get('contributors', []))
+    loader.prime(Node, loader.foreign_keys(logs, 'node'))
+    loader.flush(User)
+    loader.flush(Node)
+
+
+def serialize_logs(logs, auth=None, anonymous=False):
+    logs = list(logs)
+    prefetch_log_references(logs)
+    return [
+        serialize_log(log, auth=auth, anonymous=anonymous)
+        for log in logs
+    ]
+
+
 def serialize_log(node_log, auth=None, anonymous=False):
     '''Return a dictionary representation of the log.'''
     return {